@@ -1,12 +1,21 @@
 """Application factory for the Flask CRUD demo."""
 from __future__ import annotations
 
+import click
 from flask import Flask
 
+from .cache import init_entity_cache
+from .commands import register_commands
+from .compression import init_compression
 from .config import get_config
-from .extensions import db, migrate
+from .extensions import db, init_migrate
+from .instrumentation import init_instrumentation
+from .metrics import init_metrics
+from .readiness import init_readiness
 from .resources.api import api_blueprint
 from .resources.health import health_blueprint
+from .resources.metrics import metrics_blueprint
+from .startup import init_swagger_cache
 
 
 def create_app(config_name: str | None = None) -> Flask:
@@ -18,6 +27,8 @@ def create_app(config_name: str | None = None) -> Flask:
 
     register_extensions(app)
     register_blueprints(app)
+    register_commands(app)
+    init_swagger_cache(app)
 
     return app
 
@@ -26,12 +37,21 @@ def register_extensions(app: Flask) -> None:
     """Initialize Flask extensions."""
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    # Only ``flask`` commands run inside a click context; servers skip importing Alembic.
+    if click.get_current_context(silent=True) is not None:
+        init_migrate(app)
+    init_entity_cache(app)
+    # First, so its after_request hook runs last, on the final response.
+    init_compression(app)
+    init_instrumentation(app)
+    init_metrics(app)
+    init_readiness(app)
 
 
 def register_blueprints(app: Flask) -> None:
     """Register application blueprints."""
 
     app.register_blueprint(health_blueprint)
+    app.register_blueprint(metrics_blueprint)
     app.register_blueprint(api_blueprint, url_prefix="/api/v1")
 
@@ -0,0 +1,488 @@
+"""ASGI application serving the client and transaction API with async SQLAlchemy.
+
+Handlers are coroutines that run the existing services through
+``AsyncSession.run_sync``: the business logic and schemas are shared with
+the Flask app, while every query goes through psycopg's async driver, so a
+worker keeps serving other requests while one waits on the database.
+
+Conditional requests, batch ingest and exports are only served by the WSGI
+app.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+from marshmallow import ValidationError as MarshmallowValidationError
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.pool import StaticPool
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from .cache import EntityCache, build_entity_cache
+from .config import get_config
+from .extensions import enable_sqlite_foreign_keys
+from .models import Client, Transaction
+from .resources.conditional import entity_etag, expanded_etag
+from .resources.expansion import (
+    Expansion,
+    columns_for,
+    expand_client_transactions,
+    expand_transaction_client,
+)
+from .resources.responses import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    VALIDATION_STATUS,
+    list_envelope,
+)
+from .schemas import (
+    ClientBalanceSchema,
+    ClientCreateSchema,
+    ClientItemQuerySchema,
+    ClientQuerySchema,
+    ClientSchema,
+    ClientUpdateSchema,
+    CompiledSerializer,
+    TransactionCreateSchema,
+    TransactionItemQuerySchema,
+    TransactionQuerySchema,
+    TransactionSchema,
+    TransactionUpdateSchema,
+    compiled_serializer,
+)
+from .services import (
+    BalanceService,
+    ClientService,
+    EntityNotFoundError,
+    IdempotencyService,
+    StoredResponse,
+    TransactionService,
+    ValidationError,
+    request_fingerprint,
+)
+
+ResultT = TypeVar("ResultT")
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+client_serializer = compiled_serializer(ClientSchema)
+balance_serializer = compiled_serializer(ClientBalanceSchema)
+transaction_serializer = compiled_serializer(TransactionSchema)
+client_create_schema = ClientCreateSchema()
+client_update_schema = ClientUpdateSchema()
+client_query_schema = ClientQuerySchema()
+client_item_query_schema = ClientItemQuerySchema()
+transaction_create_schema = TransactionCreateSchema()
+transaction_item_query_schema = TransactionItemQuerySchema()
+transaction_update_schema = TransactionUpdateSchema()
+transaction_query_schema = TransactionQuerySchema()
+client_transactions_query_schema = TransactionQuerySchema(
+    only=("page", "per_page", "cursor", "field_names")
+)
+
+
+def create_async_db_engine(database_uri: str, options: dict[str, object]) -> AsyncEngine:
+    """Create the async counterpart of the engine the Flask app would use.
+
+    The sync driver in ``database_uri`` is swapped for its async variant.
+    The instrumented sync pool class is dropped in favour of SQLAlchemy's
+    async queue pool; an in-memory SQLite database gets a single shared
+    connection so every session sees the same data, and SQLite connections
+    get foreign keys enabled as in the Flask app.
+    """
+
+    url = make_url(database_uri)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    options = {key: value for key, value in options.items() if key != "poolclass"}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        options["poolclass"] = StaticPool
+    engine = create_async_engine(url, **options)
+    if url.get_backend_name() == "sqlite":
+        event.listen(engine.sync_engine, "connect", enable_sqlite_foreign_keys)
+    return engine
+
+
+def json_response(
+    payload: object, status: int = 200, headers: dict[str, str] | None = None
+) -> Response:
+    """Encode an already serialized ``payload`` as a compact JSON response."""
+
+    return Response(
+        json.dumps(payload, separators=(",", ":")),
+        status_code=status,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+async def run_service(request: Request, call: Callable[[Session], ResultT]) -> ResultT:
+    """Run ``call`` with a sync view of a fresh ``AsyncSession``.
+
+    ``call`` receives the session the services expect and should return
+    already serialized data, since lazy loads are not possible once the
+    session is closed.
+    """
+
+    async with request.app.state.sessionmaker() as session:
+        return await session.run_sync(call)
+
+
+async def json_body(request: Request) -> object:
+    try:
+        return await request.json()
+    except ValueError as exc:
+        raise ValidationError("Request body must be valid JSON.") from exc
+
+
+def entity_cache(request: Request) -> EntityCache | None:
+    return request.app.state.entity_cache
+
+
+def client_expansion(
+    expand: str | None, clients: list[Client], session: Session, cache: EntityCache | None
+) -> Expansion | None:
+    if expand == "transactions":
+        return expand_client_transactions(clients, TransactionService(session, cache=cache))
+    return None
+
+
+def transaction_expansion(
+    expand: str | None, transactions: list[Transaction], session: Session, cache: EntityCache | None
+) -> Expansion | None:
+    if expand == "client":
+        return expand_transaction_client(transactions, ClientService(session, cache=cache))
+    return None
+
+
+def dump_expanded(
+    serializer: CompiledSerializer, items: list[Any], expansion: Expansion | None
+) -> list[dict[str, Any]]:
+    payloads = serializer.dump_many(items)
+    if expansion is not None:
+        expansion.apply(payloads, items)
+    return payloads
+
+
+async def list_clients(request: Request) -> Response:
+    args = client_query_schema.load(dict(request.query_params))
+    cache = entity_cache(request)
+
+    serializer = compiled_serializer(ClientSchema, args["field_names"])
+
+    def call(session: Session) -> dict[str, Any]:
+        service = ClientService(session, cache=cache)
+        if args["ids"] is not None:
+            found = service.get_clients(args["ids"])
+            expansion = client_expansion(args["expand"], found["items"], session, cache)
+            return {**found, "items": dump_expanded(serializer, found["items"], expansion)}
+        result = service.list_clients(
+            page=args["page"],
+            per_page=args["per_page"],
+            name=args.get("name"),
+            email=args.get("email"),
+            cursor=args.get("cursor"),
+            include_total=args["include_total"],
+            q=args.get("q"),
+            only=columns_for(args["field_names"], args["expand"]),
+        )
+        expansion = client_expansion(args["expand"], result["items"], session, cache)
+        return list_envelope(result, dump_expanded(serializer, result["items"], expansion))
+
+    return json_response(await run_service(request, call))
+
+
+async def create_client(request: Request) -> Response:
+    payload = client_create_schema.load(await json_body(request))
+    cache = entity_cache(request)
+
+    def call(session: Session) -> dict[str, Any]:
+        return client_serializer.dump(ClientService(session, cache=cache).create_client(payload))
+
+    return json_response(await run_service(request, call), 201)
+
+
+async def get_client(request: Request) -> Response:
+    client_id = request.path_params["client_id"]
+    args = client_item_query_schema.load(dict(request.query_params))
+    cache = entity_cache(request)
+
+    serializer = compiled_serializer(ClientSchema, args["field_names"])
+
+    def call(session: Session) -> tuple[dict[str, Any], str]:
+        client = ClientService(session, cache=cache).get_client(client_id)
+        expansion = client_expansion(args["expand"], [client], session, cache)
+        if expansion is None:
+            return serializer.dump(client), entity_etag("client", client.id, client.version)
+        etag = expanded_etag("client", client.id, client.version, expansion.entities)
+        return dump_expanded(serializer, [client], expansion)[0], etag
+
+    body, etag = await run_service(request, call)
+    return json_response(body, headers={"ETag": etag})
+
+
+async def update_client(request: Request) -> Response:
+    client_id = request.path_params["client_id"]
+    payload = client_update_schema.load(await json_body(request))
+    cache = entity_cache(request)
+
+    def call(session: Session) -> tuple[dict[str, Any], str]:
+        client = ClientService(session, cache=cache).update_client(client_id, payload)
+        return client_serializer.dump(client), entity_etag("client", client.id, client.version)
+
+    body, etag = await run_service(request, call)
+    return json_response(body, headers={"ETag": etag})
+
+
+async def delete_client(request: Request) -> Response:
+    client_id = request.path_params["client_id"]
+    cache = entity_cache(request)
+
+    def call(session: Session) -> None:
+        ClientService(session, cache=cache).delete_client(client_id)
+
+    await run_service(request, call)
+    return Response(status_code=204)
+
+
+async def get_client_balances(request: Request) -> Response:
+    client_id = request.path_params["client_id"]
+
+    def call(session: Session) -> dict[str, Any]:
+        balances = BalanceService(session).get_client_balances(client_id)
+        return {"client_id": client_id, "balances": balance_serializer.dump_many(balances)}
+
+    return json_response(await run_service(request, call))
+
+
+async def list_client_transactions(request: Request) -> Response:
+    client_id = request.path_params["client_id"]
+    args = client_transactions_query_schema.load(dict(request.query_params))
+    cache = entity_cache(request)
+
+    serializer = compiled_serializer(TransactionSchema, args["field_names"])
+
+    def call(session: Session) -> dict[str, Any]:
+        result = TransactionService(session, cache=cache).list_client_transactions(
+            client_id,
+            page=args["page"],
+            per_page=args["per_page"],
+            cursor=args.get("cursor"),
+            only=args["field_names"],
+        )
+        return list_envelope(result, serializer.dump_many(result["items"]))
+
+    return json_response(await run_service(request, call))
+
+
+async def list_transactions(request: Request) -> Response:
+    args = transaction_query_schema.load(dict(request.query_params))
+    cache = entity_cache(request)
+
+    serializer = compiled_serializer(TransactionSchema, args["field_names"])
+
+    def call(session: Session) -> dict[str, Any]:
+        service = TransactionService(session, cache=cache)
+        if args["ids"] is not None:
+            found = service.get_transactions(args["ids"])
+            expansion = transaction_expansion(args["expand"], found["items"], session, cache)
+            items = dump_expanded(serializer, found["items"], expansion)
+            return {**found, "items": items}
+        result = service.list_transactions(
+            page=args["page"],
+            per_page=args["per_page"],
+            client_id=args.get("client_id"),
+            txn_type=args.get("type"),
+            start_date=args.get("start_date"),
+            end_date=args.get("end_date"),
+            cursor=args.get("cursor"),
+            only=columns_for(args["field_names"], args["expand"]),
+        )
+        expansion = transaction_expansion(args["expand"], result["items"], session, cache)
+        return list_envelope(result, dump_expanded(serializer, result["items"], expansion))
+
+    return json_response(await run_service(request, call))
+
+
+async def create_transaction(request: Request) -> Response:
+    payload = transaction_create_schema.load(await json_body(request))
+    cache = entity_cache(request)
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    scope = f"{request.method} {request.url.path}"
+    ttl = request.app.state.idempotency_key_ttl
+
+    def call(session: Session) -> tuple[StoredResponse, bool]:
+        service = TransactionService(session, cache=cache)
+        if key is None:
+            transaction = service.create_transaction(payload)
+            return StoredResponse(201, transaction_serializer.dump(transaction)), False
+
+        idempotency = IdempotencyService(session, ttl=ttl)
+        stored = idempotency.reserve(key, scope, request_fingerprint(payload))
+        if stored is not None:
+            return stored, True
+        body: dict[str, object] = {}
+
+        def record(transaction: Transaction) -> None:
+            body.update(transaction_serializer.dump(transaction))
+            idempotency.complete(key, scope, 201, body)
+
+        service.create_transaction(payload, before_commit=record)
+        return StoredResponse(201, body), False
+
+    response, replayed = await run_service(request, call)
+    headers = {REPLAYED_HEADER: "true"} if replayed else None
+    return json_response(response.body, response.status, headers=headers)
+
+
+async def get_transaction(request: Request) -> Response:
+    transaction_id = request.path_params["transaction_id"]
+    args = transaction_item_query_schema.load(dict(request.query_params))
+    cache = entity_cache(request)
+
+    serializer = compiled_serializer(TransactionSchema, args["field_names"])
+
+    def call(session: Session) -> tuple[dict[str, Any], str]:
+        transaction = TransactionService(session, cache=cache).get_transaction(transaction_id)
+        expansion = transaction_expansion(args["expand"], [transaction], session, cache)
+        if expansion is None:
+            etag = entity_etag("transaction", transaction.id, transaction.version)
+            return serializer.dump(transaction), etag
+        etag = expanded_etag(
+            "transaction", transaction.id, transaction.version, expansion.entities
+        )
+        return dump_expanded(serializer, [transaction], expansion)[0], etag
+
+    body, etag = await run_service(request, call)
+    return json_response(body, headers={"ETag": etag})
+
+
+async def update_transaction(request: Request) -> Response:
+    transaction_id = request.path_params["transaction_id"]
+    payload = transaction_update_schema.load(await json_body(request))
+    cache = entity_cache(request)
+
+    def call(session: Session) -> tuple[dict[str, Any], str]:
+        service = TransactionService(session, cache=cache)
+        transaction = service.update_transaction(transaction_id, payload)
+        etag = entity_etag("transaction", transaction.id, transaction.version)
+        return transaction_serializer.dump(transaction), etag
+
+    body, etag = await run_service(request, call)
+    return json_response(body, headers={"ETag": etag})
+
+
+async def delete_transaction(request: Request) -> Response:
+    transaction_id = request.path_params["transaction_id"]
+    cache = entity_cache(request)
+
+    def call(session: Session) -> None:
+        TransactionService(session, cache=cache).delete_transaction(transaction_id)
+
+    await run_service(request, call)
+    return Response(status_code=204)
+
+
+async def handle_not_found(_request: Request, error: EntityNotFoundError) -> Response:
+    return json_response({"message": error.message, "entity": error.entity}, 404)
+
+
+async def handle_validation(_request: Request, error: ValidationError) -> Response:
+    payload = {"message": error.message}
+    if error.field:
+        payload["field"] = error.field
+    return json_response(payload, VALIDATION_STATUS.get(error.field, 400))
+
+
+async def handle_marshmallow(
+    _request: Request, error: MarshmallowValidationError
+) -> Response:
+    return json_response({"message": "Validation error", "errors": error.messages}, 400)
+
+
+async def handle_stale_data(_request: Request, _error: StaleDataError) -> Response:
+    return json_response(
+        {"message": "The resource was modified concurrently; retry the request."}, 409
+    )
+
+
+async def health(_request: Request) -> Response:
+    return json_response({"status": "ok"})
+
+
+routes = [
+    Route("/health", health),
+    Route("/api/v1/clients", list_clients, methods=["GET"]),
+    Route("/api/v1/clients", create_client, methods=["POST"]),
+    Route("/api/v1/clients/{client_id:int}", get_client, methods=["GET"]),
+    Route("/api/v1/clients/{client_id:int}", update_client, methods=["PUT"]),
+    Route("/api/v1/clients/{client_id:int}", delete_client, methods=["DELETE"]),
+    Route("/api/v1/clients/{client_id:int}/balance", get_client_balances, methods=["GET"]),
+    Route(
+        "/api/v1/clients/{client_id:int}/transactions", list_client_transactions, methods=["GET"]
+    ),
+    Route("/api/v1/transactions", list_transactions, methods=["GET"]),
+    Route("/api/v1/transactions", create_transaction, methods=["POST"]),
+    Route("/api/v1/transactions/{transaction_id:int}", get_transaction, methods=["GET"]),
+    Route("/api/v1/transactions/{transaction_id:int}", update_transaction, methods=["PUT"]),
+    Route("/api/v1/transactions/{transaction_id:int}", delete_transaction, methods=["DELETE"]),
+]
+
+
+def create_asgi_app(config_name: str | None = None) -> Starlette:
+    """Create the ASGI application for the given configuration."""
+
+    config = get_config(config_name)
+    engine = create_async_db_engine(
+        config.SQLALCHEMY_DATABASE_URI, dict(config.SQLALCHEMY_ENGINE_OPTIONS)
+    )
+
+    @asynccontextmanager
+    async def lifespan(_app: Starlette) -> AsyncIterator[None]:
+        yield
+        await engine.dispose()
+
+    middleware = []
+    if config.COMPRESSION_ENABLED:
+        # Starlette only negotiates gzip; the Flask app also offers zstd and deflate.
+        middleware.append(
+            Middleware(
+                GZipMiddleware,
+                minimum_size=config.COMPRESSION_MIN_SIZE,
+                compresslevel=config.COMPRESSION_LEVEL,
+            )
+        )
+    app = Starlette(
+        routes=routes,
+        lifespan=lifespan,
+        middleware=middleware,
+        exception_handlers={
+            EntityNotFoundError: handle_not_found,
+            ValidationError: handle_validation,
+            MarshmallowValidationError: handle_marshmallow,
+            StaleDataError: handle_stale_data,
+        },
+    )
+    app.state.engine = engine
+    app.state.sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    app.state.idempotency_key_ttl = config.IDEMPOTENCY_KEY_TTL
+    app.state.entity_cache = build_entity_cache(
+        {name: getattr(config, name) for name in dir(config) if name.isupper()}
+    )
+    return app
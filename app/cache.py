@@ -0,0 +1,301 @@
+"""Read-through entity cache used by the service layer."""
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol, TypeVar, cast
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from werkzeug.utils import import_string
+
+ModelT = TypeVar("ModelT")
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters used to size a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CacheBackend(Protocol):
+    """Minimal key/value interface a cache backend must provide."""
+
+    evictions: int
+
+    def get(self, key: str) -> object | None: ...
+
+    def set(self, key: str, value: object) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class RedisLikeClient(Protocol):
+    """Subset of the Redis client API used by :class:`SharedCache`."""
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ex: int) -> object: ...
+
+    def delete(self, key: str) -> object: ...
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL.
+
+    ``get`` returns ``None`` on a miss. Entries older than ``ttl`` seconds
+    are dropped on access; when ``max_size`` is exceeded the least recently
+    used entry is evicted.
+    """
+
+    def __init__(
+        self, *, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> object | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: object) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SharedCache:
+    """Adapter over a Redis-style client so every worker shares one cache.
+
+    The client needs ``get(key)``, ``set(key, value, ex=seconds)`` and
+    ``delete(key)``. Values are pickled; evictions are left to the store.
+    """
+
+    def __init__(
+        self, client: RedisLikeClient, *, ttl: float, prefix: str = "entity-cache:"
+    ) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.evictions = 0
+
+    def get(self, key: str) -> object | None:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        return pickle.loads(raw)  # noqa: S301 - values are written by this class only
+
+    def set(self, key: str, value: object) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=max(int(self.ttl), 1))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+
+class InMemoryStore:
+    """Local stand-in for a Redis-style client, for tests and development."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._values: dict[str, tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or entry[0] <= self._clock():
+                self._values.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ex: int) -> None:
+        with self._lock:
+            self._values[key] = (self._clock() + ex, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+
+class EntityCache:
+    """Caches column snapshots of entities by kind and id.
+
+    Each kind carries a generation token so a whole kind can be invalidated
+    at once (e.g. the transactions of a deleted client) without scanning
+    keys. Tokens are timestamps, so a token lost to eviction can never bring
+    back entries from an older generation.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._stats.hits, self._stats.misses, self.backend.evictions)
+
+    def get(self, kind: str, entity_id: int) -> dict[str, Any] | None:
+        return self._get(self._key(kind, self._generation(kind), entity_id))
+
+    def set(self, kind: str, entity_id: int, snapshot: dict[str, Any]) -> None:
+        self.backend.set(self._key(kind, self._generation(kind), entity_id), snapshot)
+
+    def _get(self, key: str) -> dict[str, Any] | None:
+        snapshot = cast("dict[str, Any] | None", self.backend.get(key))
+        with self._lock:
+            if snapshot is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        return snapshot
+
+    def fetch(
+        self, session: Session, model: type[ModelT], kind: str, entity_id: int
+    ) -> ModelT | None:
+        """Return the ``model`` instance with ``entity_id``, reading through the cache.
+
+        A hit is attached to ``session`` with ``merge(load=False)``, so it
+        behaves like a freshly loaded instance without a database round-trip.
+        """
+
+        key = self._key(kind, self._generation(kind), entity_id)
+        snapshot = self._get(key)
+        if snapshot is not None:
+            entity = model(**snapshot)
+            make_transient_to_detached(entity)
+            return session.merge(entity, load=False)
+
+        entity = session.get(model, entity_id)
+        if entity is not None:
+            self.backend.set(key, self._snapshot(model, entity))
+        return entity
+
+    def fetch_many(
+        self,
+        session: Session,
+        model: type[ModelT],
+        kind: str,
+        entity_ids: Iterable[int],
+        load: Callable[[list[int]], Iterable[ModelT]],
+    ) -> dict[int, ModelT]:
+        """Return the cached or loaded instances among ``entity_ids`` by id.
+
+        Hits are attached to ``session`` as in :meth:`fetch`; the misses are
+        passed to ``load`` in one call and cached. Ids that ``load`` does not
+        return are left out.
+        """
+
+        generation = self._generation(kind)
+        found: dict[int, ModelT] = {}
+        misses = []
+        for entity_id in entity_ids:
+            snapshot = self._get(self._key(kind, generation, entity_id))
+            if snapshot is None:
+                misses.append(entity_id)
+                continue
+            entity = model(**snapshot)
+            make_transient_to_detached(entity)
+            found[entity_id] = session.merge(entity, load=False)
+
+        if misses:
+            for entity in load(misses):
+                entity_id = entity.id  # type: ignore[attr-defined]
+                self.backend.set(
+                    self._key(kind, generation, entity_id), self._snapshot(model, entity)
+                )
+                found[entity_id] = entity
+        return found
+
+    @staticmethod
+    def _snapshot(model: type[Any], entity: object) -> dict[str, Any]:
+        return {column.key: getattr(entity, column.key) for column in inspect(model).column_attrs}
+
+    def invalidate(self, kind: str, entity_id: int) -> None:
+        self.backend.delete(self._key(kind, self._generation(kind), entity_id))
+
+    def invalidate_kind(self, kind: str) -> None:
+        self.backend.set(f"{kind}:generation", time.time_ns())
+
+    def _generation(self, kind: str) -> object:
+        # Read once per operation: every lookup against a shared backend is a round-trip.
+        generation_key = f"{kind}:generation"
+        generation = self.backend.get(generation_key)
+        if generation is None:
+            generation = time.time_ns()
+            self.backend.set(generation_key, generation)
+        return generation
+
+    @staticmethod
+    def _key(kind: str, generation: object, entity_id: int) -> str:
+        return f"{kind}:{generation}:{entity_id}"
+
+
+def build_entity_cache(config: Mapping[str, Any]) -> EntityCache | None:
+    """Build the entity cache described by ``config``, or ``None`` when disabled."""
+
+    backend_name = config["ENTITY_CACHE_BACKEND"]
+    ttl = config["ENTITY_CACHE_TTL"]
+    backend: CacheBackend
+    if backend_name == "local":
+        backend = LRUCache(max_size=config["ENTITY_CACHE_MAX_SIZE"], ttl=ttl)
+    elif backend_name == "shared":
+        client_factory = import_string(config["ENTITY_CACHE_SHARED_FACTORY"])
+        backend = SharedCache(client_factory(), ttl=ttl)
+    elif backend_name == "none":
+        return None
+    else:
+        raise ValueError(f"Unknown entity cache backend: {backend_name}")
+    return EntityCache(backend)
+
+
+def init_entity_cache(app: Flask) -> None:
+    """Build the entity cache described by the app configuration."""
+
+    app.extensions["entity_cache"] = build_entity_cache(app.config)
+
+
+def get_entity_cache() -> EntityCache | None:
+    """Return the entity cache of the current app, if one is configured."""
+
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("entity_cache")
@@ -0,0 +1,100 @@
+"""Flask CLI commands for maintenance tasks."""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from .services import BalanceService, IdempotencyService, PartitionService, StatsService
+from .services.balance_service import REBUILD_CHUNK_SIZE
+from .services.partition_service import (
+    DEFAULT_ARCHIVE_SCHEMA,
+    DEFAULT_MONTHS_AHEAD,
+    add_months,
+    month_start,
+)
+
+balances_cli = AppGroup("balances", help="Maintain the client_balances table.")
+rollups_cli = AppGroup("rollups", help="Maintain the client_daily_totals table.")
+partitions_cli = AppGroup("partitions", help="Maintain the monthly transaction partitions.")
+idempotency_cli = AppGroup("idempotency", help="Maintain the idempotency_keys table.")
+
+
+@balances_cli.command("rebuild")
+@click.option("--chunk-size", default=REBUILD_CHUNK_SIZE, show_default=True, type=int)
+def rebuild_balances(chunk_size: int) -> None:
+    """Recompute every client balance from the transactions table."""
+
+    processed = BalanceService().rebuild(chunk_size=chunk_size)
+    click.echo(f"Rebuilt balances for {processed} clients.")
+
+
+@rollups_cli.command("rebuild")
+@click.option("--chunk-size", default=REBUILD_CHUNK_SIZE, show_default=True, type=int)
+def rebuild_rollups(chunk_size: int) -> None:
+    """Recompute every daily total from the transactions table."""
+
+    processed = StatsService().rebuild(chunk_size=chunk_size)
+    click.echo(f"Rebuilt daily totals for {processed} clients.")
+
+
+@partitions_cli.command("list")
+def list_partitions() -> None:
+    """Show the attached partitions and their estimated row counts."""
+
+    for partition in PartitionService().list_partitions():
+        click.echo(f"{partition.name}  {partition.month:%Y-%m}  ~{partition.estimated_rows} rows")
+
+
+@partitions_cli.command("maintain")
+@click.option("--months-ahead", default=DEFAULT_MONTHS_AHEAD, show_default=True, type=int)
+@click.option(
+    "--retain-months",
+    type=int,
+    default=None,
+    help="Also archive partitions older than this many months.",
+)
+@click.option("--schema", default=DEFAULT_ARCHIVE_SCHEMA, show_default=True)
+@click.option("--drop", is_flag=True, help="Drop archived partitions instead of keeping them.")
+def maintain_partitions(
+    months_ahead: int, retain_months: int | None, schema: str, drop: bool
+) -> None:
+    """Create upcoming monthly partitions and optionally archive old ones; run daily."""
+
+    service = PartitionService()
+    created = service.ensure_partitions(months_ahead=months_ahead)
+    click.echo(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+    if retain_months is not None:
+        before = add_months(month_start(datetime.now(UTC).date()), -retain_months)
+        archived = service.archive_partitions(before=before, schema=schema, drop=drop)
+        click.echo(f"Archived {len(archived)} partitions: {', '.join(archived) or '-'}")
+
+
+@partitions_cli.command("archive")
+@click.option("--before", required=True, type=click.DateTime(formats=["%Y-%m"]))
+@click.option("--schema", default=DEFAULT_ARCHIVE_SCHEMA, show_default=True)
+@click.option("--drop", is_flag=True, help="Drop the partitions instead of keeping them.")
+def archive_partitions(before: datetime, schema: str, drop: bool) -> None:
+    """Detach the partitions of months before --before (YYYY-MM)."""
+
+    archived = PartitionService().archive_partitions(before=before.date(), schema=schema, drop=drop)
+    click.echo(f"Archived {len(archived)} partitions: {', '.join(archived) or '-'}")
+
+
+@idempotency_cli.command("purge")
+def purge_idempotency_keys() -> None:
+    """Delete idempotency keys whose IDEMPOTENCY_KEY_TTL has passed."""
+
+    removed = IdempotencyService().purge_expired()
+    click.echo(f"Removed {removed} expired idempotency keys.")
+
+
+def register_commands(app: Flask) -> None:
+    """Attach the CLI command groups to ``app``."""
+
+    app.cli.add_command(balances_cli)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(partitions_cli)
+    app.cli.add_command(idempotency_cli)
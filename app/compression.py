@@ -0,0 +1,113 @@
+"""Negotiated compression of JSON, NDJSON and CSV response bodies.
+
+An ``after_request`` hook encodes eligible responses with the coding the
+client prefers among those it accepts: zstd when the optional ``zstandard``
+package is installed, then gzip and deflate. Bodies shorter than
+``COMPRESSION_MIN_SIZE`` bytes go out unencoded. Streamed responses such as
+exports are encoded chunk by chunk as the view produces them, so the body is
+never buffered whole. Responses that already carry a ``Content-Encoding``,
+like the pre-rendered Swagger document, are left alone.
+"""
+from __future__ import annotations
+
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Protocol
+
+from flask import Flask, Response, request
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {"application/json", "application/x-ndjson", "text/csv", "text/plain", "text/html"}
+)
+UNCOMPRESSIBLE_STATUSES = frozenset({204, 206, 304})
+
+
+class Encoder(Protocol):
+    """Incremental compressor with the ``zlib.compressobj`` interface."""
+
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+def encoders(level: int, zstd_level: int) -> dict[str, Callable[[], Encoder]]:
+    """Return the available encoder factories keyed by coding, most preferred first."""
+
+    factories: dict[str, Callable[[], Encoder]] = {}
+    if zstandard is not None:
+        factories["zstd"] = lambda: zstandard.ZstdCompressor(level=zstd_level).compressobj()
+    # gzip and deflate share zlib's DEFLATE stream; only the framing differs.
+    factories["gzip"] = lambda: zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    factories["deflate"] = lambda: zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS)
+    return factories
+
+
+def encode_stream(chunks: Iterable[bytes], encoder: Encoder) -> Iterator[bytes]:
+    """Compress ``chunks`` lazily, yielding output whenever the encoder emits some."""
+
+    for chunk in chunks:
+        data = encoder.compress(chunk)
+        if data:
+            yield data
+    yield encoder.flush()
+
+
+@dataclass(frozen=True, slots=True)
+class ResponseCompressor:
+    """Picks a coding for each response and encodes its body."""
+
+    factories: dict[str, Callable[[], Encoder]]
+    min_size: int
+
+    @property
+    def offers(self) -> list[str]:
+        # Listing ``identity`` lets ``identity;q=1, gzip;q=0.5`` keep the body unencoded.
+        return [*self.factories, "identity"]
+
+    def __call__(self, response: Response) -> Response:
+        if (
+            request.method == "HEAD"
+            or response.status_code < 200
+            or response.status_code in UNCOMPRESSIBLE_STATUSES
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        coding = request.accept_encodings.best_match(self.offers)
+        if coding is None or coding == "identity":
+            return response
+        if not response.is_streamed and response.calculate_content_length() < self.min_size:
+            return response
+
+        encoder = self.factories[coding]()
+        if response.is_streamed:
+            source = response.response
+            response.response = encode_stream(response.iter_encoded(), encoder)
+            # Keep ``stream_with_context`` teardown running when the server closes the body.
+            response.call_on_close(getattr(source, "close", lambda: None))
+            response.headers.pop("Content-Length", None)
+        else:
+            response.set_data(encoder.compress(response.get_data()) + encoder.flush())
+        response.headers["Content-Encoding"] = coding
+        # The encoded bytes differ from the identity representation.
+        etag, weak = response.get_etag()
+        if etag is not None and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def init_compression(app: Flask) -> None:
+    """Compress eligible responses when ``COMPRESSION_ENABLED`` is set."""
+
+    if not app.config["COMPRESSION_ENABLED"]:
+        return
+    factories = encoders(app.config["COMPRESSION_LEVEL"], app.config["COMPRESSION_ZSTD_LEVEL"])
+    app.after_request(ResponseCompressor(factories, app.config["COMPRESSION_MIN_SIZE"]))
@@ -1,45 +1,148 @@
 """Application configuration module."""
 from __future__ import annotations
 
+import json
 import os
-from dataclasses import dataclass
+from collections.abc import Mapping
+
+from .pool import TimedQueuePool
+
+DEFAULT_DATABASE_URL = "postgresql+psycopg://postgres:postgres@db:5432/postgres"
+
+
+def _env_int(
+    environ: Mapping[str, str],
+    name: str,
+    default: int | None,
+    *,
+    minimum: int = 0,
+    allow_off: bool = False,
+) -> int | None:
+    raw = environ.get(name, "").strip()
+    if not raw:
+        return default
+    if raw.lower() in {"none", "off"}:
+        if not allow_off:
+            raise ValueError(f"{name} cannot be disabled, got {raw!r}")
+        return None
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from exc
+    if value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}, got {value}")
+    return value
+
+
+def _env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    raw = environ.get(name, "").strip().lower()
+    if not raw:
+        return default
+    if raw in {"1", "true", "yes", "on"}:
+        return True
+    if raw in {"0", "false", "no", "off"}:
+        return False
+    raise ValueError(f"{name} must be a boolean, got {raw!r}")
+
+
+def engine_options(
+    database_uri: str, environ: Mapping[str, str] = os.environ
+) -> dict[str, object]:
+    """Build validated SQLAlchemy engine options from ``DB_*`` environment variables.
+
+    Pool sizes apply per worker process. ``DB_PREPARE_THRESHOLD`` is passed to
+    psycopg 3, which prepares a statement server-side after it has run that
+    many times on a connection; ``off`` disables prepared statements, as
+    required behind PgBouncer in transaction mode. ``SQLALCHEMY_ENGINE_OPTIONS``
+    may hold a JSON object whose keys override the computed options.
+    """
+
+    options: dict[str, object] = {
+        "pool_pre_ping": _env_bool(environ, "DB_POOL_PRE_PING", True),
+        "pool_recycle": _env_int(environ, "DB_POOL_RECYCLE", 1800, minimum=-1),
+    }
+    if not database_uri.startswith("sqlite"):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=_env_int(environ, "DB_POOL_SIZE", 5, minimum=1),
+            max_overflow=_env_int(environ, "DB_MAX_OVERFLOW", 5, minimum=-1),
+            pool_timeout=_env_int(environ, "DB_POOL_TIMEOUT", 30, minimum=1),
+        )
+    if database_uri.startswith("postgresql+psycopg"):
+        options["connect_args"] = {
+            "prepare_threshold": _env_int(
+                environ, "DB_PREPARE_THRESHOLD", 5, allow_off=True
+            ),
+        }
+
+    raw_overrides = environ.get("SQLALCHEMY_ENGINE_OPTIONS", "").strip()
+    if raw_overrides:
+        try:
+            overrides = json.loads(raw_overrides)
+        except json.JSONDecodeError as exc:
+            raise ValueError("SQLALCHEMY_ENGINE_OPTIONS must be a JSON object") from exc
+        if not isinstance(overrides, dict):
+            raise ValueError("SQLALCHEMY_ENGINE_OPTIONS must be a JSON object")
+        options.update(overrides)
+    return options
 
 
-@dataclass(slots=True)
 class BaseConfig:
     """Base configuration shared across environments."""
 
-    SQLALCHEMY_DATABASE_URI: str = os.environ.get(
-        "DATABASE_URL", "postgresql+psycopg://postgres:postgres@db:5432/postgres"
-    )
-    SQLALCHEMY_ENGINE_OPTIONS: dict[str, object] = os.environ.get(
-        "SQLALCHEMY_ENGINE_OPTIONS", {}
-    ) or {}
+    SQLALCHEMY_DATABASE_URI: str = os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL)
+    SQLALCHEMY_ENGINE_OPTIONS: dict[str, object] = engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
     PROPAGATE_EXCEPTIONS: bool = True
     RESTX_MASK_SWAGGER: bool = False
+    SWAGGER_PRERENDER: bool = _env_bool(os.environ, "SWAGGER_PRERENDER", True)
     ERROR_404_HELP: bool = False
     JSON_SORT_KEYS: bool = False
     TESTING: bool = False
+    TRANSACTION_BATCH_MAX_ITEMS: int = int(os.environ.get("TRANSACTION_BATCH_MAX_ITEMS", 5000))
+    CLIENT_IMPORT_CHUNK_SIZE: int = int(os.environ.get("CLIENT_IMPORT_CHUNK_SIZE", 1000))
+    CLIENT_IMPORT_MAX_ERRORS: int = int(os.environ.get("CLIENT_IMPORT_MAX_ERRORS", 1000))
+    IDEMPOTENCY_KEY_TTL: float = float(os.environ.get("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+    ENTITY_CACHE_BACKEND: str = os.environ.get("ENTITY_CACHE_BACKEND", "none")
+    ENTITY_CACHE_MAX_SIZE: int = int(os.environ.get("ENTITY_CACHE_MAX_SIZE", 10000))
+    ENTITY_CACHE_TTL: float = float(os.environ.get("ENTITY_CACHE_TTL", 30))
+    ENTITY_CACHE_SHARED_FACTORY: str = os.environ.get(
+        "ENTITY_CACHE_SHARED_FACTORY", "app.cache:InMemoryStore"
+    )
+    REQUEST_INSTRUMENTATION: bool = _env_bool(os.environ, "REQUEST_INSTRUMENTATION", False)
+    N_PLUS_ONE_THRESHOLD: int = int(os.environ.get("N_PLUS_ONE_THRESHOLD", 5))
+    METRICS_ENABLED: bool = _env_bool(os.environ, "METRICS_ENABLED", True)
+    READINESS_PING_INTERVAL: float = float(os.environ.get("READINESS_PING_INTERVAL", 5))
+    READINESS_STALE_AFTER: float = float(os.environ.get("READINESS_STALE_AFTER", 15))
+    READINESS_MAX_PING_MS: float = float(os.environ.get("READINESS_MAX_PING_MS", 250))
+    READINESS_MAX_POOL_SATURATION: float = float(
+        os.environ.get("READINESS_MAX_POOL_SATURATION", 0.9)
+    )
+    READINESS_MAX_IN_FLIGHT: int = int(os.environ.get("READINESS_MAX_IN_FLIGHT", 64))
+    COMPRESSION_ENABLED: bool = _env_bool(os.environ, "COMPRESSION_ENABLED", True)
+    COMPRESSION_MIN_SIZE: int = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_LEVEL: int = int(os.environ.get("COMPRESSION_LEVEL", 6))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.environ.get("COMPRESSION_ZSTD_LEVEL", 3))
 
 
-@dataclass(slots=True)
 class DevelopmentConfig(BaseConfig):
     """Configuration for local development."""
 
     DEBUG: bool = True
 
 
-@dataclass(slots=True)
 class TestingConfig(BaseConfig):
     """Configuration used during unit tests."""
 
     SQLALCHEMY_DATABASE_URI: str = "sqlite+pysqlite:///:memory:"
     SQLALCHEMY_ENGINE_OPTIONS: dict[str, object] = {"connect_args": {"check_same_thread": False}}
     TESTING: bool = True
+    # Tests call ReadinessMonitor.ping() themselves instead of running the pinger thread.
+    READINESS_PING_INTERVAL: float = 0
+    # A single process, so the local cache cannot serve another worker's stale entries.
+    ENTITY_CACHE_BACKEND: str = "local"
 
 
-@dataclass(slots=True)
 class ProductionConfig(BaseConfig):
     """Configuration for production deployments."""
 
@@ -1,13 +1,16 @@
 """Centralized instances of Flask extensions."""
 from __future__ import annotations
 
-from flask_migrate import Migrate
+import sqlite3
+from typing import Any
+
+from flask import Flask
 from flask_restx import Api
 from flask_sqlalchemy import SQLAlchemy
-
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
-migrate = Migrate()
 api = Api(
     title="Flask CRUD Demo API",
     version="1.0.0",
@@ -15,3 +18,24 @@ api = Api(
     doc="/docs",
 )
 
+
+def init_migrate(app: Flask) -> None:
+    """Register Flask-Migrate; imported here because Alembic is only needed by the CLI."""
+
+    from flask_migrate import Migrate
+
+    Migrate(app, db)
+
+
+def enable_sqlite_foreign_keys(dbapi_connection: Any, _connection_record: object) -> None:  # noqa: ANN401
+    """Enforce ``ON DELETE CASCADE`` on SQLite, which ships with foreign keys disabled."""
+
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection: object, connection_record: object) -> None:
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        enable_sqlite_foreign_keys(dbapi_connection, connection_record)
@@ -0,0 +1,203 @@
+"""Opt-in per-request SQL and serialization instrumentation.
+
+With ``REQUEST_INSTRUMENTATION`` enabled every request records its query
+count, SQL time, ORM rows loaded, serialization time and total time. The
+numbers are returned in a ``Server-Timing`` header, which browser dev tools
+display, and logged as one JSON line per request. Statements that repeat
+``N_PLUS_ONE_THRESHOLD`` times or more in one request, ignoring literal
+values, are logged as a likely N+1 query.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .extensions import db
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|\?|:\w+")
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_POSTCOMPILE = re.compile(r"\[POSTCOMPILE_\w+\]")
+_WHITESPACE = re.compile(r"\s+")
+
+# A one-item list rather than an int so the ORM listener can bump it in place.
+_loaded_rows: ContextVar[list[int] | None] = ContextVar("loaded_rows", default=None)
+
+
+def statement_fingerprint(statement: str) -> str:
+    """Reduce ``statement`` to its shape, so statements differing only in values match."""
+
+    shape = _POSTCOMPILE.sub("(?)", statement)
+    shape = _LITERALS.sub("?", shape)
+    shape = _PLACEHOLDER_LISTS.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass(slots=True)
+class RequestMetrics:
+    """Counters collected while one request is handled."""
+
+    started: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    sql_ms: float = 0.0
+    serialize_ms: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.statements.items() if count >= threshold]
+
+    def server_timing(self, total_ms: float, rows_loaded: int) -> str:
+        return ", ".join(
+            [
+                f'sql;dur={self.sql_ms:.2f};desc="{self.query_count} queries"',
+                f'orm;desc="{rows_loaded} rows"',
+                f"serialize;dur={self.serialize_ms:.2f}",
+                f"total;dur={total_ms:.2f}",
+            ]
+        )
+
+
+def current_metrics() -> RequestMetrics | None:
+    """Return the metrics of the request being handled, when it is instrumented."""
+
+    if not has_request_context():
+        return None
+    return g.get("request_metrics")
+
+
+@contextmanager
+def serialization_timer() -> Iterator[None]:
+    """Add the time spent in the block to the request's serialization time."""
+
+    metrics = current_metrics()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_ms += (time.perf_counter() - started) * 1000
+
+
+def _before_cursor_execute(
+    _conn: object,
+    _cursor: object,
+    _statement: str,
+    _parameters: object,
+    context: object,
+    _executemany: bool,
+) -> None:
+    if current_metrics() is not None:
+        context._instrumentation_started = time.perf_counter()  # type: ignore[attr-defined]
+
+
+def _after_cursor_execute(
+    _conn: object,
+    _cursor: object,
+    statement: str,
+    _parameters: object,
+    context: object,
+    _executemany: bool,
+) -> None:
+    metrics = current_metrics()
+    started = getattr(context, "_instrumentation_started", None)
+    if metrics is None or started is None:
+        return
+    metrics.query_count += 1
+    metrics.sql_ms += (time.perf_counter() - started) * 1000
+    metrics.statements[statement_fingerprint(statement)] += 1
+
+
+def _count_loaded_row(_target: object, _context: object, *_attrs: object) -> None:
+    counter = _loaded_rows.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def track_loaded_rows() -> None:
+    """Count rows the ORM hydrates (loads and refreshes) into the active counter."""
+
+    for name in ("load", "refresh"):
+        if not event.contains(db.Model, name, _count_loaded_row):
+            event.listen(db.Model, name, _count_loaded_row, propagate=True)
+
+
+def begin_row_count() -> None:
+    """Start counting loaded rows for the current request."""
+
+    _loaded_rows.set([0])
+
+
+def loaded_rows() -> int:
+    """Return the rows loaded since :func:`begin_row_count` in this context."""
+
+    counter = _loaded_rows.get()
+    return counter[0] if counter is not None else 0
+
+
+def _start_request() -> None:
+    begin_row_count()
+    g.request_metrics = RequestMetrics()
+
+
+def _finish_request(response: Response) -> Response:
+    metrics = current_metrics()
+    if metrics is None:
+        return response
+    total_ms = (time.perf_counter() - metrics.started) * 1000
+    rows = loaded_rows()
+    response.headers.add("Server-Timing", metrics.server_timing(total_ms, rows))
+    threshold = current_app.config["N_PLUS_ONE_THRESHOLD"]
+    for shape, count in metrics.repeated_statements(threshold):
+        logger.warning(
+            "Possible N+1 query: statement ran %d times in %s %s: %s",
+            count,
+            request.method,
+            request.path,
+            shape,
+        )
+    logger.info(
+        json.dumps(
+            {
+                "event": "request_metrics",
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": metrics.query_count,
+                "sql_ms": round(metrics.sql_ms, 3),
+                "rows_loaded": rows,
+                "serialize_ms": round(metrics.serialize_ms, 3),
+                "total_ms": round(total_ms, 3),
+            }
+        )
+    )
+    return response
+
+
+def init_instrumentation(app: Flask) -> None:
+    """Collect request metrics when ``REQUEST_INSTRUMENTATION`` is enabled."""
+
+    if not app.config["REQUEST_INSTRUMENTATION"]:
+        return
+    track_loaded_rows()
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
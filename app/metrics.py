@@ -0,0 +1,160 @@
+"""Prometheus metrics for requests, the connection pool and the entity cache.
+
+Under gunicorn each worker is a separate process. When
+``PROMETHEUS_MULTIPROC_DIR`` is set, ``prometheus_client`` writes every
+worker's samples to memory-mapped files in that directory and ``/metrics``
+aggregates them, so a scrape sees the whole node whichever worker answers.
+``gunicorn.conf.py`` clears the directory on start and marks exited workers
+dead so their gauges drop out.
+
+Pool and cache numbers are sampled from inside each worker at most once
+per ``POOL_SAMPLE_INTERVAL`` seconds, keeping the per-request cost to a
+few label lookups and histogram observations.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from flask import Flask, Response, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.pool import QueuePool
+
+from .cache import get_entity_cache
+from .extensions import db
+from .instrumentation import begin_row_count, loaded_rows, track_loaded_rows
+
+POOL_SAMPLE_INTERVAL = 1.0
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.", ["method", "route", "status"]
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+ROWS_LOADED = Histogram(
+    "orm_rows_loaded_per_request",
+    "Rows hydrated by the ORM while handling one request.",
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size.", multiprocess_mode="livesum")
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently in use.", multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size.", multiprocess_mode="livesum"
+)
+CACHE_HITS = Counter("entity_cache_hits_total", "Entity cache hits.")
+CACHE_MISSES = Counter("entity_cache_misses_total", "Entity cache misses.")
+CACHE_EVICTIONS = Counter("entity_cache_evictions_total", "Entity cache evictions.")
+
+
+class _Sampler:
+    """Copies pool state and cache counters into the metrics periodically."""
+
+    def __init__(self) -> None:
+        self.next_sample = 0.0
+        self.cache_seen = (0, 0, 0)
+        self._lock = threading.Lock()
+
+    def maybe_sample(self, now: float) -> None:
+        if now < self.next_sample or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._sample(now)
+        finally:
+            self._lock.release()
+
+    def _sample(self, now: float) -> None:
+        self.next_sample = now + POOL_SAMPLE_INTERVAL
+        pool = db.engine.pool
+        if isinstance(pool, QueuePool):
+            POOL_SIZE.set(pool.size())
+            POOL_CHECKED_OUT.set(pool.checkedout())
+            POOL_OVERFLOW.set(max(pool.overflow(), 0))
+        cache = get_entity_cache()
+        if cache is not None:
+            stats = cache.stats
+            seen = (stats.hits, stats.misses, stats.evictions)
+            for metric, before, after in zip(
+                (CACHE_HITS, CACHE_MISSES, CACHE_EVICTIONS), self.cache_seen, seen, strict=True
+            ):
+                if after > before:
+                    metric.inc(after - before)
+            self.cache_seen = seen
+
+
+# Labelled children by (method, route, status); ``labels()`` costs more than a dict lookup.
+_children: dict[tuple[str, str, int], tuple[Counter, Histogram]] = {}
+_request_started: ContextVar[float] = ContextVar("request_started", default=0.0)
+_response_status: ContextVar[int | None] = ContextVar("response_status", default=None)
+
+
+def _start_timer() -> None:
+    begin_row_count()
+    _request_started.set(time.perf_counter())
+    _response_status.set(None)
+
+
+def _remember_status(response: Response) -> Response:
+    _response_status.set(response.status_code)
+    return response
+
+
+def _observe(error: BaseException | None, sampler: _Sampler) -> None:
+    now = time.perf_counter()
+    status = _response_status.get()
+    if error is not None or status is None:
+        # An unhandled exception skipped the after_request hooks.
+        status = 500
+    current = request._get_current_object()  # type: ignore[attr-defined]  # one proxy lookup
+    rule = current.url_rule
+    key = (current.method, rule.rule if rule is not None else "<unmatched>", status)
+    children = _children.get(key)
+    if children is None:
+        children = _children.setdefault(
+            key, (REQUESTS.labels(*key), LATENCY.labels(key[0], key[1]))
+        )
+    children[0].inc()
+    children[1].observe(now - _request_started.get())
+    ROWS_LOADED.observe(loaded_rows())
+    sampler.maybe_sample(now)
+
+
+def render_metrics() -> Response:
+    """Render the metrics of every worker, or of this process outside multiprocess mode."""
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app: Flask) -> None:
+    """Record request metrics when ``METRICS_ENABLED`` is set."""
+
+    if not app.config["METRICS_ENABLED"]:
+        return
+    track_loaded_rows()
+    sampler = _Sampler()
+    app.before_request(_start_timer)
+    app.after_request(_remember_status)
+    # Teardown also runs when an exception propagates past the after_request hooks.
+    app.teardown_request(lambda error: _observe(error, sampler))
+
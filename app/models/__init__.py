@@ -1,6 +1,8 @@
 """Database models for the application."""
 from .client import Client
+from .client_balance import ClientBalance
+from .client_daily_total import ClientDailyTotal
+from .idempotency_key import IdempotencyKey
 from .transaction import Transaction
 
-__all__ = ["Client", "Transaction"]
-
+__all__ = ["Client", "ClientBalance", "ClientDailyTotal", "IdempotencyKey", "Transaction"]
@@ -0,0 +1,18 @@
+"""Shared helpers for database models."""
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+
+def utcnow() -> datetime:
+    """Return the current UTC time with microsecond precision."""
+
+    return datetime.now(UTC)
+
+
+def utc_day(moment: datetime) -> date:
+    """Return the UTC calendar day of ``moment``; naive values are taken as UTC."""
+
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC)
+    return moment.date()
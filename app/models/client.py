@@ -3,24 +3,43 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, UniqueConstraint, func
+from sqlalchemy import DDL, DateTime, Index, Integer, String, UniqueConstraint, event, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..extensions import db
+from .base import utcnow
 
 
 class Client(db.Model):
     """Represents a client entity."""
 
     __tablename__ = "clients"
-    __table_args__ = (UniqueConstraint("email", name="uq_clients_email"),)
+    __table_args__ = (
+        UniqueConstraint("email", name="uq_clients_email"),
+        Index("ix_clients_created_at_id", "created_at", "id"),
+        # Trigram indexes let Postgres answer the ILIKE '%term%' filters without a full scan.
+        Index(
+            "ix_clients_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_clients_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
     )
+    # Bumped by the ORM on every UPDATE; drives ETags and optimistic locking.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("1"))
 
     transactions = relationship(
         "Transaction",
@@ -29,6 +48,55 @@ class Client(db.Model):
         passive_deletes=True,
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"<Client id={self.id} email={self.email!r}>"
 
+
+event.listen(
+    Client.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# Full-text search behind ``GET /api/v1/clients?q=``. Neither structure is
+# mapped; ``ClientService`` queries them directly. Keep in sync with migration 0007.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', name), 'A') || "
+    "setweight(to_tsvector('simple', translate(email, '@.+_-', '     ')), 'B')"
+)
+SEARCH_DDL = {
+    # A stored generated column is maintained by Postgres on every write.
+    "postgresql": (
+        f"ALTER TABLE clients ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+        "CREATE INDEX ix_clients_search_vector ON clients USING gin (search_vector)",
+    ),
+    # An external-content FTS5 table stores only the index, kept in sync by triggers.
+    "sqlite": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts "
+        "USING fts5(name, email, content='clients', content_rowid='id')",
+        "CREATE TRIGGER clients_fts_insert AFTER INSERT ON clients BEGIN "
+        "INSERT INTO clients_fts (rowid, name, email) VALUES (new.id, new.name, new.email); "
+        "END",
+        "CREATE TRIGGER clients_fts_delete AFTER DELETE ON clients BEGIN "
+        "INSERT INTO clients_fts (clients_fts, rowid, name, email) "
+        "VALUES ('delete', old.id, old.name, old.email); "
+        "END",
+        "CREATE TRIGGER clients_fts_update AFTER UPDATE OF name, email ON clients BEGIN "
+        "INSERT INTO clients_fts (clients_fts, rowid, name, email) "
+        "VALUES ('delete', old.id, old.name, old.email); "
+        "INSERT INTO clients_fts (rowid, name, email) VALUES (new.id, new.name, new.email); "
+        "END",
+    ),
+}
+
+for _dialect, _statements in SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Client.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+event.listen(
+    Client.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS clients_fts").execute_if(dialect="sqlite"),
+)
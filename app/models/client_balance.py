@@ -0,0 +1,32 @@
+"""Client balance database model."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..extensions import db
+
+
+class ClientBalance(db.Model):
+    """Running DEBIT/CREDIT totals of a client in one currency."""
+
+    __tablename__ = "client_balances"
+
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True
+    )
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    credit_total: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    debit_total: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    @property
+    def balance(self) -> Decimal:
+        """Net balance: credits minus debits."""
+
+        return self.credit_total - self.debit_total
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"<ClientBalance client_id={self.client_id} currency={self.currency!r}>"
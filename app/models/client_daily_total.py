@@ -0,0 +1,35 @@
+"""Daily transaction totals database model."""
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..extensions import db
+
+
+class ClientDailyTotal(db.Model):
+    """DEBIT/CREDIT totals of a client in one currency on one UTC day."""
+
+    __tablename__ = "client_daily_totals"
+    __table_args__ = (
+        # Serves date ranges across every client; per-client ranges use the primary key.
+        Index("ix_client_daily_totals_day_currency", "day", "currency"),
+    )
+
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    credit_total: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    debit_total: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return (
+            f"<ClientDailyTotal client_id={self.client_id} day={self.day} "
+            f"currency={self.currency!r}>"
+        )
@@ -4,10 +4,22 @@ from __future__ import annotations
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Numeric, String, func
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..extensions import db
+from .base import utcnow
 
 TRANSACTION_TYPES = ("DEBIT", "CREDIT")
 SUPPORTED_CURRENCIES = ("MXN", "USD", "EUR")
@@ -19,22 +31,30 @@ class Transaction(db.Model):
     __tablename__ = "transactions"
     __table_args__ = (
         CheckConstraint("amount > 0", name="ck_transactions_amount_positive"),
+        # Serves per-client listings newest first; its client_id prefix also covers FK lookups.
+        Index("ix_transactions_client_id_created_at_id", "client_id", "created_at", "id"),
+        # Serves unfiltered and date-range listings, keyset cursors and exports.
+        Index("ix_transactions_created_at_id", "created_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     client_id: Mapped[int] = mapped_column(
-        ForeignKey("clients.id", ondelete="CASCADE"), index=True, nullable=False
+        ForeignKey("clients.id", ondelete="CASCADE"), nullable=False
     )
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     currency: Mapped[str] = mapped_column(String(3), nullable=False)
     type: Mapped[str] = mapped_column(Enum(*TRANSACTION_TYPES, name="transaction_types"), nullable=False)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
     )
+    # Bumped by the ORM on every UPDATE; drives ETags and optimistic locking.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("1"))
 
     client = relationship("Client", back_populates="transactions")
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"<Transaction id={self.id} client_id={self.client_id} amount={self.amount}>"
 
@@ -0,0 +1,110 @@
+"""Connection pool instrumentation.
+
+Each gunicorn worker owns its own engine and pool, so the numbers reported
+here are per process; the worker ``pid`` is included to tell them apart.
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
+
+# Upper bounds, in milliseconds, of the checkout wait histogram buckets.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class WaitHistogram:
+    """Cumulative histogram of connection checkout waits."""
+
+    def __init__(self, bounds: tuple[float, ...] = WAIT_BUCKETS_MS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total_ms = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, wait_ms)] += 1
+            self.total_ms += wait_ms
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            buckets: dict[str, int] = {}
+            running = 0
+            for bound, count in zip((*self.bounds, "+Inf"), self.counts, strict=True):
+                running += count
+                buckets[str(bound)] = running
+            return {
+                "count": running,
+                "sum_ms": round(self.total_ms, 3),
+                "timeouts": self.timeouts,
+                "buckets": buckets,
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """``QueuePool`` that records how long each checkout waits for a connection.
+
+    Only the wait for a free slot is measured: opening a new connection,
+    pre-ping and checkout events are left out.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = WaitHistogram()
+        self._checkout = threading.local()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        # QueuePool._do_get retries by calling itself; only the outermost call is timed.
+        if getattr(self._checkout, "timing", False):
+            return super()._do_get()
+        self._checkout.timing = True
+        self._checkout.connect_seconds = 0.0
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_histogram.timed_out()
+            raise
+        finally:
+            self._checkout.timing = False
+        waited = time.perf_counter() - started - self._checkout.connect_seconds
+        self.wait_histogram.observe(waited * 1000)
+        return entry
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            if getattr(self._checkout, "timing", False):
+                self._checkout.connect_seconds += time.perf_counter() - started
+
+
+def pool_stats(engine: Engine) -> dict[str, Any]:
+    """Return the current state of ``engine``'s pool for this worker."""
+
+    pool = engine.pool
+    stats: dict[str, Any] = {"pid": os.getpid(), "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,  # noqa: SLF001 - no public accessor
+        )
+    if isinstance(pool, TimedQueuePool):
+        stats["wait"] = pool.wait_histogram.as_dict()
+    return stats
@@ -0,0 +1,154 @@
+"""Readiness signals for load balancer and orchestrator probes.
+
+A daemon thread in each worker pings the database every
+``READINESS_PING_INTERVAL`` seconds and caches the outcome, so answering a
+probe does not touch the database; only a probe that arrives before the
+first ping runs one itself. A worker reports itself not ready when
+the last ping failed or is stale, when the ping is slower than
+``READINESS_MAX_PING_MS``, when the share of pool connections checked out
+exceeds ``READINESS_MAX_POOL_SATURATION`` or when more than
+``READINESS_MAX_IN_FLIGHT`` requests are being handled at once.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from flask import Flask, g
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from .extensions import db
+
+
+@dataclass(frozen=True, slots=True)
+class PingResult:
+    """Outcome of one database ping."""
+
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+
+
+class ReadinessMonitor:
+    """Tracks in-flight requests and the cached database ping of one worker."""
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.interval = app.config["READINESS_PING_INTERVAL"]
+        self.in_flight = 0
+        self.last_ping: PingResult | None = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+        g.readiness_counted = True
+        if self._pid != os.getpid():
+            self.start()
+
+    def request_finished(self, _error: BaseException | None = None) -> None:
+        # Teardown also runs for request contexts that were never dispatched.
+        if not g.pop("readiness_counted", False):
+            return
+        with self._lock:
+            self.in_flight -= 1
+
+    def start(self) -> None:
+        """Start the pinger thread of this process; threads do not survive a fork."""
+
+        with self._lock:
+            if self.interval <= 0 or self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="readiness-pinger", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self.ping()
+            time.sleep(self.interval)
+
+    def ping(self) -> PingResult:
+        """Run ``SELECT 1`` on a pooled connection and cache the outcome."""
+
+        started = time.perf_counter()
+        try:
+            with self.app.app_context(), db.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception as exc:  # noqa: BLE001 - any failure means not ready
+            result = PingResult(False, _elapsed_ms(started), time.time(), repr(exc))
+        else:
+            result = PingResult(True, _elapsed_ms(started), time.time())
+        self.last_ping = result
+        return result
+
+    def report(self) -> tuple[bool, dict[str, Any]]:
+        """Return whether this worker is ready and the signals behind the decision."""
+
+        config = self.app.config
+        reasons = []
+        # A fresh worker answers its first probe from a ping, not with a 503.
+        ping = self.last_ping or self.ping()
+        if not ping.ok:
+            reasons.append("database ping failed")
+        else:
+            if time.time() - ping.checked_at > config["READINESS_STALE_AFTER"]:
+                reasons.append("database ping is stale")
+            if ping.latency_ms > config["READINESS_MAX_PING_MS"]:
+                reasons.append("database ping is slow")
+
+        saturation = pool_saturation()
+        if saturation is not None and saturation > config["READINESS_MAX_POOL_SATURATION"]:
+            reasons.append("connection pool is saturated")
+        if self.in_flight > config["READINESS_MAX_IN_FLIGHT"]:
+            reasons.append("too many requests in flight")
+
+        return not reasons, {
+            "status": "ready" if not reasons else "not ready",
+            "reasons": reasons,
+            "pid": os.getpid(),
+            "database": {
+                "ok": ping.ok,
+                "latency_ms": round(ping.latency_ms, 3),
+                "age_seconds": round(time.time() - ping.checked_at, 3),
+                "error": ping.error,
+            },
+            "pool_saturation": saturation,
+            "in_flight": self.in_flight,
+        }
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def pool_saturation() -> float | None:
+    """Return the share of the pool's connection capacity in use, if it is bounded."""
+
+    pool = db.engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    capacity = pool.size() + max(pool._max_overflow, 0)  # noqa: SLF001 - no public accessor
+    return round(pool.checkedout() / capacity, 3) if capacity else None
+
+
+def init_readiness(app: Flask) -> None:
+    """Track in-flight requests and ping the database in the background.
+
+    A preloaded app starts the pinger of each worker from
+    :func:`app.startup.after_fork`; otherwise the first request starts it.
+    """
+
+    monitor = ReadinessMonitor(app)
+    app.extensions["readiness"] = monitor
+    app.before_request(monitor.request_started)
+    app.teardown_request(monitor.request_finished)
@@ -3,10 +3,12 @@ from __future__ import annotations
 
 from flask import Blueprint
 from marshmallow import ValidationError as MarshmallowValidationError
+from sqlalchemy.orm.exc import StaleDataError
 
-from ..extensions import api
+from ..extensions import api, db
 from ..services import EntityNotFoundError, ValidationError
 from .clients import ns as clients_namespace
+from .responses import VALIDATION_STATUS
 from .transactions import ns as transactions_namespace
 
 api_blueprint = Blueprint("api", __name__)
@@ -24,9 +26,9 @@ def handle_not_found(error: EntityNotFoundError):
 
 @api.errorhandler(ValidationError)
 def handle_validation(error: ValidationError):
-    """Convert service validation errors into HTTP 400/409 responses."""
+    """Convert service validation errors into HTTP 400/409/415/422 responses."""
 
-    status = 409 if error.field == "email" else 400
+    status = VALIDATION_STATUS.get(error.field, 400)
     payload = {"message": error.message}
     if error.field:
         payload["field"] = error.field
@@ -39,3 +41,10 @@ def handle_marshmallow(error: MarshmallowValidationError):
 
     return {"message": "Validation error", "errors": error.messages}, 400
 
+
+@api.errorhandler(StaleDataError)
+def handle_stale_data(error: StaleDataError) -> tuple[dict[str, str], int]:
+    """Report a concurrent modification detected by the row version as HTTP 409."""
+
+    db.session.rollback()
+    return {"message": "The resource was modified concurrently; retry the request."}, 409
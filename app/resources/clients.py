@@ -1,88 +1,231 @@
 """Client API resources."""
 from __future__ import annotations
 
-from flask import request
+from itertools import islice
+
+from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
+from marshmallow import ValidationError as MarshmallowValidationError
 
-from ..schemas import ClientCreateSchema, ClientSchema, ClientUpdateSchema
-from ..services import ClientService
+from ..models import Client
+from ..schemas import (
+    ClientBalanceSchema,
+    ClientCreateSchema,
+    ClientImportQuerySchema,
+    ClientItemQuerySchema,
+    ClientQuerySchema,
+    ClientSchema,
+    ClientUpdateSchema,
+    TransactionQuerySchema,
+    compiled_serializer,
+)
+from ..services import BalanceService, ClientService, TransactionService, ValidationError
+from .conditional import collection_etag, entity_etag, expanded_etag, not_modified, version_tags
+from .expansion import Expansion, columns_for, expand_client_transactions
+from .responses import ids_response, json_response, page_response
+from .streaming import csv_rows, ndjson_rows
+from .swagger import schema_model
 
 ns = Namespace("clients", description="Operations related to clients")
 
-client_model = ns.model(
-    "Client",
+client_model = schema_model(ns, "Client", ClientSchema)
+client_create_model = schema_model(ns, "ClientCreate", ClientCreateSchema, for_input=True)
+client_update_model = schema_model(ns, "ClientUpdate", ClientUpdateSchema, for_input=True)
+
+pagination_model = ns.model(
+    "ClientList",
     {
-        "id": fields.Integer(readOnly=True, description="Client identifier"),
-        "name": fields.String(required=True, description="Client name"),
-        "email": fields.String(required=True, description="Client email"),
-        "created_at": fields.DateTime(readOnly=True),
+        "items": fields.List(fields.Nested(client_model)),
+        "total": fields.Integer(),
+        "page": fields.Integer(),
+        "pages": fields.Integer(),
+        "next_cursor": fields.String(description="Cursor for the next page in cursor mode"),
+        "missing": fields.List(
+            fields.Integer(), description="Requested ids that do not exist, in ids mode"
+        ),
     },
 )
 
-client_create_model = ns.model(
-    "ClientCreate",
+import_error_model = ns.model(
+    "ClientImportError",
     {
-        "name": fields.String(required=True, description="Client name"),
-        "email": fields.String(required=True, description="Client email"),
+        "line": fields.Integer(description="Line of the record in the upload"),
+        "errors": fields.Raw(description="Why the record was rejected"),
     },
 )
 
-client_update_model = ns.model(
-    "ClientUpdate",
+import_result_model = ns.model(
+    "ClientImportResult",
     {
-        "name": fields.String(required=False, description="Client name"),
-        "email": fields.String(required=False, description="Client email"),
+        "received": fields.Integer(description="Records read from the upload"),
+        "created": fields.Integer(),
+        "updated": fields.Integer(),
+        "skipped": fields.Integer(
+            description="Unchanged, ignored or repeated later in the same chunk"
+        ),
+        "failed": fields.Integer(),
+        "errors": fields.List(
+            fields.Nested(import_error_model),
+            description="Rejected records, up to CLIENT_IMPORT_MAX_ERRORS",
+        ),
     },
 )
 
-pagination_model = ns.model(
-    "ClientList",
+balance_model = schema_model(ns, "ClientBalance", ClientBalanceSchema)
+
+client_balances_model = ns.model(
+    "ClientBalances",
     {
-        "items": fields.List(fields.Nested(client_model)),
-        "total": fields.Integer(),
-        "page": fields.Integer(),
-        "pages": fields.Integer(),
+        "client_id": fields.Integer(),
+        "balances": fields.List(fields.Nested(balance_model)),
     },
 )
 
-client_schema = ClientSchema()
+client_serializer = compiled_serializer(ClientSchema)
+balance_serializer = compiled_serializer(ClientBalanceSchema)
 client_create_schema = ClientCreateSchema()
+client_import_schema = ClientCreateSchema(many=True)
+client_import_query_schema = ClientImportQuerySchema()
 client_update_schema = ClientUpdateSchema()
+client_query_schema = ClientQuerySchema()
+client_item_query_schema = ClientItemQuerySchema()
+client_transactions_query_schema = TransactionQuerySchema(
+    only=("page", "per_page", "cursor", "field_names")
+)
 service = ClientService()
+balance_service = BalanceService()
+transaction_service = TransactionService()
+
+EXPAND_DOC = "Set to transactions to embed the newest transactions of each client"
+FIELDS_DOC = "Comma separated fields to return, e.g. id,name"
+
+
+def expansion_for(expand: str | None, clients: list[Client]) -> Expansion | None:
+    """Load the relation named by ``expand`` for ``clients``, if any."""
+
+    if expand == "transactions":
+        return expand_client_transactions(clients, transaction_service)
+    return None
+
+
+IMPORT_READERS = {
+    "text/csv": csv_rows,
+    "application/x-ndjson": ndjson_rows,
+    "application/jsonl": ndjson_rows,
+}
 
 
 @ns.route("")
 class ClientCollection(Resource):
     """Collection resource for clients."""
 
-    @ns.marshal_with(pagination_model)
+    @ns.response(200, "Success", pagination_model)
     @ns.doc(
         params={
             "page": "Page number",
             "per_page": "Items per page",
+            "cursor": "Keyset cursor; pass it empty for the first page, then next_cursor",
+            "ids": "Comma separated ids to fetch in that order; other parameters are ignored",
+            "include_total": "Set to false to skip counting matching clients",
             "name": "Filter by name",
             "email": "Filter by email",
+            "q": "Full-text search over name and email, best match first; "
+            "each word matches as a prefix",
+            "expand": EXPAND_DOC,
+            "fields": FIELDS_DOC,
         }
     )
     def get(self):  # type: ignore[override]
         """List clients with pagination and filters."""
 
-        page = int(request.args.get("page", 1))
-        per_page = int(request.args.get("per_page", 20))
-        name = request.args.get("name")
-        email = request.args.get("email")
-        result = service.list_clients(page=page, per_page=per_page, name=name, email=email)
-        result["items"] = client_schema.dump(result["items"], many=True)
-        return result
+        args = client_query_schema.load(request.args.to_dict())
+        serializer = compiled_serializer(ClientSchema, args["field_names"])
+        if args["ids"] is not None:
+            result = service.get_clients(args["ids"])
+            expansion = expansion_for(args["expand"], result["items"])
+            return ids_response("clients", serializer, result, expansion)
+        result = service.list_clients(
+            page=args["page"],
+            per_page=args["per_page"],
+            name=args.get("name"),
+            email=args.get("email"),
+            cursor=args.get("cursor"),
+            include_total=args["include_total"],
+            q=args.get("q"),
+            only=columns_for(args["field_names"], args["expand"]),
+        )
+        expansion = expansion_for(args["expand"], result["items"])
+        related = version_tags(expansion.entities) if expansion is not None else []
+        etag = collection_etag("clients", result["items"], [result.get("total"), *related])
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        return page_response(serializer, result, {"ETag": etag}, expansion)
 
     @ns.expect(client_create_model, validate=True)
-    @ns.marshal_with(client_model, code=201)
+    @ns.response(201, "Client created", client_model)
     def post(self):  # type: ignore[override]
         """Create a new client."""
 
         payload = client_create_schema.load(request.get_json())
         client = service.create_client(payload)
-        return client_schema.dump(client), 201
+        return json_response(client_serializer.dump(client), 201)
+
+
+@ns.route(":import")
+class ClientImport(Resource):
+    """Streaming bulk import of clients."""
+
+    @ns.doc(
+        params={
+            "on_conflict": "update (default) renames clients whose email exists; "
+            "ignore leaves them untouched"
+        }
+    )
+    @ns.response(200, "Import summary", import_result_model)
+    @ns.response(415, "Body is neither text/csv nor application/x-ndjson")
+    def post(self):  # type: ignore[override]
+        """Upsert clients on email from a CSV (name,email header) or NDJSON upload.
+
+        The body is read and validated in chunks of CLIENT_IMPORT_CHUNK_SIZE
+        records, each committed on its own, so memory stays flat however
+        large the upload is and an interrupted import can simply be resent.
+        """
+
+        args = client_import_query_schema.load(request.args.to_dict())
+        reader = IMPORT_READERS.get(request.mimetype)
+        if reader is None:
+            raise ValidationError(
+                "Upload text/csv or application/x-ndjson.", field="Content-Type"
+            )
+        chunk_size = current_app.config["CLIENT_IMPORT_CHUNK_SIZE"]
+        max_errors = current_app.config["CLIENT_IMPORT_MAX_ERRORS"]
+
+        summary = {"received": 0, "created": 0, "updated": 0, "skipped": 0, "failed": 0}
+        errors: list[dict[str, object]] = []
+        rows = reader(request.stream)
+        while chunk := list(islice(rows, chunk_size)):
+            failures = [(row.line, {"_schema": [row.error]}) for row in chunk if row.error]
+            parsed = [row for row in chunk if row.error is None]
+            try:
+                items = client_import_schema.load([row.data for row in parsed])
+                messages: dict[int, object] = {}
+            except MarshmallowValidationError as exc:
+                items = exc.valid_data
+                messages = exc.messages
+            failures.extend((parsed[index].line, message) for index, message in messages.items())
+            valid = [item for index, item in enumerate(items) if index not in messages]
+
+            counts = service.import_clients(valid, on_conflict=args["on_conflict"])
+            for key, value in counts.items():
+                summary[key] += value
+            summary["received"] += len(chunk)
+            summary["failed"] += len(failures)
+            for line, message in sorted(failures, key=lambda failure: failure[0]):
+                if len(errors) >= max_errors:
+                    break
+                errors.append({"line": line, "errors": message})
+        return json_response({**summary, "errors": errors})
 
 
 @ns.route("/<int:client_id>")
@@ -90,21 +233,35 @@ class ClientCollection(Resource):
 class ClientItem(Resource):
     """Single client resource."""
 
-    @ns.marshal_with(client_model)
+    @ns.response(200, "Success", client_model)
+    @ns.doc(params={"expand": EXPAND_DOC, "fields": FIELDS_DOC})
     def get(self, client_id: int):  # type: ignore[override]
         """Retrieve a client."""
 
+        args = client_item_query_schema.load(request.args.to_dict())
         client = service.get_client(client_id)
-        return client_schema.dump(client)
+        expansion = expansion_for(args["expand"], [client])
+        if expansion is None:
+            etag = entity_etag("client", client.id, client.version)
+        else:
+            etag = expanded_etag("client", client.id, client.version, expansion.entities)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        body = compiled_serializer(ClientSchema, args["field_names"]).dump(client)
+        if expansion is not None:
+            expansion.apply([body], [client])
+        return json_response(body, headers={"ETag": etag})
 
     @ns.expect(client_update_model, validate=True)
-    @ns.marshal_with(client_model)
+    @ns.response(200, "Success", client_model)
     def put(self, client_id: int):  # type: ignore[override]
         """Update an existing client."""
 
         payload = client_update_schema.load(request.get_json())
         client = service.update_client(client_id, payload)
-        return client_schema.dump(client)
+        etag = entity_etag("client", client.id, client.version)
+        return json_response(client_serializer.dump(client), headers={"ETag": etag})
 
     @ns.response(204, "Client deleted")
     def delete(self, client_id: int):  # type: ignore[override]
@@ -114,12 +271,34 @@ class ClientItem(Resource):
         return "", 204
 
 
+@ns.route("/<int:client_id>/balance")
+@ns.param("client_id", "The client identifier")
+class ClientBalances(Resource):
+    """Running balances of a client."""
+
+    @ns.response(200, "Success", client_balances_model)
+    def get(self, client_id: int):  # type: ignore[override]
+        """Retrieve the client's balance in every currency it has used."""
+
+        balances = balance_service.get_client_balances(client_id)
+        return json_response(
+            {"client_id": client_id, "balances": balance_serializer.dump_many(balances)}
+        )
+
+
 @ns.route("/<int:client_id>/transactions")
 @ns.param("client_id", "The client identifier")
 class ClientTransactions(Resource):
     """Transactions belonging to a client."""
 
-    @ns.doc(params={"page": "Page number", "per_page": "Items per page"})
+    @ns.doc(
+        params={
+            "page": "Page number",
+            "per_page": "Items per page",
+            "cursor": "Keyset cursor; pass it empty for the first page, then next_cursor",
+            "fields": "Comma separated transaction fields to return, e.g. id,amount",
+        }
+    )
     def get(self, client_id: int):  # type: ignore[override]
         """List transactions for a client."""
 
@@ -127,13 +306,19 @@ class ClientTransactions(Resource):
         from ..services import TransactionService
 
         txn_service = TransactionService()
-        txn_schema = TransactionSchema()
+        args = client_transactions_query_schema.load(request.args.to_dict())
+        txn_serializer = compiled_serializer(TransactionSchema, args["field_names"])
 
-        page = int(request.args.get("page", 1))
-        per_page = int(request.args.get("per_page", 20))
         result = txn_service.list_client_transactions(
-            client_id=client_id, page=page, per_page=per_page
+            client_id=client_id,
+            page=args["page"],
+            per_page=args["per_page"],
+            cursor=args["cursor"],
+            only=args["field_names"],
         )
-        result["items"] = txn_schema.dump(result["items"], many=True)
-        return result
+        etag = collection_etag("transactions", result["items"], [result.get("total")])
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        return page_response(txn_serializer, result, headers={"ETag": etag})
 
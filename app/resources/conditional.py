@@ -0,0 +1,62 @@
+"""Helpers for ETag based conditional requests."""
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+
+from flask import Response, request
+from werkzeug.http import quote_etag, unquote_etag
+
+
+def entity_etag(kind: str, entity_id: int, version: int) -> str:
+    """Return the strong ETag of one entity version."""
+
+    return quote_etag(f"{kind}-{entity_id}-{version}")
+
+
+def collection_etag(kind: str, items: Iterable[object], extra: Iterable[object] = ()) -> str:
+    """Return a weak ETag for a page of versioned entities.
+
+    The tag covers the request's query arguments, the ``(id, version)`` of
+    every item on the page and any ``extra`` values such as the total.
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(kind.encode())
+    digest.update(request.query_string)
+    for item in items:
+        digest.update(f"|{item.id}:{item.version}".encode())  # type: ignore[attr-defined]
+    for value in extra:
+        digest.update(f"|{value}".encode())
+    return quote_etag(digest.hexdigest(), weak=True)
+
+
+def version_tags(entities: Iterable[object]) -> list[str]:
+    """Return ``kind-id:version`` tags of embedded entities, for the extras of an ETag."""
+
+    return [
+        f"{type(entity).__name__}-{entity.id}:{entity.version}"  # type: ignore[attr-defined]
+        for entity in entities
+    ]
+
+
+def expanded_etag(kind: str, entity_id: int, version: int, related: Iterable[object]) -> str:
+    """Return the weak ETag of one entity version together with the entities embedded in it."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{kind}-{entity_id}-{version}".encode())
+    for tag in version_tags(related):
+        digest.update(f"|{tag}".encode())
+    return quote_etag(digest.hexdigest(), weak=True)
+
+
+def not_modified(etag: str) -> Response | None:
+    """Return a bodiless 304 response when ``If-None-Match`` matches ``etag``.
+
+    ``If-None-Match`` uses weak comparison, so ``W/"x"`` and ``"x"`` match.
+    """
+
+    tag, _ = unquote_etag(etag)
+    if request.if_none_match.contains_weak(tag):
+        return Response(status=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,79 @@
+"""Embedding related entities in responses (``?expand=``) without N+1 queries.
+
+Each expansion loads the related entities of a whole page with a constant
+number of queries, and is applied to the serialized payloads afterwards.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from ..models import Client, Transaction
+from ..schemas import ClientSchema, TransactionSchema, compiled_serializer
+from ..services import ClientService, TransactionService
+
+# Parent attributes each expansion reads, loaded even when ``fields`` leaves them out.
+EXPANSION_COLUMNS = {"client": ("client_id",)}
+
+
+def columns_for(field_names: tuple[str, ...] | None, expand: str | None) -> tuple[str, ...] | None:
+    """Return the attributes a sparse listing must load; ``None`` loads every column."""
+
+    if field_names is None:
+        return None
+    return (*field_names, *EXPANSION_COLUMNS.get(expand or "", ()))
+
+
+@dataclass(frozen=True, slots=True)
+class Expansion:
+    """Related entities loaded for a page, keyed by the id of their parent."""
+
+    key: str
+    related: dict[int, Any]
+    parent_id: Callable[[Any], int]
+    dump: Callable[[Any], object]
+
+    @property
+    def entities(self) -> list[object]:
+        """Every embedded entity, for ETags."""
+
+        entities: list[object] = []
+        for value in self.related.values():
+            entities.extend(value if isinstance(value, list) else [value])
+        return entities
+
+    def apply(self, payloads: list[dict[str, Any]], parents: Sequence[object]) -> None:
+        """Add the related entities of each parent to its serialized payload."""
+
+        for payload, parent in zip(payloads, parents, strict=True):
+            payload[self.key] = self.dump(self.related.get(self.parent_id(parent)))
+
+
+def expand_client_transactions(
+    clients: Sequence[Client], service: TransactionService
+) -> Expansion:
+    """Load the newest transactions of every client on a page, in one query."""
+
+    serializer = compiled_serializer(TransactionSchema)
+    return Expansion(
+        "transactions",
+        service.latest_by_client([client.id for client in clients]),
+        lambda client: client.id,
+        lambda transactions: serializer.dump_many(transactions or []),
+    )
+
+
+def expand_transaction_client(
+    transactions: Sequence[Transaction], service: ClientService
+) -> Expansion:
+    """Load the owner of every transaction on a page through the client multi-get."""
+
+    serializer = compiled_serializer(ClientSchema)
+    owners = service.get_clients([transaction.client_id for transaction in transactions])
+    return Expansion(
+        "client",
+        {client.id: client for client in owners["items"]},
+        lambda transaction: transaction.client_id,
+        lambda client: serializer.dump(client) if client is not None else None,
+    )
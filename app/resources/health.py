@@ -1,7 +1,11 @@
 """Health check endpoint."""
 from __future__ import annotations
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
+
+from ..cache import get_entity_cache
+from ..extensions import db
+from ..pool import pool_stats
 
 health_blueprint = Blueprint("health", __name__)
 
@@ -12,3 +16,27 @@ def health() -> tuple[dict[str, str], int]:
 
     return jsonify({"status": "ok"}), 200
 
+
+@health_blueprint.get("/health/ready")
+def ready() -> tuple[dict[str, object], int]:
+    """Report whether this worker should receive traffic, from cached signals only."""
+
+    is_ready, payload = current_app.extensions["readiness"].report()
+    return jsonify(payload), 200 if is_ready else 503
+
+
+@health_blueprint.get("/health/cache")
+def cache_stats() -> tuple[dict[str, object], int]:
+    """Return this worker's entity cache counters."""
+
+    cache = get_entity_cache()
+    if cache is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **cache.stats.as_dict()}), 200
+
+
+@health_blueprint.get("/health/pool")
+def connection_pool_stats() -> tuple[dict[str, object], int]:
+    """Return this worker's database connection pool state and checkout waits."""
+
+    return jsonify(pool_stats(db.engine)), 200
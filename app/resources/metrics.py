@@ -0,0 +1,15 @@
+"""Prometheus scrape endpoint."""
+from __future__ import annotations
+
+from flask import Blueprint, Response
+
+from ..metrics import render_metrics
+
+metrics_blueprint = Blueprint("metrics", __name__)
+
+
+@metrics_blueprint.get("/metrics")
+def metrics() -> Response:
+    """Return the node's metrics in the Prometheus text format."""
+
+    return render_metrics()
@@ -0,0 +1,82 @@
+"""JSON response helpers for the API resources."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from flask import Response
+
+from ..instrumentation import serialization_timer
+from ..schemas import CompiledSerializer
+from .conditional import collection_etag, not_modified, version_tags
+from .expansion import Expansion
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# Set on responses replayed for a repeated idempotency key.
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Fields whose validation errors are not a plain 400: a conflicting unique value,
+# an idempotency key reused with a different request and an unsupported upload format.
+VALIDATION_STATUS = {"email": 409, "Idempotency-Key": 422, "Content-Type": 415}
+
+
+def json_response(
+    payload: object, status: int = 200, headers: dict[str, str] | None = None
+) -> Response:
+    """Encode an already serialized ``payload`` straight into a JSON response."""
+
+    with serialization_timer():
+        body = json.dumps(payload, separators=(",", ":"))
+    return Response(
+        body,
+        status=status,
+        headers=headers,
+        mimetype="application/json",
+    )
+
+
+def list_envelope(result: dict[str, Any], items: list[dict[str, Any]]) -> dict[str, Any]:
+    """Wrap a serialized page in the envelope shared by every list endpoint."""
+
+    return {
+        "items": items,
+        "total": result.get("total"),
+        "page": result.get("page"),
+        "pages": result.get("pages"),
+        "next_cursor": result.get("next_cursor"),
+    }
+
+
+def page_response(
+    serializer: CompiledSerializer,
+    result: dict[str, Any],
+    headers: dict[str, str] | None = None,
+    expansion: Expansion | None = None,
+) -> Response:
+    """Serialize the page of a service list ``result`` into a JSON list response."""
+
+    with serialization_timer():
+        items = serializer.dump_many(result["items"])
+        if expansion is not None:
+            expansion.apply(items, result["items"])
+    return json_response(list_envelope(result, items), headers=headers)
+
+
+def ids_response(
+    kind: str,
+    serializer: CompiledSerializer,
+    result: dict[str, Any],
+    expansion: Expansion | None = None,
+) -> Response:
+    """Serialize a multi-get ``result``, with a weak ETag covering the missing ids too."""
+
+    related = version_tags(expansion.entities) if expansion is not None else []
+    etag = collection_etag(kind, result["items"], [*result["missing"], *related])
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    with serialization_timer():
+        items = serializer.dump_many(result["items"])
+        if expansion is not None:
+            expansion.apply(items, result["items"])
+    return json_response({"items": items, "missing": result["missing"]}, headers={"ETag": etag})
@@ -0,0 +1,99 @@
+"""Helpers for streaming large collections as NDJSON or CSV, in and out."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import IO, Any, NamedTuple
+
+ROWS_PER_CHUNK = 500
+# Longest NDJSON line accepted on upload; longer lines are reported and skipped.
+MAX_LINE_BYTES = 64 * 1024
+
+
+class UploadRow(NamedTuple):
+    """One record of an uploaded file, or the reason it could not be parsed."""
+
+    line: int
+    data: object
+    error: str | None = None
+
+
+def ndjson_stream(records: Iterable[Any], dump: Callable[[Any], dict[str, Any]]) -> Iterator[str]:
+    """Yield ``records`` as newline-delimited JSON, ``ROWS_PER_CHUNK`` lines at a time."""
+
+    lines: list[str] = []
+    for record in records:
+        lines.append(json.dumps(dump(record), separators=(",", ":")))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def csv_stream(
+    records: Iterable[Any],
+    dump: Callable[[Any], dict[str, Any]],
+    fieldnames: Sequence[str],
+) -> Iterator[str]:
+    """Yield ``records`` as CSV with a header row, ``ROWS_PER_CHUNK`` rows at a time."""
+
+    sink = io.StringIO()
+    writer = csv.DictWriter(sink, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    for count, record in enumerate(records, start=1):
+        writer.writerow(dump(record))
+        if count % ROWS_PER_CHUNK == 0:
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+
+def ndjson_rows(stream: IO[bytes]) -> Iterator[UploadRow]:
+    """Parse an NDJSON upload one line at a time, skipping blank lines."""
+
+    line = 0
+    while True:
+        raw = stream.readline(MAX_LINE_BYTES + 1)
+        if not raw:
+            return
+        line += 1
+        if len(raw) > MAX_LINE_BYTES and not raw.endswith(b"\n"):
+            while raw and not raw.endswith(b"\n"):
+                raw = stream.readline(MAX_LINE_BYTES)
+            yield UploadRow(line, None, f"Line longer than {MAX_LINE_BYTES} bytes.")
+            continue
+        if not raw.strip():
+            continue
+        try:
+            yield UploadRow(line, json.loads(raw))
+        except ValueError:
+            yield UploadRow(line, None, "Invalid JSON.")
+
+
+def csv_rows(stream: IO[bytes]) -> Iterator[UploadRow]:
+    """Parse a UTF-8 CSV upload with a header row into dicts, one record at a time."""
+
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    reader = csv.reader(text)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    while True:
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield UploadRow(reader.line_num, None, str(exc))
+            continue
+        if not values:
+            continue
+        if len(values) > len(header):
+            yield UploadRow(reader.line_num, None, "More cells than header columns.")
+            continue
+        yield UploadRow(reader.line_num, dict(zip(header, values, strict=False)))
@@ -0,0 +1,48 @@
+"""Build Swagger models from the marshmallow schemas."""
+from __future__ import annotations
+
+from flask_restx import Model, Namespace, fields
+from marshmallow import Schema
+from marshmallow import fields as ma_fields
+
+
+def _restx_field(field: ma_fields.Field, **kwargs: object) -> fields.Raw:
+    if isinstance(field, ma_fields.Integer):
+        return fields.Integer(**kwargs)
+    if isinstance(field, ma_fields.Boolean):
+        return fields.Boolean(**kwargs)
+    if isinstance(field, ma_fields.DateTime):
+        return fields.DateTime(**kwargs)
+    if isinstance(field, ma_fields.Decimal):
+        if field.as_string:
+            return fields.String(**kwargs)
+        return fields.Arbitrary(**kwargs)
+    if isinstance(field, ma_fields.String):
+        return fields.String(**kwargs)
+    return fields.Raw(**kwargs)
+
+
+def schema_model(
+    ns: Namespace, name: str, schema_cls: type[Schema], *, for_input: bool = False
+) -> Model:
+    """Register a Swagger model on ``ns`` mirroring ``schema_cls``.
+
+    Output models (the default) list the dump fields and flag ``dump_only``
+    ones as read-only; input models (``for_input=True``) list the load
+    fields. ``description`` and ``enum`` are taken from field metadata.
+    """
+
+    properties = {}
+    for field_name, field in schema_cls().fields.items():
+        if field.dump_only if for_input else field.load_only:
+            continue
+        kwargs: dict[str, object] = {
+            "required": field.required,
+            "description": field.metadata.get("description"),
+        }
+        if not for_input and field.dump_only:
+            kwargs["readonly"] = True
+        if "enum" in field.metadata:
+            kwargs["enum"] = list(field.metadata["enum"])
+        properties[field.data_key or field_name] = _restx_field(field, **kwargs)
+    return ns.model(name, properties)
@@ -1,110 +1,310 @@
 """Transaction API resources."""
 from __future__ import annotations
 
-from flask import request
+from flask import Response, current_app, request, stream_with_context
 from flask_restx import Namespace, Resource, fields
+from marshmallow import ValidationError as MarshmallowValidationError
 
+from ..models import Transaction
 from ..schemas import (
     TransactionCreateSchema,
+    TransactionExportSchema,
+    TransactionItemQuerySchema,
     TransactionQuerySchema,
     TransactionSchema,
+    TransactionStatsQuerySchema,
+    TransactionStatsSchema,
     TransactionUpdateSchema,
+    compiled_serializer,
 )
-from ..services import TransactionService
+from ..services import (
+    ClientService,
+    IdempotencyService,
+    StatsService,
+    TransactionService,
+    ValidationError,
+    request_fingerprint,
+)
+from .conditional import collection_etag, entity_etag, expanded_etag, not_modified, version_tags
+from .expansion import Expansion, columns_for, expand_transaction_client
+from .responses import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    ids_response,
+    json_response,
+    page_response,
+)
+from .streaming import csv_stream, ndjson_stream
+from .swagger import schema_model
 
 ns = Namespace("transactions", description="Operations related to transactions")
 
-transaction_model = ns.model(
-    "Transaction",
+transaction_model = schema_model(ns, "Transaction", TransactionSchema)
+transaction_create_model = schema_model(
+    ns, "TransactionCreate", TransactionCreateSchema, for_input=True
+)
+transaction_update_model = schema_model(
+    ns, "TransactionUpdate", TransactionUpdateSchema, for_input=True
+)
+
+transaction_list_model = ns.model(
+    "TransactionList",
     {
-        "id": fields.Integer(readOnly=True),
-        "client_id": fields.Integer(required=True),
-        "amount": fields.String(required=True, description="Decimal amount"),
-        "currency": fields.String(required=True),
-        "type": fields.String(required=True, enum=["DEBIT", "CREDIT"]),
-        "description": fields.String(required=False),
-        "created_at": fields.DateTime(readOnly=True),
+        "items": fields.List(fields.Nested(transaction_model)),
+        "total": fields.Integer(),
+        "page": fields.Integer(),
+        "pages": fields.Integer(),
+        "next_cursor": fields.String(description="Cursor for the next page in cursor mode"),
+        "missing": fields.List(
+            fields.Integer(), description="Requested ids that do not exist, in ids mode"
+        ),
     },
 )
 
-transaction_create_model = ns.model(
-    "TransactionCreate",
+batch_item_result_model = ns.model(
+    "TransactionBatchItemResult",
     {
-        "client_id": fields.Integer(required=True),
-        "amount": fields.String(required=True, description="Decimal amount"),
-        "currency": fields.String(required=True, enum=["MXN", "USD", "EUR"]),
-        "type": fields.String(required=True, enum=["DEBIT", "CREDIT"]),
-        "description": fields.String(required=False),
+        "index": fields.Integer(description="Position of the item in the request"),
+        "status": fields.Integer(description="201 when created, 400 when rejected"),
+        "id": fields.Integer(description="Identifier of the created transaction"),
+        "errors": fields.Raw(description="Validation errors of a rejected item"),
     },
 )
 
-transaction_update_model = ns.model(
-    "TransactionUpdate",
+batch_result_model = ns.model(
+    "TransactionBatchResult",
     {
-        "amount": fields.String(required=False, description="Decimal amount"),
-        "currency": fields.String(required=False, enum=["MXN", "USD", "EUR"]),
-        "type": fields.String(required=False, enum=["DEBIT", "CREDIT"]),
-        "description": fields.String(required=False),
+        "created": fields.Integer(),
+        "failed": fields.Integer(),
+        "results": fields.List(fields.Nested(batch_item_result_model)),
     },
 )
 
-transaction_list_model = ns.model(
-    "TransactionList",
+transaction_stats_model = schema_model(ns, "TransactionStats", TransactionStatsSchema)
+
+transaction_stats_result_model = ns.model(
+    "TransactionStatsResult",
     {
-        "items": fields.List(fields.Nested(transaction_model)),
-        "total": fields.Integer(),
-        "page": fields.Integer(),
-        "pages": fields.Integer(),
+        "group_by": fields.String(enum=["day", "month"]),
+        "source": fields.String(
+            enum=["rollup", "transactions"],
+            description="rollup for ranges on UTC midnights, transactions otherwise",
+        ),
+        "items": fields.List(fields.Nested(transaction_stats_model)),
     },
 )
 
-transaction_schema = TransactionSchema()
+transaction_serializer = compiled_serializer(TransactionSchema)
+stats_serializer = compiled_serializer(TransactionStatsSchema)
 transaction_create_schema = TransactionCreateSchema()
+transaction_batch_schema = TransactionCreateSchema(many=True)
 transaction_update_schema = TransactionUpdateSchema()
 transaction_query_schema = TransactionQuerySchema()
+transaction_export_schema = TransactionExportSchema()
+transaction_stats_query_schema = TransactionStatsQuerySchema()
+transaction_item_query_schema = TransactionItemQuerySchema()
 service = TransactionService()
+stats_service = StatsService()
+client_service = ClientService()
+
+EXPAND_DOC = "Set to client to embed the owner of each transaction"
+FIELDS_DOC = "Comma separated fields to return, e.g. id,amount,currency,created_at"
+
+
+def expansion_for(expand: str | None, transactions: list[Transaction]) -> Expansion | None:
+    """Load the relation named by ``expand`` for ``transactions``, if any."""
+
+    if expand == "client":
+        return expand_transaction_client(transactions, client_service)
+    return None
 
 
 @ns.route("")
 class TransactionCollection(Resource):
     """Collection resource for transactions."""
 
-    @ns.marshal_with(transaction_list_model)
+    @ns.response(200, "Success", transaction_list_model)
     @ns.doc(
         params={
             "page": "Page number",
             "per_page": "Items per page",
+            "cursor": "Keyset cursor; pass it empty for the first page, then next_cursor",
+            "ids": "Comma separated ids to fetch in that order; other parameters are ignored",
             "client_id": "Filter by client id",
             "type": "Filter by transaction type",
             "start_date": "Filter by start datetime",
             "end_date": "Filter by end datetime",
+            "expand": EXPAND_DOC,
+            "fields": FIELDS_DOC,
         }
     )
     def get(self):  # type: ignore[override]
         """List transactions with filters."""
 
         args = transaction_query_schema.load(request.args.to_dict())
-        page = int(request.args.get("page", 1))
-        per_page = int(request.args.get("per_page", 20))
+        serializer = compiled_serializer(TransactionSchema, args["field_names"])
+        if args["ids"] is not None:
+            result = service.get_transactions(args["ids"])
+            expansion = expansion_for(args["expand"], result["items"])
+            return ids_response("transactions", serializer, result, expansion)
         result = service.list_transactions(
-            page=page,
-            per_page=per_page,
+            page=args["page"],
+            per_page=args["per_page"],
             client_id=args.get("client_id"),
             txn_type=args.get("type"),
             start_date=args.get("start_date"),
             end_date=args.get("end_date"),
+            cursor=args.get("cursor"),
+            only=columns_for(args["field_names"], args["expand"]),
         )
-        result["items"] = transaction_schema.dump(result["items"], many=True)
-        return result
+        expansion = expansion_for(args["expand"], result["items"])
+        related = version_tags(expansion.entities) if expansion is not None else []
+        etag = collection_etag("transactions", result["items"], [result.get("total"), *related])
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        return page_response(serializer, result, {"ETag": etag}, expansion)
 
     @ns.expect(transaction_create_model, validate=True)
-    @ns.marshal_with(transaction_model, code=201)
+    @ns.response(201, "Transaction created", transaction_model)
+    @ns.response(422, "Idempotency-Key reused with a different request")
+    @ns.doc(
+        params={
+            IDEMPOTENCY_HEADER: {
+                "in": "header",
+                "description": "Optional key making retries safe; a repeat replays the response",
+            }
+        }
+    )
     def post(self):  # type: ignore[override]
         """Create a new transaction."""
 
         payload = transaction_create_schema.load(request.get_json())
-        transaction = service.create_transaction(payload)
-        return transaction_schema.dump(transaction), 201
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            transaction = service.create_transaction(payload)
+            return json_response(transaction_serializer.dump(transaction), 201)
+
+        idempotency = IdempotencyService(ttl=current_app.config["IDEMPOTENCY_KEY_TTL"])
+        scope = f"{request.method} {request.path}"
+        stored = idempotency.reserve(key, scope, request_fingerprint(payload))
+        if stored is not None:
+            return json_response(stored.body, stored.status, headers={REPLAYED_HEADER: "true"})
+
+        body: dict[str, object] = {}
+
+        def record(transaction: Transaction) -> None:
+            body.update(transaction_serializer.dump(transaction))
+            idempotency.complete(key, scope, 201, body)
+
+        service.create_transaction(payload, before_commit=record)
+        return json_response(body, 201)
+
+
+@ns.route(":batch")
+class TransactionBatch(Resource):
+    """Bulk ingest of transactions."""
+
+    @ns.expect([transaction_create_model])
+    @ns.response(200, "Result of each item", batch_result_model)
+    def post(self):  # type: ignore[override]
+        """Create many transactions in one request, reporting a result per item."""
+
+        payload = request.get_json()
+        if not isinstance(payload, list):
+            raise ValidationError("Expected a JSON array of transactions.")
+        max_items = current_app.config["TRANSACTION_BATCH_MAX_ITEMS"]
+        if len(payload) > max_items:
+            raise ValidationError(f"A batch accepts at most {max_items} transactions.")
+
+        try:
+            items = transaction_batch_schema.load(payload)
+            errors: dict[int, object] = {}
+        except MarshmallowValidationError as exc:
+            items = exc.valid_data
+            errors = exc.messages
+
+        valid = [index for index in range(len(payload)) if index not in errors]
+        new_ids = service.create_transactions([items[index] for index in valid])
+        for index, new_id in zip(valid, new_ids, strict=True):
+            if new_id is None:
+                errors[index] = {"client_id": ["Client does not exist."]}
+
+        created = dict(zip(valid, new_ids, strict=True))
+        results = [
+            {"index": index, "status": 400, "errors": errors[index]}
+            if index in errors
+            else {"index": index, "status": 201, "id": created[index]}
+            for index in range(len(payload))
+        ]
+        return json_response(
+            {"created": len(payload) - len(errors), "failed": len(errors), "results": results}
+        )
+
+
+@ns.route("/export")
+class TransactionExport(Resource):
+    """Streaming export of transactions."""
+
+    @ns.doc(
+        params={
+            "format": "Export format: ndjson (default) or csv",
+            "client_id": "Filter by client id",
+            "type": "Filter by transaction type",
+            "start_date": "Filter by start datetime",
+            "end_date": "Filter by end datetime",
+            "fields": FIELDS_DOC,
+        }
+    )
+    @ns.produces(["application/x-ndjson", "text/csv"])
+    def get(self):  # type: ignore[override]
+        """Stream every matching transaction, oldest first."""
+
+        args = transaction_export_schema.load(request.args.to_dict())
+        rows = service.iter_transactions(
+            client_id=args.get("client_id"),
+            txn_type=args.get("type"),
+            start_date=args.get("start_date"),
+            end_date=args.get("end_date"),
+            only=args["field_names"],
+        )
+        serializer = compiled_serializer(TransactionSchema, args["field_names"])
+        export_format = args["format"]
+        if export_format == "csv":
+            body = csv_stream(rows, serializer.dump, serializer.fields)
+            mimetype = "text/csv"
+        else:
+            body = ndjson_stream(rows, serializer.dump)
+            mimetype = "application/x-ndjson"
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={
+                "Content-Disposition": f"attachment; filename=transactions.{export_format}"
+            },
+        )
+
+
+@ns.route("/stats")
+class TransactionStats(Resource):
+    """Transaction volume analytics."""
+
+    @ns.response(200, "Success", transaction_stats_result_model)
+    @ns.doc(
+        params={
+            "group_by": "Bucket size: day (default) or month, in UTC",
+            "client_id": "Filter by client id",
+            "currency": "Filter by currency",
+            "start_date": "Inclusive start datetime",
+            "end_date": "Exclusive end datetime",
+        }
+    )
+    def get(self):  # type: ignore[override]
+        """DEBIT/CREDIT totals per period and currency."""
+
+        args = transaction_stats_query_schema.load(request.args.to_dict())
+        result = stats_service.volume(**args)
+        return json_response({**result, "items": stats_serializer.dump_many(result["items"])})
 
 
 @ns.route("/<int:transaction_id>")
@@ -112,21 +312,37 @@ class TransactionCollection(Resource):
 class TransactionItem(Resource):
     """Single transaction resource."""
 
-    @ns.marshal_with(transaction_model)
+    @ns.response(200, "Success", transaction_model)
+    @ns.doc(params={"expand": EXPAND_DOC, "fields": FIELDS_DOC})
     def get(self, transaction_id: int):  # type: ignore[override]
         """Retrieve a transaction by id."""
 
+        args = transaction_item_query_schema.load(request.args.to_dict())
         transaction = service.get_transaction(transaction_id)
-        return transaction_schema.dump(transaction)
+        expansion = expansion_for(args["expand"], [transaction])
+        if expansion is None:
+            etag = entity_etag("transaction", transaction.id, transaction.version)
+        else:
+            etag = expanded_etag(
+                "transaction", transaction.id, transaction.version, expansion.entities
+            )
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        body = compiled_serializer(TransactionSchema, args["field_names"]).dump(transaction)
+        if expansion is not None:
+            expansion.apply([body], [transaction])
+        return json_response(body, headers={"ETag": etag})
 
     @ns.expect(transaction_update_model, validate=True)
-    @ns.marshal_with(transaction_model)
+    @ns.response(200, "Success", transaction_model)
     def put(self, transaction_id: int):  # type: ignore[override]
         """Update a transaction."""
 
         payload = transaction_update_schema.load(request.get_json())
         transaction = service.update_transaction(transaction_id, payload)
-        return transaction_schema.dump(transaction)
+        etag = entity_etag("transaction", transaction.id, transaction.version)
+        return json_response(transaction_serializer.dump(transaction), headers={"ETag": etag})
 
     @ns.response(204, "Transaction deleted")
     def delete(self, transaction_id: int):  # type: ignore[override]
@@ -1,18 +1,41 @@
 """Marshmallow schemas for serialization and validation."""
-from .client import ClientCreateSchema, ClientSchema, ClientUpdateSchema
+from .balance import ClientBalanceSchema
+from .client import (
+    ClientCreateSchema,
+    ClientImportQuerySchema,
+    ClientItemQuerySchema,
+    ClientQuerySchema,
+    ClientSchema,
+    ClientUpdateSchema,
+)
+from .compiled import CompiledSerializer, compiled_serializer
 from .transaction import (
     TransactionCreateSchema,
+    TransactionExportSchema,
+    TransactionItemQuerySchema,
     TransactionQuerySchema,
     TransactionSchema,
+    TransactionStatsQuerySchema,
+    TransactionStatsSchema,
     TransactionUpdateSchema,
 )
 
 __all__ = [
+    "CompiledSerializer",
+    "compiled_serializer",
     "ClientSchema",
     "ClientCreateSchema",
     "ClientUpdateSchema",
+    "ClientQuerySchema",
+    "ClientImportQuerySchema",
+    "ClientItemQuerySchema",
+    "ClientBalanceSchema",
     "TransactionSchema",
     "TransactionCreateSchema",
     "TransactionUpdateSchema",
     "TransactionQuerySchema",
+    "TransactionItemQuerySchema",
+    "TransactionExportSchema",
+    "TransactionStatsQuerySchema",
+    "TransactionStatsSchema",
 ]
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""Schemas for client balances."""
+from __future__ import annotations
+
+from marshmallow import Schema, fields
+
+
+class ClientBalanceSchema(Schema):
+    """Serialize the running balance of a client in one currency."""
+
+    currency = fields.Str(dump_only=True)
+    credit_total = fields.Decimal(
+        as_string=True,
+        places=2,
+        dump_only=True,
+        metadata={"description": "Decimal sum of CREDIT transactions"},
+    )
+    debit_total = fields.Decimal(
+        as_string=True,
+        places=2,
+        dump_only=True,
+        metadata={"description": "Decimal sum of DEBIT transactions"},
+    )
+    balance = fields.Decimal(
+        as_string=True,
+        places=2,
+        dump_only=True,
+        metadata={"description": "Decimal credits minus debits"},
+    )
+    transaction_count = fields.Int(dump_only=True)
@@ -2,14 +2,17 @@
 from __future__ import annotations
 
 from marshmallow import Schema, ValidationError, fields, validates, validates_schema
+from marshmallow.validate import Length, OneOf, Range
+
+from .fields import MAX_PER_PAGE, FieldList, IdList
 
 
 class ClientSchema(Schema):
     """Serialize client entities."""
 
-    id = fields.Int(dump_only=True)
-    name = fields.Str(required=True)
-    email = fields.Email(required=True)
+    id = fields.Int(dump_only=True, metadata={"description": "Client identifier"})
+    name = fields.Str(required=True, metadata={"description": "Client name"})
+    email = fields.Email(required=True, metadata={"description": "Client email"})
     created_at = fields.DateTime(dump_only=True)
 
 
@@ -22,8 +25,8 @@ class ClientCreateSchema(ClientSchema):
 class ClientUpdateSchema(Schema):
     """Schema for updating clients."""
 
-    name = fields.Str(required=False)
-    email = fields.Email(required=False)
+    name = fields.Str(required=False, metadata={"description": "Client name"})
+    email = fields.Email(required=False, metadata={"description": "Client email"})
 
     @validates_schema
     def validate_any_field(self, data: dict[str, object], **_: object) -> None:
@@ -39,3 +42,35 @@ class ClientUpdateSchema(Schema):
     def validate_email(self, value: str) -> None:
         if not value.strip():
             raise ValidationError("Email cannot be empty.")
+
+
+CLIENT_EXPANSIONS = ("transactions",)
+
+
+class ClientItemQuerySchema(Schema):
+    """Schema for validating the options of a single client read."""
+
+    expand = fields.Str(load_default=None, validate=OneOf(CLIENT_EXPANSIONS))
+    field_names = FieldList(ClientSchema, data_key="fields", load_default=None)
+
+
+class ClientQuerySchema(ClientItemQuerySchema):
+    """Schema for validating client listing filters."""
+
+    page = fields.Int(load_default=1, validate=Range(min=1))
+    per_page = fields.Int(load_default=20, validate=Range(min=1, max=MAX_PER_PAGE))
+    cursor = fields.Str(load_default=None)
+    include_total = fields.Bool(load_default=True)
+    name = fields.Str(load_default=None)
+    email = fields.Str(load_default=None)
+    q = fields.Str(load_default=None, validate=Length(max=200))
+    ids = IdList(load_default=None)
+
+
+IMPORT_ON_CONFLICT = ("update", "ignore")
+
+
+class ClientImportQuerySchema(Schema):
+    """Schema for validating client import options."""
+
+    on_conflict = fields.Str(load_default="update", validate=OneOf(IMPORT_ON_CONFLICT))
@@ -0,0 +1,59 @@
+"""Custom marshmallow fields shared by the query schemas."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from marshmallow import Schema, ValidationError, fields
+
+# Longest id list a multi-get request may ask for.
+MAX_IDS = 1000
+# Largest page a listing serves.
+MAX_PER_PAGE = 500
+
+
+class IdList(fields.Field):
+    """A comma separated list of positive integer ids, e.g. ``ids=3,1,2``."""
+
+    def _deserialize(
+        self, value: object, attr: str | None, data: Mapping[str, Any] | None, **kwargs: object
+    ) -> list[int]:
+        if not isinstance(value, str):
+            raise ValidationError("Expected comma separated ids.")
+        try:
+            ids = [int(part) for part in value.split(",") if part.strip()]
+        except ValueError as exc:
+            raise ValidationError("Expected comma separated ids.") from exc
+        if not ids or min(ids) < 1:
+            raise ValidationError("Ids must be positive integers.")
+        if len(ids) > MAX_IDS:
+            raise ValidationError(f"At most {MAX_IDS} ids can be requested at once.")
+        return ids
+
+
+class FieldList(fields.Field):
+    """A comma separated subset of the fields ``schema`` dumps, e.g. ``fields=id,amount``.
+
+    Deserializes to a tuple in the schema's declaration order, so every
+    spelling of the same subset shares one compiled serializer.
+    """
+
+    def __init__(self, schema: type[Schema], **kwargs: object) -> None:
+        super().__init__(**kwargs)  # type: ignore[arg-type]
+        self.choices = tuple(schema().dump_fields)
+
+    def _deserialize(
+        self, value: object, attr: str | None, data: Mapping[str, Any] | None, **kwargs: object
+    ) -> tuple[str, ...]:
+        if not isinstance(value, str):
+            raise ValidationError("Expected comma separated field names.")
+        requested = {part.strip() for part in value.split(",") if part.strip()}
+        if not requested:
+            raise ValidationError("Expected comma separated field names.")
+        unknown = requested.difference(self.choices)
+        if unknown:
+            raise ValidationError(
+                f"Unknown fields: {', '.join(sorted(unknown))}. "
+                f"Choose from {', '.join(self.choices)}."
+            )
+        return tuple(name for name in self.choices if name in requested)
@@ -4,8 +4,10 @@ from __future__ import annotations
 from datetime import datetime
 
 from marshmallow import Schema, ValidationError, fields, validates, validates_schema
+from marshmallow.validate import OneOf, Range
 
 from ..models.transaction import SUPPORTED_CURRENCIES, TRANSACTION_TYPES
+from .fields import MAX_PER_PAGE, FieldList, IdList
 
 
 class TransactionSchema(Schema):
@@ -13,9 +15,11 @@ class TransactionSchema(Schema):
 
     id = fields.Int(dump_only=True)
     client_id = fields.Int(required=True)
-    amount = fields.Decimal(as_string=True, required=True, places=2)
-    currency = fields.Str(required=True)
-    type = fields.Str(required=True)
+    amount = fields.Decimal(
+        as_string=True, required=True, places=2, metadata={"description": "Decimal amount"}
+    )
+    currency = fields.Str(required=True, metadata={"enum": SUPPORTED_CURRENCIES})
+    type = fields.Str(required=True, metadata={"enum": TRANSACTION_TYPES})
     description = fields.Str(load_default=None)
     created_at = fields.DateTime(dump_only=True)
 
@@ -44,9 +48,11 @@ class TransactionCreateSchema(TransactionSchema):
 class TransactionUpdateSchema(Schema):
     """Schema for updating transactions."""
 
-    amount = fields.Decimal(as_string=True, required=False, places=2)
-    currency = fields.Str(required=False)
-    type = fields.Str(required=False)
+    amount = fields.Decimal(
+        as_string=True, required=False, places=2, metadata={"description": "Decimal amount"}
+    )
+    currency = fields.Str(required=False, metadata={"enum": SUPPORTED_CURRENCIES})
+    type = fields.Str(required=False, metadata={"enum": TRANSACTION_TYPES})
     description = fields.Str(required=False, allow_none=True)
 
     @validates_schema
@@ -70,8 +76,11 @@ class TransactionUpdateSchema(Schema):
             raise ValidationError("Amount must be greater than zero.")
 
 
-class TransactionQuerySchema(Schema):
-    """Schema for validating transaction listing filters."""
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+class TransactionFilterSchema(Schema):
+    """Schema for validating the filters shared by transaction listings and exports."""
 
     client_id = fields.Int(load_default=None)
     type = fields.Str(load_default=None)
@@ -90,3 +99,69 @@ class TransactionQuerySchema(Schema):
         if start and end and start > end:
             raise ValidationError("start_date must be before end_date.")
 
+
+TRANSACTION_EXPANSIONS = ("client",)
+
+
+class TransactionItemQuerySchema(Schema):
+    """Schema for validating the options of a single transaction read."""
+
+    expand = fields.Str(load_default=None, validate=OneOf(TRANSACTION_EXPANSIONS))
+    field_names = FieldList(TransactionSchema, data_key="fields", load_default=None)
+
+
+class TransactionQuerySchema(TransactionFilterSchema, TransactionItemQuerySchema):
+    """Schema for validating transaction listing filters."""
+
+    page = fields.Int(load_default=1, validate=Range(min=1))
+    per_page = fields.Int(load_default=20, validate=Range(min=1, max=MAX_PER_PAGE))
+    cursor = fields.Str(load_default=None)
+    ids = IdList(load_default=None)
+
+
+class TransactionExportSchema(TransactionFilterSchema):
+    """Schema for validating transaction export filters."""
+
+    format = fields.Str(load_default="ndjson", validate=OneOf(EXPORT_FORMATS))
+    field_names = FieldList(TransactionSchema, data_key="fields", load_default=None)
+
+
+STATS_GROUP_BY = ("day", "month")
+
+
+class TransactionStatsQuerySchema(Schema):
+    """Schema for validating transaction volume queries; the date range is half-open."""
+
+    group_by = fields.Str(load_default="day", validate=OneOf(STATS_GROUP_BY))
+    client_id = fields.Int(load_default=None)
+    currency = fields.Str(load_default=None)
+    start_date = fields.DateTime(load_default=None)
+    end_date = fields.DateTime(load_default=None)
+
+    @validates("currency")
+    def validate_currency(self, value: str) -> None:
+        if value is not None and value not in SUPPORTED_CURRENCIES:
+            raise ValidationError(f"Unsupported currency '{value}'.")
+
+    @validates_schema
+    def validate_date_range(self, data: dict[str, datetime], **_: object) -> None:
+        start = data.get("start_date")
+        end = data.get("end_date")
+        if start and end and start >= end:
+            raise ValidationError("start_date must be before end_date.")
+
+
+class TransactionStatsSchema(Schema):
+    """Serialize the DEBIT/CREDIT totals of one currency over one period."""
+
+    period = fields.Date(dump_only=True, metadata={"description": "Day, or first day of month"})
+    currency = fields.Str(dump_only=True)
+    credit_total = fields.Decimal(as_string=True, places=2, dump_only=True)
+    debit_total = fields.Decimal(as_string=True, places=2, dump_only=True)
+    net = fields.Decimal(
+        as_string=True,
+        places=2,
+        dump_only=True,
+        metadata={"description": "Decimal credits minus debits"},
+    )
+    transaction_count = fields.Int(dump_only=True)
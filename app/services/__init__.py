@@ -1,11 +1,21 @@
 """Service layer for business logic."""
+from .balance_service import BalanceService
 from .client_service import ClientService
 from .exceptions import EntityNotFoundError, ValidationError
+from .idempotency_service import IdempotencyService, StoredResponse, request_fingerprint
+from .partition_service import PartitionService
+from .stats_service import StatsService
 from .transaction_service import TransactionService
 
 __all__ = [
+    "BalanceService",
     "ClientService",
+    "IdempotencyService",
+    "PartitionService",
+    "StatsService",
+    "StoredResponse",
     "TransactionService",
     "EntityNotFoundError",
     "ValidationError",
+    "request_fingerprint",
 ]
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""Service logic for maintaining client balances."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import Client, ClientBalance, Transaction
+from ..models.base import utc_day
+from .exceptions import EntityNotFoundError
+from .upsert import UPSERT_INSERTS
+
+REBUILD_CHUNK_SIZE = 1000
+
+
+@dataclass(slots=True, frozen=True)
+class BalanceChange:
+    """Effect of adding (``sign=1``) or removing (``sign=-1``) one transaction."""
+
+    client_id: int
+    currency: str
+    type: str
+    amount: Decimal
+    sign: int = 1
+    # UTC day of the transaction, for the daily totals; ``None`` leaves them untouched.
+    day: date | None = None
+
+    @classmethod
+    def of(cls, transaction: Transaction, sign: int = 1) -> BalanceChange:
+        """Build the change caused by ``transaction``."""
+
+        return cls(
+            transaction.client_id,
+            transaction.currency,
+            transaction.type,
+            Decimal(transaction.amount),
+            sign,
+            utc_day(transaction.created_at),
+        )
+
+
+class BalanceService:
+    """Keeps ``client_balances`` in step with the transactions table."""
+
+    def __init__(self, session: Session | None = None) -> None:
+        self.session = session or db.session
+
+    def apply(self, changes: Iterable[BalanceChange]) -> None:
+        """Add ``changes`` to the stored balances inside the caller's transaction.
+
+        Changes are folded per ``(client_id, currency)`` and written with one
+        additive ``INSERT ... ON CONFLICT DO UPDATE``, which is safe under
+        concurrent writers. The caller is responsible for committing.
+        """
+
+        totals: dict[tuple[int, str], list[Any]] = {}
+        for change in changes:
+            entry = totals.setdefault((change.client_id, change.currency), [0, 0, 0])
+            entry[0 if change.type == "CREDIT" else 1] += change.sign * change.amount
+            entry[2] += change.sign
+        if not totals:
+            return
+
+        rows = [
+            {
+                "client_id": client_id,
+                "currency": currency,
+                "credit_total": credit,
+                "debit_total": debit,
+                "transaction_count": count,
+            }
+            for (client_id, currency), (credit, debit, count) in totals.items()
+        ]
+        dialect = self.session.get_bind().dialect.name
+        stmt = UPSERT_INSERTS[dialect](ClientBalance).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ClientBalance.client_id, ClientBalance.currency],
+            set_={
+                "credit_total": ClientBalance.credit_total + stmt.excluded.credit_total,
+                "debit_total": ClientBalance.debit_total + stmt.excluded.debit_total,
+                "transaction_count": (
+                    ClientBalance.transaction_count + stmt.excluded.transaction_count
+                ),
+            },
+        )
+        self.session.execute(stmt)
+
+    def get_client_balances(self, client_id: int) -> list[ClientBalance]:
+        balances = self.session.scalars(
+            select(ClientBalance)
+            .where(ClientBalance.client_id == client_id)
+            .order_by(ClientBalance.currency)
+        ).all()
+        if not balances and self.session.get(Client, client_id) is None:
+            raise EntityNotFoundError(f"Client {client_id} not found.", entity="client")
+        return list(balances)
+
+    def rebuild(self, *, chunk_size: int = REBUILD_CHUNK_SIZE) -> int:
+        """Recompute every balance from the transactions table.
+
+        Clients are processed in id order, ``chunk_size`` at a time, each
+        chunk in its own transaction with the client rows locked so
+        concurrent inserts for those clients wait for the chunk to finish.
+        Returns the number of clients processed.
+        """
+
+        credit = func.coalesce(
+            func.sum(case((Transaction.type == "CREDIT", Transaction.amount), else_=0)), 0
+        )
+        debit = func.coalesce(
+            func.sum(case((Transaction.type == "DEBIT", Transaction.amount), else_=0)), 0
+        )
+        processed = 0
+        last_id = 0
+        while True:
+            ids = self.session.scalars(
+                select(Client.id)
+                .where(Client.id > last_id)
+                .order_by(Client.id)
+                .limit(chunk_size)
+                .with_for_update()
+            ).all()
+            if not ids:
+                break
+            in_chunk = ids[0], ids[-1]
+
+            self.session.execute(
+                delete(ClientBalance).where(ClientBalance.client_id.between(*in_chunk))
+            )
+            totals = (
+                select(Transaction.client_id, Transaction.currency, credit, debit, func.count())
+                .where(Transaction.client_id.between(*in_chunk))
+                .group_by(Transaction.client_id, Transaction.currency)
+            )
+            self.session.execute(
+                insert(ClientBalance).from_select(
+                    ["client_id", "currency", "credit_total", "debit_total", "transaction_count"],
+                    totals,
+                )
+            )
+            self.session.commit()
+            processed += len(ids)
+            last_id = ids[-1]
+        return processed
@@ -1,22 +1,73 @@
 """Service logic for client operations."""
 from __future__ import annotations
 
+import re
+from collections.abc import Sequence
 from typing import Any
 
-from sqlalchemy import select, text
+from sqlalchemy import Select, func, literal_column, select, table
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..cache import EntityCache, get_entity_cache
 from ..extensions import db
 from ..models import Client
 from .exceptions import EntityNotFoundError, ValidationError
+from .lookup import get_many
+from .pagination import keyset_order, keyset_page, load_columns, page_count, page_offset
+from .upsert import UPSERT_INSERTS
+
+MAX_SEARCH_TERMS = 8
+_SEARCH_TERM = re.compile(r"\w+")
+_SEARCH_VECTOR = literal_column("clients.search_vector", TSVECTOR)
+_CLIENTS_FTS = table("clients_fts")
+
+
+def contains_pattern(value: str) -> str:
+    """Build a ``LIKE`` pattern matching ``value`` anywhere, escaping wildcards."""
+
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a search query into at most :data:`MAX_SEARCH_TERMS` lowercase words.
+
+    Only letters, digits and underscores survive, so the terms can be
+    spliced into ``tsquery`` and FTS5 syntax without escaping.
+    """
+
+    terms = _SEARCH_TERM.findall(query.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise ValidationError("Search needs at least one letter or digit.", field="q")
+    return terms
+
+
+def prefix_tsquery(terms: list[str]) -> str:
+    """Build a Postgres ``tsquery`` matching every term as a prefix."""
+
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def prefix_fts5_query(terms: list[str]) -> str:
+    """Build an SQLite FTS5 query matching every term as a prefix."""
+
+    return " ".join(f'"{term}"*' for term in terms)
 
 
 class ClientService:
     """Encapsulates business logic for clients."""
 
-    def __init__(self, session: Session | None = None) -> None:
+    def __init__(
+        self, session: Session | None = None, cache: EntityCache | None = None
+    ) -> None:
         self.session = session or db.session
+        self._cache = cache
+
+    @property
+    def cache(self) -> EntityCache | None:
+        return self._cache or get_entity_cache()
 
     def list_clients(
         self,
@@ -25,32 +76,83 @@ class ClientService:
         per_page: int = 20,
         name: str | None = None,
         email: str | None = None,
+        cursor: str | None = None,
+        include_total: bool = True,
+        q: str | None = None,
+        only: Sequence[str] | None = None,
     ) -> dict[str, Any]:
-        # Introduciendo vulnerabilidad SQLi con concatenación de strings en SQL raw
-        base_query = "SELECT * FROM clients"
+        """List clients newest first with bound ``ILIKE`` filters.
+
+        ``cursor`` switches to keyset pagination (an empty string requests the
+        first page). ``include_total=False`` skips the ``COUNT(*)`` query.
+        ``q`` switches to full-text search: every word must match the start
+        of a word in the name or email, and results come best match first.
+        ``only`` names the attributes to load, as in
+        :meth:`TransactionService.list_transactions`.
+        """
+
         conditions = []
         if name:
-            conditions.append(f"name ILIKE '%{name}%'")
+            conditions.append(Client.name.ilike(contains_pattern(name), escape="\\"))
         if email:
-            conditions.append(f"email ILIKE '%{email}%'")
-        where_clause = ""
-        if conditions:
-            where_clause = " WHERE " + " AND ".join(conditions)
-        full_query = base_query + where_clause + " ORDER BY created_at DESC"
-        stmt = text(full_query)
-        items = self.session.execute(stmt).scalars().all()
-        total = len(items)
-        start = max(page - 1, 0) * per_page
-        end = start + per_page
-        paginated = items[start:end]
+            conditions.append(Client.email.ilike(contains_pattern(email), escape="\\"))
+
+        if q is not None:
+            if cursor is not None:
+                raise ValidationError("Search results are paginated by page.", field="cursor")
+            stmt = self._search(search_terms(q)).where(*conditions)
+        elif cursor is not None:
+            stmt = select(Client).options(*load_columns(Client, only)).where(*conditions)
+            return keyset_page(self.session, stmt, Client, cursor=cursor, per_page=per_page)
+        else:
+            stmt = select(Client).where(*conditions).order_by(*keyset_order(Client))
+
+        items = self.session.scalars(
+            stmt.options(*load_columns(Client, only))
+            .limit(per_page)
+            .offset(page_offset(page, per_page))
+        ).all()
+        total = None
+        if include_total:
+            total = self.session.scalar(
+                stmt.order_by(None).with_only_columns(func.count(), maintain_column_froms=True)
+            )
 
         return {
-            "items": paginated,
+            "items": items,
             "total": total,
             "page": page,
-            "pages": (total + per_page - 1) // per_page if per_page else 1,
+            "pages": page_count(total, per_page) if total is not None else None,
         }
 
+    def _search(self, terms: list[str]) -> Select[Any]:
+        """Return the clients matching every prefix in ``terms``, best match first.
+
+        Postgres ranks with ``ts_rank`` over the weighted ``search_vector``
+        (name above email); SQLite with FTS5's ``bm25`` (lower is better).
+        """
+
+        if self.session.get_bind().dialect.name == "postgresql":
+            query = func.to_tsquery("simple", prefix_tsquery(terms))
+            return (
+                select(Client)
+                .where(_SEARCH_VECTOR.bool_op("@@")(query))
+                .order_by(func.ts_rank(_SEARCH_VECTOR, query).desc(), Client.id.desc())
+            )
+
+        fts = literal_column("clients_fts")
+        matches = (
+            select(literal_column("rowid").label("id"), func.bm25(fts, 2.0, 1.0).label("rank"))
+            .select_from(_CLIENTS_FTS)
+            .where(fts.op("MATCH")(prefix_fts5_query(terms)))
+            .subquery()
+        )
+        return (
+            select(Client)
+            .join(matches, matches.c.id == Client.id)
+            .order_by(matches.c.rank, Client.id.desc())
+        )
+
     def list_clients_duplicated(
         self,
         *,
@@ -59,31 +161,7 @@ class ClientService:
         name: str | None = None,
         email: str | None = None,
     ) -> dict[str, Any]:
-        # Código duplicado intencionalmente para testing SonarQube
-        # Introduciendo vulnerabilidad SQLi con concatenación de strings en SQL raw
-        base_query = "SELECT * FROM clients"
-        conditions = []
-        if name:
-            conditions.append(f"name ILIKE '%{name}%'")
-        if email:
-            conditions.append(f"email ILIKE '%{email}%'")
-        where_clause = ""
-        if conditions:
-            where_clause = " WHERE " + " AND ".join(conditions)
-        full_query = base_query + where_clause + " ORDER BY created_at DESC"
-        stmt = text(full_query)
-        items = self.session.execute(stmt).scalars().all()
-        total = len(items)
-        start = max(page - 1, 0) * per_page
-        end = start + per_page
-        paginated = items[start:end]
-
-        return {
-            "items": paginated,
-            "total": total,
-            "page": page,
-            "pages": (total + per_page - 1) // per_page if per_page else 1,
-        }
+        return self.list_clients(page=page, per_page=per_page, name=name, email=email)
 
     def create_client(self, data: dict[str, Any]) -> Client:
         client = Client(**data)
@@ -95,14 +173,70 @@ class ClientService:
             raise ValidationError("Email already exists.", field="email") from exc
         return client
 
+    def import_clients(
+        self, items: list[dict[str, Any]], *, on_conflict: str = "update"
+    ) -> dict[str, int]:
+        """Upsert one chunk of validated clients on ``email`` and commit it.
+
+        Writes batched ``INSERT ... ON CONFLICT (email)`` statements. With
+        ``on_conflict="update"`` an existing client takes the new name (and a
+        new version) and the last occurrence of a repeated email wins; with
+        ``"ignore"`` existing clients are left alone and the first occurrence
+        wins. Returns how many clients were created, updated and skipped
+        (unchanged, ignored or superseded within the chunk).
+        """
+
+        rows: dict[str, dict[str, Any]] = {}
+        for item in items:
+            if on_conflict == "update" or item["email"] not in rows:
+                rows[item["email"]] = item
+        if not rows:
+            return {"created": 0, "updated": 0, "skipped": len(items)}
+
+        existing = set(self.session.scalars(select(Client.email).where(Client.email.in_(rows))))
+        dialect = self.session.get_bind().dialect.name
+        # Executed with a parameter list, the statement compiles once and is cached;
+        # SQLAlchemy still sends it as batched multi-row INSERTs ("insertmanyvalues").
+        stmt = UPSERT_INSERTS[dialect](Client)
+        if on_conflict == "update":
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Client.email],
+                set_={"name": stmt.excluded.name, "version": Client.version + 1},
+                where=Client.name.is_distinct_from(stmt.excluded.name),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Client.email])
+        written = self.session.execute(
+            stmt.returning(Client.id, Client.email), list(rows.values())
+        ).all()
+        self.session.commit()
+
+        updated = [client_id for client_id, email in written if email in existing]
+        for client_id in updated:
+            self._invalidate(client_id)
+        return {
+            "created": len(written) - len(updated),
+            "updated": len(updated),
+            "skipped": len(items) - len(written),
+        }
+
     def get_client(self, client_id: int) -> Client:
-        client = self.session.get(Client, client_id)
+        cache = self.cache
+        if cache is None:
+            return self._load_client(client_id)
+        client = cache.fetch(self.session, Client, "client", client_id)
         if client is None:
             raise EntityNotFoundError(f"Client {client_id} not found.", entity="client")
         return client
 
+    def get_clients(self, client_ids: list[int]) -> dict[str, Any]:
+        """Return the clients with ``client_ids`` in request order and the ids not found."""
+
+        items, missing = get_many(self.session, Client, "client", client_ids, self.cache)
+        return {"items": items, "missing": missing}
+
     def update_client(self, client_id: int, data: dict[str, Any]) -> Client:
-        client = self.get_client(client_id)
+        client = self._load_client(client_id)
         for key, value in data.items():
             setattr(client, key, value)
         try:
@@ -110,9 +244,28 @@ class ClientService:
         except IntegrityError as exc:
             self.session.rollback()
             raise ValidationError("Email already exists.", field="email") from exc
+        self._invalidate(client_id)
         return client
 
     def delete_client(self, client_id: int) -> None:
-        client = self.get_client(client_id)
+        client = self._load_client(client_id)
         self.session.delete(client)
-        self.session.commit()
\ No newline at end of file
+        self.session.commit()
+        self._invalidate(client_id, cascade=True)
+
+    def _load_client(self, client_id: int) -> Client:
+        """Load a client from the database, bypassing the cache, for writes."""
+
+        client = self.session.get(Client, client_id)
+        if client is None:
+            raise EntityNotFoundError(f"Client {client_id} not found.", entity="client")
+        return client
+
+    def _invalidate(self, client_id: int, *, cascade: bool = False) -> None:
+        cache = self.cache
+        if cache is None:
+            return
+        cache.invalidate("client", client_id)
+        if cascade:
+            # The client's transactions were removed by ON DELETE CASCADE.
+            cache.invalidate_kind("transaction")
@@ -3,6 +3,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from sqlalchemy.exc import IntegrityError
+
+# SQLSTATE of a foreign key violation on Postgres.
+FOREIGN_KEY_VIOLATION = "23503"
+
 
 @dataclass(slots=True)
 class ServiceError(Exception):
@@ -25,4 +30,14 @@ class EntityNotFoundError(ServiceError):
 class ValidationError(ServiceError):
     """Raised when a business rule validation fails."""
 
-    field: str | None = None
\ No newline at end of file
+    field: str | None = None
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    """Return whether ``error`` was raised by a foreign key, on Postgres or SQLite."""
+
+    original = error.orig
+    sqlstate = getattr(original, "sqlstate", None) or getattr(original, "pgcode", None)
+    if sqlstate is not None:
+        return sqlstate == FOREIGN_KEY_VIOLATION
+    return "FOREIGN KEY constraint failed" in str(original)
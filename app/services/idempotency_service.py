@@ -0,0 +1,131 @@
+"""Service logic for ``Idempotency-Key`` request deduplication."""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import IdempotencyKey
+from ..models.base import utcnow
+from .exceptions import ValidationError
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+MAX_KEY_LENGTH = 255
+
+
+@dataclass(frozen=True, slots=True)
+class StoredResponse:
+    """Response recorded for an idempotency key."""
+
+    status: int
+    body: Any
+
+
+def request_fingerprint(payload: object) -> str:
+    """Hash a loaded request payload, so a key reused with other data is detected."""
+
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class IdempotencyService:
+    """Records and replays the responses of requests sent with an idempotency key.
+
+    :meth:`reserve` inserts the key before the request's work is done, in the
+    same database transaction, and :meth:`complete` stages the response so
+    it commits together with that work. A retry therefore either finds the
+    complete response or, when the first attempt rolled back, nothing at all.
+    """
+
+    def __init__(self, session: Session | None = None, ttl: float = DEFAULT_TTL_SECONDS) -> None:
+        self.session = session or db.session
+        self.ttl = timedelta(seconds=ttl)
+
+    def reserve(self, key: str, scope: str, fingerprint: str) -> StoredResponse | None:
+        """Return the recorded response of ``key``, or claim the key and return ``None``.
+
+        The claim is flushed right away: a concurrent request with the same key
+        waits on the primary key until the first one commits and then replays
+        its response.
+        """
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters.",
+                field="Idempotency-Key",
+            )
+        stored = self._lookup(key, scope, fingerprint)
+        if stored is not None:
+            return stored
+
+        now = utcnow()
+        self.session.add(
+            IdempotencyKey(
+                key=key,
+                scope=scope,
+                request_hash=fingerprint,
+                created_at=now,
+                expires_at=now + self.ttl,
+            )
+        )
+        try:
+            self.session.flush()
+        except IntegrityError:
+            self.session.rollback()
+            stored = self._lookup(key, scope, fingerprint)
+            if stored is None:
+                raise
+            return stored
+        return None
+
+    def complete(self, key: str, scope: str, status: int, body: object) -> None:
+        """Stage the response of a reserved key; it is committed by the caller."""
+
+        record = self.session.get(IdempotencyKey, (key, scope))
+        if record is None:
+            raise LookupError(f"Idempotency key {key!r} was not reserved.")
+        record.response_status = status
+        record.response_body = body
+
+    def purge_expired(self) -> int:
+        """Delete expired keys and return how many were removed."""
+
+        result = self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= utcnow())
+        )
+        self.session.commit()
+        return result.rowcount
+
+    def _lookup(self, key: str, scope: str, fingerprint: str) -> StoredResponse | None:
+        row = self.session.execute(
+            select(IdempotencyKey, IdempotencyKey.expires_at <= utcnow()).where(
+                IdempotencyKey.key == key, IdempotencyKey.scope == scope
+            )
+        ).first()
+        if row is None:
+            return None
+        record, expired = row
+        if expired:
+            # Purging is periodic, so an expired key may still be present; reuse it.
+            self.session.delete(record)
+            self.session.flush()
+            return None
+        if record.request_hash != fingerprint:
+            raise ValidationError(
+                "Idempotency-Key was already used with a different request.",
+                field="Idempotency-Key",
+            )
+        if record.response_status is None:
+            # Reserved by a caller that never completed it; do not run the request twice.
+            raise ValidationError(
+                "A request with this Idempotency-Key is still in progress.",
+                field="Idempotency-Key",
+            )
+        return StoredResponse(record.response_status, record.response_body)
@@ -0,0 +1,54 @@
+"""Fetching many entities by id for the multi-get endpoints."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..cache import EntityCache
+
+ModelT = TypeVar("ModelT")
+
+# Ids per ``IN (...)`` query; keeps long lists under driver parameter limits.
+IN_CHUNK_SIZE = 500
+
+
+def load_by_ids(
+    session: Session, model: type[ModelT], entity_ids: list[int], *, chunk_size: int = IN_CHUNK_SIZE
+) -> Iterator[ModelT]:
+    """Yield the ``model`` rows among ``entity_ids`` with one ``IN`` query per chunk."""
+
+    key: Any = model.id  # type: ignore[attr-defined]
+    for start in range(0, len(entity_ids), chunk_size):
+        chunk = entity_ids[start : start + chunk_size]
+        yield from session.scalars(select(model).where(key.in_(chunk)))
+
+
+def get_many(
+    session: Session,
+    model: type[ModelT],
+    kind: str,
+    entity_ids: list[int],
+    cache: EntityCache | None,
+) -> tuple[list[ModelT], list[int]]:
+    """Return the entities with ``entity_ids`` in request order, and the ids not found.
+
+    Repeated ids are served once. With a ``cache``, only the misses reach the
+    database and they are cached on the way back.
+    """
+
+    unique_ids = list(dict.fromkeys(entity_ids))
+    if cache is None:
+        found = {
+            entity.id: entity  # type: ignore[attr-defined]
+            for entity in load_by_ids(session, model, unique_ids)
+        }
+    else:
+        found = cache.fetch_many(
+            session, model, kind, unique_ids, lambda misses: load_by_ids(session, model, misses)
+        )
+    items = [found[entity_id] for entity_id in unique_ids if entity_id in found]
+    missing = [entity_id for entity_id in unique_ids if entity_id not in found]
+    return items, missing
@@ -0,0 +1,94 @@
+"""Pagination helpers shared by the service layer."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.interfaces import ORMOption
+
+from .exceptions import ValidationError
+
+# Loaded by every sparse listing: ``id`` and ``version`` feed the ETags, ``created_at`` the cursors.
+LISTING_COLUMNS = ("id", "version", "created_at")
+
+
+def page_count(total: int, per_page: int) -> int:
+    """Return the number of pages needed to hold ``total`` items."""
+
+    return (total + per_page - 1) // per_page if per_page else 1
+
+
+def page_offset(page: int, per_page: int) -> int:
+    """Return the row offset of the first item on ``page``."""
+
+    return max(page - 1, 0) * per_page
+
+
+def encode_cursor(created_at: datetime, entity_id: int) -> str:
+    """Build an opaque cursor pointing at the ``(created_at, id)`` of the last row served."""
+
+    payload = json.dumps([created_at.isoformat(), entity_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, entity_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(entity_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise ValidationError("Invalid cursor.", field="cursor") from exc
+
+
+def keyset_order(model: type[Any]) -> tuple[Any, ...]:
+    """Return the newest-first ordering every keyset-paginated listing uses."""
+
+    return model.created_at.desc(), model.id.desc()
+
+
+def load_columns(model: type[Any], only: Sequence[str] | None) -> tuple[ORMOption, ...]:
+    """Return the loader options restricting a listing of ``model`` to the ``only`` attributes.
+
+    ``None`` loads every column. :data:`LISTING_COLUMNS` are always loaded.
+    """
+
+    if only is None:
+        return ()
+    names = dict.fromkeys((*LISTING_COLUMNS, *only))
+    return (load_only(*(getattr(model, name) for name in names)),)
+
+
+def keyset_page(
+    session: Session, stmt: Select[Any], model: type[Any], *, cursor: str, per_page: int
+) -> dict[str, Any]:
+    """Fetch one keyset page of ``stmt`` ordered by ``(created_at, id)`` descending.
+
+    An empty ``cursor`` returns the first page. One extra row is fetched to
+    decide whether a ``next_cursor`` must be issued, so no count is needed.
+    """
+
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        # The plain bound is implied by the row comparison but, unlike it, lets
+        # Postgres prune monthly partitions newer than the cursor.
+        stmt = stmt.where(
+            model.created_at <= created_at,
+            tuple_(model.created_at, model.id) < tuple_(created_at, last_id),
+        )
+
+    rows = session.scalars(stmt.order_by(*keyset_order(model)).limit(per_page + 1)).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,185 @@
+"""Maintenance of the monthly partitions of the transactions table on Postgres.
+
+Partitioning is opt-in: migration ``0005`` converts ``transactions`` into a
+table partitioned by ``RANGE (created_at)`` when
+``TRANSACTIONS_PARTITIONING=monthly`` is set. Each partition holds one UTC
+calendar month and is named ``transactions_yYYYYmMM``. There is no default
+partition, so months must exist before rows arrive: run
+``flask partitions maintain`` daily to keep ``months_ahead`` months ready.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from .exceptions import ValidationError
+
+PARENT_TABLE = "transactions"
+DEFAULT_MONTHS_AHEAD = 3
+DEFAULT_ARCHIVE_SCHEMA = "archive"
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def month_start(day: date) -> date:
+    """Return the first day of the month containing ``day``."""
+
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """Return the first day of the month ``months`` after the month of ``day``."""
+
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Return the name of the partition holding ``month``."""
+
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """Return the month held by the partition called ``name``, if it follows the scheme."""
+
+    match = _PARTITION_NAME.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def partition_ddl(month: date) -> str:
+    """Return the ``CREATE TABLE`` statement of the partition holding ``month``.
+
+    DDL cannot take bind parameters; the name and bounds are derived from a
+    ``date``, never from user input.
+    """
+
+    lower = datetime.combine(month, datetime.min.time(), UTC)
+    upper = datetime.combine(add_months(month, 1), datetime.min.time(), UTC)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Partition:
+    """One monthly partition and its planner row estimate."""
+
+    name: str
+    month: date
+    estimated_rows: int
+
+
+class PartitionService:
+    """Creates, lists and archives the monthly partitions of ``transactions``."""
+
+    def __init__(self, session: Session | None = None) -> None:
+        self.session = session or db.session
+
+    def is_partitioned(self) -> bool:
+        """Return whether ``transactions`` is a partitioned Postgres table."""
+
+        if self.session.get_bind().dialect.name != "postgresql":
+            return False
+        return bool(
+            self.session.scalar(
+                text(
+                    "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                    "WHERE partrelid = to_regclass(:table))"
+                ),
+                {"table": PARENT_TABLE},
+            )
+        )
+
+    def list_partitions(self) -> list[Partition]:
+        """Return the attached monthly partitions, oldest first."""
+
+        self._require_partitioned()
+        rows = self.session.execute(
+            text(
+                "SELECT child.relname, child.reltuples::bigint FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = to_regclass(:table)"
+            ),
+            {"table": PARENT_TABLE},
+        )
+        partitions = [
+            Partition(name, month, max(estimate, 0))
+            for name, estimate in rows
+            if (month := partition_month(name)) is not None
+        ]
+        return sorted(partitions, key=lambda partition: partition.month)
+
+    def ensure_partitions(
+        self,
+        *,
+        months_ahead: int = DEFAULT_MONTHS_AHEAD,
+        since: date | None = None,
+        today: date | None = None,
+    ) -> list[str]:
+        """Create the missing partitions from ``since`` (default: this month) to ``months_ahead``.
+
+        Returns the names of the partitions created.
+        """
+
+        self._require_partitioned()
+        current = month_start(today or datetime.now(UTC).date())
+        month = month_start(since) if since is not None else current
+        last = add_months(current, months_ahead)
+        existing = {partition.month for partition in self.list_partitions()}
+        created = []
+        while month <= last:
+            if month not in existing:
+                self.session.execute(text(partition_ddl(month)))
+                created.append(partition_name(month))
+            month = add_months(month, 1)
+        self.session.commit()
+        return created
+
+    def archive_partitions(
+        self, *, before: date, schema: str | None = DEFAULT_ARCHIVE_SCHEMA, drop: bool = False
+    ) -> list[str]:
+        """Detach every partition of a month before ``before``.
+
+        Detached partitions are moved to ``schema`` as plain tables, or
+        dropped with ``drop=True``. ``DETACH ... CONCURRENTLY`` only blocks
+        writers briefly but cannot run inside a transaction, so each
+        partition is detached on its own autocommit connection.
+
+        Client balances keep counting archived transactions; running
+        ``balances rebuild`` afterwards would drop them from the totals.
+        """
+
+        if schema is not None and not _IDENTIFIER.match(schema):
+            raise ValidationError(f"Invalid schema name: {schema!r}.", field="schema")
+        cutoff = month_start(before)
+        victims = [
+            partition.name for partition in self.list_partitions() if partition.month < cutoff
+        ]
+        self.session.commit()
+        engine = self.session.get_bind()
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            if victims and schema is not None and not drop:
+                connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+            for name in victims:
+                connection.execute(
+                    text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} CONCURRENTLY")
+                )
+                if drop:
+                    connection.execute(text(f"DROP TABLE {name}"))
+                elif schema is not None:
+                    connection.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+        return victims
+
+    def _require_partitioned(self) -> None:
+        if not self.is_partitioned():
+            raise ValidationError(
+                "The transactions table is not partitioned; "
+                "run the migrations with TRANSACTIONS_PARTITIONING=monthly on Postgres."
+            )
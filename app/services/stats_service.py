@@ -0,0 +1,281 @@
+"""Service logic for transaction volume analytics."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import ColumnElement, Date, Select, case, cast, delete, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import Client, ClientDailyTotal, Transaction
+from ..models.base import utc_day
+from .balance_service import REBUILD_CHUNK_SIZE, BalanceChange
+from .upsert import UPSERT_INSERTS
+
+GROUP_BY = ("day", "month")
+
+
+def is_day_boundary(moment: datetime | None) -> bool:
+    """Return whether ``moment`` is absent or exactly midnight UTC."""
+
+    if moment is None:
+        return True
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC)
+    return moment.time() == time.min
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodTotals:
+    """DEBIT/CREDIT totals of one currency over one day or month."""
+
+    period: date
+    currency: str
+    credit_total: Decimal
+    debit_total: Decimal
+    transaction_count: int
+
+    @property
+    def net(self) -> Decimal:
+        """Credits minus debits."""
+
+        return self.credit_total - self.debit_total
+
+
+class StatsService:
+    """Maintains ``client_daily_totals`` and answers volume queries from it."""
+
+    def __init__(self, session: Session | None = None) -> None:
+        self.session = session or db.session
+
+    def apply(self, changes: Iterable[BalanceChange]) -> None:
+        """Add ``changes`` to the daily totals inside the caller's transaction.
+
+        Like :meth:`BalanceService.apply`, changes are folded per
+        ``(client_id, day, currency)`` and written with one additive upsert.
+        Changes without a ``day`` are ignored, and days whose last
+        transaction was removed are deleted rather than kept as zeros.
+        """
+
+        totals: dict[tuple[int, date, str], list[Any]] = {}
+        for change in changes:
+            if change.day is None:
+                continue
+            key = (change.client_id, change.day, change.currency)
+            entry = totals.setdefault(key, [0, 0, 0])
+            entry[0 if change.type == "CREDIT" else 1] += change.sign * change.amount
+            entry[2] += change.sign
+        if not totals:
+            return
+
+        rows = [
+            {
+                "client_id": client_id,
+                "day": day,
+                "currency": currency,
+                "credit_total": credit,
+                "debit_total": debit,
+                "transaction_count": count,
+            }
+            for (client_id, day, currency), (credit, debit, count) in totals.items()
+        ]
+        dialect = self.session.get_bind().dialect.name
+        stmt = UPSERT_INSERTS[dialect](ClientDailyTotal).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                ClientDailyTotal.client_id,
+                ClientDailyTotal.day,
+                ClientDailyTotal.currency,
+            ],
+            set_={
+                "credit_total": ClientDailyTotal.credit_total + stmt.excluded.credit_total,
+                "debit_total": ClientDailyTotal.debit_total + stmt.excluded.debit_total,
+                "transaction_count": (
+                    ClientDailyTotal.transaction_count + stmt.excluded.transaction_count
+                ),
+            },
+        )
+        self.session.execute(stmt)
+
+        emptied = [key for key, (_, _, count) in totals.items() if count < 0]
+        if emptied:
+            self.session.execute(
+                delete(ClientDailyTotal).where(
+                    tuple_(
+                        ClientDailyTotal.client_id, ClientDailyTotal.day, ClientDailyTotal.currency
+                    ).in_(emptied),
+                    ClientDailyTotal.transaction_count == 0,
+                )
+            )
+
+    def rebuild(self, *, chunk_size: int = REBUILD_CHUNK_SIZE) -> int:
+        """Recompute every daily total from the transactions table.
+
+        Works through the clients in chunks exactly like
+        :meth:`BalanceService.rebuild`, locking each chunk's client rows.
+        Returns the number of clients processed.
+        """
+
+        day = self._day(Transaction.created_at)
+        credit, debit = self._sums(Transaction.type, Transaction.amount)
+        processed = 0
+        last_id = 0
+        while True:
+            ids = self.session.scalars(
+                select(Client.id)
+                .where(Client.id > last_id)
+                .order_by(Client.id)
+                .limit(chunk_size)
+                .with_for_update()
+            ).all()
+            if not ids:
+                break
+            in_chunk = ids[0], ids[-1]
+
+            self.session.execute(
+                delete(ClientDailyTotal).where(ClientDailyTotal.client_id.between(*in_chunk))
+            )
+            totals = (
+                select(
+                    Transaction.client_id, day, Transaction.currency, credit, debit, func.count()
+                )
+                .where(Transaction.client_id.between(*in_chunk))
+                .group_by(Transaction.client_id, day, Transaction.currency)
+            )
+            self.session.execute(
+                insert(ClientDailyTotal).from_select(
+                    [
+                        "client_id",
+                        "day",
+                        "currency",
+                        "credit_total",
+                        "debit_total",
+                        "transaction_count",
+                    ],
+                    totals,
+                )
+            )
+            self.session.commit()
+            processed += len(ids)
+            last_id = ids[-1]
+        return processed
+
+    def volume(
+        self,
+        *,
+        group_by: str = "day",
+        client_id: int | None = None,
+        currency: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> dict[str, Any]:
+        """Return DEBIT/CREDIT totals per period and currency within ``[start_date, end_date)``.
+
+        Ranges whose bounds fall on UTC midnights are answered from the daily
+        rollup; any other range falls back to a ``GROUP BY`` over the
+        matching transactions.
+        """
+
+        if is_day_boundary(start_date) and is_day_boundary(end_date):
+            source = "rollup"
+            stmt = self._rollup_query(group_by, client_id, currency, start_date, end_date)
+        else:
+            source = "transactions"
+            stmt = self._transactions_query(group_by, client_id, currency, start_date, end_date)
+        items = [
+            PeriodTotals(
+                _as_date(period),
+                row_currency,
+                Decimal(credit),
+                Decimal(debit),
+                count,
+            )
+            for period, row_currency, credit, debit, count in self.session.execute(stmt)
+        ]
+        return {"group_by": group_by, "source": source, "items": items}
+
+    def _rollup_query(
+        self,
+        group_by: str,
+        client_id: int | None,
+        currency: str | None,
+        start_date: datetime | None,
+        end_date: datetime | None,
+    ) -> Select[Any]:
+        table = ClientDailyTotal
+        conditions = []
+        if client_id is not None:
+            conditions.append(table.client_id == client_id)
+        if currency is not None:
+            conditions.append(table.currency == currency)
+        if start_date is not None:
+            conditions.append(table.day >= utc_day(start_date))
+        if end_date is not None:
+            conditions.append(table.day < utc_day(end_date))
+        period = table.day if group_by == "day" else self._month(table.day)
+        return (
+            select(
+                period.label("period"),
+                table.currency,
+                func.sum(table.credit_total),
+                func.sum(table.debit_total),
+                func.sum(table.transaction_count),
+            )
+            .where(*conditions)
+            .group_by(period, table.currency)
+            .order_by(period, table.currency)
+        )
+
+    def _transactions_query(
+        self,
+        group_by: str,
+        client_id: int | None,
+        currency: str | None,
+        start_date: datetime | None,
+        end_date: datetime | None,
+    ) -> Select[Any]:
+        conditions = []
+        if client_id is not None:
+            conditions.append(Transaction.client_id == client_id)
+        if currency is not None:
+            conditions.append(Transaction.currency == currency)
+        if start_date is not None:
+            conditions.append(Transaction.created_at >= start_date)
+        if end_date is not None:
+            conditions.append(Transaction.created_at < end_date)
+        day = self._day(Transaction.created_at)
+        period = day if group_by == "day" else self._month(day)
+        credit, debit = self._sums(Transaction.type, Transaction.amount)
+        return (
+            select(period.label("period"), Transaction.currency, credit, debit, func.count())
+            .where(*conditions)
+            .group_by(period, Transaction.currency)
+            .order_by(period, Transaction.currency)
+        )
+
+    def _day(self, column: ColumnElement[Any]) -> ColumnElement[Any]:
+        if self.session.get_bind().dialect.name == "postgresql":
+            return cast(func.timezone("UTC", column), Date)
+        return func.date(column)
+
+    def _month(self, day: ColumnElement[Any]) -> ColumnElement[Any]:
+        if self.session.get_bind().dialect.name == "postgresql":
+            return cast(func.date_trunc("month", day), Date)
+        return func.strftime("%Y-%m-01", day)
+
+    @staticmethod
+    def _sums(
+        kind: ColumnElement[Any], amount: ColumnElement[Any]
+    ) -> tuple[ColumnElement[Any], ColumnElement[Any]]:
+        credit = func.coalesce(func.sum(case((kind == "CREDIT", amount), else_=0)), 0)
+        debit = func.coalesce(func.sum(case((kind == "DEBIT", amount), else_=0)), 0)
+        return credit, debit
+
+
+def _as_date(value: date | str) -> date:
+    # SQLite returns date expressions as ISO strings.
+    return value if isinstance(value, date) else date.fromisoformat(value)
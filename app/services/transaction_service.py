@@ -1,22 +1,43 @@
 """Service logic for transaction operations."""
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, func, insert, select, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
 
+from ..cache import EntityCache, get_entity_cache
 from ..extensions import db
 from ..models import Client, Transaction
-from .exceptions import EntityNotFoundError, ValidationError
+from ..models.base import utc_day
+from .balance_service import BalanceChange, BalanceService
+from .exceptions import EntityNotFoundError, ValidationError, is_foreign_key_violation
+from .lookup import get_many
+from .pagination import keyset_order, keyset_page, load_columns, page_count, page_offset
+from .stats_service import StatsService
+
+EXPORT_BATCH_SIZE = 1000
+# Newest transactions embedded per client by ``?expand=transactions``.
+EXPANDED_TRANSACTIONS = 5
 
 
 class TransactionService:
     """Encapsulates transaction-specific business logic."""
 
-    def __init__(self, session: Session | None = None) -> None:
+    def __init__(
+        self, session: Session | None = None, cache: EntityCache | None = None
+    ) -> None:
         self.session = session or db.session
+        self.balances = BalanceService(self.session)
+        self.stats = StatsService(self.session)
+        self._cache = cache
+
+    @property
+    def cache(self) -> EntityCache | None:
+        return self._cache or get_entity_cache()
 
     def list_transactions(
         self,
@@ -27,8 +48,84 @@ class TransactionService:
         txn_type: str | None = None,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        cursor: str | None = None,
+        only: Sequence[str] | None = None,
     ) -> dict[str, Any]:
-        stmt = select(Transaction)
+        """List transactions newest first.
+
+        When ``cursor`` is given (an empty string requests the first page) the
+        listing uses keyset pagination on ``(created_at, id)`` and skips the
+        count; otherwise the classic page/per_page envelope is returned.
+        ``only`` names the attributes to load; the other columns stay out of
+        the ``SELECT`` and are deferred on the returned objects.
+        """
+
+        conditions = self._filter_conditions(
+            client_id=client_id, txn_type=txn_type, start_date=start_date, end_date=end_date
+        )
+        columns = load_columns(Transaction, only)
+        if cursor is not None:
+            stmt = select(Transaction).options(*columns).where(*conditions)
+            return keyset_page(self.session, stmt, Transaction, cursor=cursor, per_page=per_page)
+
+        stmt = (
+            select(Transaction)
+            .options(*columns)
+            .where(*conditions)
+            .order_by(*keyset_order(Transaction))
+            .limit(per_page)
+            .offset(page_offset(page, per_page))
+        )
+        items = self.session.scalars(stmt).all()
+        total = self.session.scalar(
+            select(func.count()).select_from(Transaction).where(*conditions)
+        )
+
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "pages": page_count(total, per_page),
+        }
+
+    def iter_transactions(
+        self,
+        *,
+        client_id: int | None = None,
+        txn_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        only: Sequence[str] | None = None,
+    ) -> Iterator[Row[Any]]:
+        """Stream matching transactions oldest first as plain rows.
+
+        Rows are fetched ``batch_size`` at a time through a server-side cursor
+        and never hydrated into ORM objects, so memory stays flat regardless of
+        how many rows match. ``only`` restricts the selected columns.
+        """
+
+        conditions = self._filter_conditions(
+            client_id=client_id, txn_type=txn_type, start_date=start_date, end_date=end_date
+        )
+        table = Transaction.__table__
+        columns = table.columns if only is None else [table.c[name] for name in only]
+        stmt = (
+            select(*columns)
+            .where(*conditions)
+            .order_by(Transaction.created_at, Transaction.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.execute(stmt)
+
+    @staticmethod
+    def _filter_conditions(
+        *,
+        client_id: int | None,
+        txn_type: str | None,
+        start_date: datetime | None,
+        end_date: datetime | None,
+    ) -> list[Any]:
         conditions = []
         if client_id is not None:
             conditions.append(Transaction.client_id == client_id)
@@ -38,55 +135,192 @@ class TransactionService:
             conditions.append(Transaction.created_at >= start_date)
         if end_date is not None:
             conditions.append(Transaction.created_at <= end_date)
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
+        return conditions
 
-        stmt = stmt.order_by(Transaction.created_at.desc())
-        items = self.session.scalars(stmt).all()
-        total = len(items)
-        start = max(page - 1, 0) * per_page
-        end = start + per_page
-        paginated = items[start:end]
+    def create_transaction(
+        self,
+        data: dict[str, Any],
+        *,
+        before_commit: Callable[[Transaction], None] | None = None,
+    ) -> Transaction:
+        """Insert one transaction and update the client's balance.
 
-        return {
-            "items": paginated,
-            "total": total,
-            "page": page,
-            "pages": (total + per_page - 1) // per_page if per_page else 1,
-        }
+        The client is not looked up first: the foreign key rejects unknown
+        clients, so the row is written with a single ``INSERT ... RETURNING``.
+        Other integrity errors, such as a row outside every monthly partition,
+        propagate unchanged.
+        ``before_commit`` receives the flushed transaction and may stage more
+        changes that must commit atomically with it.
+        """
 
-    def create_transaction(self, data: dict[str, Any]) -> Transaction:
-        client_id = data.get("client_id")
-        if client_id is None or self.session.get(Client, client_id) is None:
+        if data.get("client_id") is None:
             raise ValidationError("Client does not exist.", field="client_id")
 
         transaction = Transaction(**data)
         self.session.add(transaction)
+        try:
+            self.session.flush()
+        except IntegrityError as exc:
+            self.session.rollback()
+            if not is_foreign_key_violation(exc):
+                raise
+            raise ValidationError("Client does not exist.", field="client_id") from exc
+        self._record([BalanceChange.of(transaction)])
+        if before_commit is not None:
+            before_commit(transaction)
         self.session.commit()
         return transaction
 
+    def create_transactions(self, items: list[dict[str, Any]]) -> list[int | None]:
+        """Insert many transactions in a single database transaction.
+
+        Client existence is checked with one ``IN`` query and the rows are
+        written with batched multi-row ``INSERT ... RETURNING`` statements.
+        Returns the new ids aligned with ``items``; ``None`` marks an item whose
+        client does not exist and was therefore skipped. A client deleted
+        between the check and the insert trips the foreign key; the batch is
+        then rolled back and checked again.
+        """
+
+        client_ids = {item["client_id"] for item in items}
+        while True:
+            existing = set(
+                self.session.scalars(select(Client.id).where(Client.id.in_(client_ids)))
+            )
+            rows = [item for item in items if item["client_id"] in existing]
+            try:
+                new_ids = self._insert_batch(rows)
+            except IntegrityError as exc:
+                self.session.rollback()
+                if not is_foreign_key_violation(exc):
+                    raise
+                continue
+            self.session.commit()
+            break
+
+        ids = iter(new_ids)
+        return [next(ids) if item["client_id"] in existing else None for item in items]
+
+    def _insert_batch(self, rows: list[dict[str, Any]]) -> list[int]:
+        if not rows:
+            return []
+        stmt = insert(Transaction).returning(
+            Transaction.id, Transaction.created_at, sort_by_parameter_order=True
+        )
+        inserted = self.session.execute(stmt, rows).all()
+        self._record(
+            BalanceChange(
+                row["client_id"],
+                row["currency"],
+                row["type"],
+                row["amount"],
+                day=utc_day(created_at),
+            )
+            for row, (_, created_at) in zip(rows, inserted, strict=True)
+        )
+        return [new_id for new_id, _ in inserted]
+
     def get_transaction(self, transaction_id: int) -> Transaction:
-        transaction = self.session.get(Transaction, transaction_id)
+        cache = self.cache
+        if cache is None:
+            return self._load_transaction(transaction_id)
+        transaction = cache.fetch(self.session, Transaction, "transaction", transaction_id)
         if transaction is None:
             raise EntityNotFoundError(
                 f"Transaction {transaction_id} not found.", entity="transaction"
             )
         return transaction
 
+    def latest_by_client(
+        self, client_ids: list[int], *, limit: int = EXPANDED_TRANSACTIONS
+    ) -> dict[int, list[Transaction]]:
+        """Return up to ``limit`` newest transactions of each client, with one query.
+
+        Postgres joins a ``LATERAL`` subquery per client that walks the
+        ``(client_id, created_at, id)`` index and stops after ``limit`` rows.
+        Other databases number each client's rows with ``row_number()`` and
+        keep the first ``limit``.
+        """
+
+        if not client_ids:
+            return {}
+        if self.session.get_bind().dialect.name == "postgresql":
+            owners = select(Client.id).where(Client.id.in_(client_ids)).subquery()
+            latest = (
+                select(Transaction)
+                .where(Transaction.client_id == owners.c.id)
+                .order_by(*keyset_order(Transaction))
+                .limit(limit)
+                .lateral()
+            )
+            recent = aliased(Transaction, latest)
+            stmt = select(recent).select_from(owners).join(latest, true())
+        else:
+            rank = func.row_number().over(
+                partition_by=Transaction.client_id, order_by=keyset_order(Transaction)
+            )
+            ranked = (
+                select(Transaction, rank.label("rank"))
+                .where(Transaction.client_id.in_(client_ids))
+                .subquery()
+            )
+            recent = aliased(Transaction, ranked)
+            stmt = select(recent).where(ranked.c.rank <= limit)
+
+        grouped: dict[int, list[Transaction]] = {}
+        for transaction in self.session.scalars(stmt.order_by(*keyset_order(recent))):
+            grouped.setdefault(transaction.client_id, []).append(transaction)
+        return grouped
+
+    def get_transactions(self, transaction_ids: list[int]) -> dict[str, Any]:
+        """Return the transactions with ``transaction_ids`` in order, and the ids not found."""
+
+        items, missing = get_many(
+            self.session, Transaction, "transaction", transaction_ids, self.cache
+        )
+        return {"items": items, "missing": missing}
+
     def update_transaction(self, transaction_id: int, data: dict[str, Any]) -> Transaction:
-        transaction = self.get_transaction(transaction_id)
+        transaction = self._load_transaction(transaction_id)
         if "client_id" in data:
             raise ValidationError("client_id cannot be modified.", field="client_id")
 
+        previous = BalanceChange.of(transaction, sign=-1)
         for key, value in data.items():
             setattr(transaction, key, value)
+        self._record([previous, BalanceChange.of(transaction)])
         self.session.commit()
+        self._invalidate(transaction_id)
         return transaction
 
     def delete_transaction(self, transaction_id: int) -> None:
-        transaction = self.get_transaction(transaction_id)
+        transaction = self._load_transaction(transaction_id)
+        self._record([BalanceChange.of(transaction, sign=-1)])
         self.session.delete(transaction)
         self.session.commit()
+        self._invalidate(transaction_id)
+
+    def _record(self, changes: Iterable[BalanceChange]) -> None:
+        """Apply ``changes`` to the running balances and the daily totals."""
+
+        changes = list(changes)
+        self.balances.apply(changes)
+        self.stats.apply(changes)
+
+    def _load_transaction(self, transaction_id: int) -> Transaction:
+        """Load a transaction from the database, bypassing the cache, for writes."""
+
+        transaction = self.session.get(Transaction, transaction_id)
+        if transaction is None:
+            raise EntityNotFoundError(
+                f"Transaction {transaction_id} not found.", entity="transaction"
+            )
+        return transaction
+
+    def _invalidate(self, transaction_id: int) -> None:
+        cache = self.cache
+        if cache is not None:
+            cache.invalidate("transaction", transaction_id)
 
     def list_client_transactions(
         self,
@@ -94,10 +328,13 @@ class TransactionService:
         *,
         page: int = 1,
         per_page: int = 20,
+        cursor: str | None = None,
+        only: Sequence[str] | None = None,
     ) -> dict[str, Any]:
         return self.list_transactions(
             page=page,
             per_page=per_page,
             client_id=client_id,
+            cursor=cursor,
+            only=only,
         )
-
@@ -0,0 +1,7 @@
+"""Dialect-specific ``INSERT`` constructs for ``ON CONFLICT`` upserts."""
+from __future__ import annotations
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+# ``insert`` factories keyed by dialect name; both support ``on_conflict_do_update``.
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
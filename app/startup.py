@@ -0,0 +1,95 @@
+"""Startup work done once per server instead of once per worker.
+
+With ``preload_app`` gunicorn builds the application in the master process
+and forks the workers from it, so the imported modules, the Flask app and
+the pre-rendered Swagger document sit in memory pages the workers share
+copy-on-write. Pooled database connections must not cross the fork:
+:func:`after_fork` drops the ones a child inherited without closing them
+under the parent's feet.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+
+from flask import Flask, Response, current_app, request
+from werkzeug.http import quote_etag
+
+from .extensions import api, db
+
+SWAGGER_ENDPOINT = "api.specs"
+
+
+@dataclass(frozen=True, slots=True)
+class SwaggerDocument:
+    """The encoded Swagger document with its gzip variant and unquoted ETag."""
+
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+
+def render_swagger(app: Flask) -> SwaggerDocument:
+    """Build the Swagger document from the registered namespaces and encode it once.
+
+    The document is rendered in a synthetic request at the server root, so a
+    deployment under a ``SCRIPT_NAME`` prefix should leave
+    ``SWAGGER_PRERENDER`` off.
+    """
+
+    with app.test_request_context("/"):
+        schema = api.__schema__
+    if "error" in schema:
+        raise RuntimeError(f"Could not render the Swagger document: {schema['error']}")
+    body = json.dumps(schema, separators=(",", ":")).encode()
+    return SwaggerDocument(
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+        etag=hashlib.blake2b(body, digest_size=16).hexdigest(),
+    )
+
+
+def serve_swagger() -> Response:
+    """Serve the pre-rendered document, gzipped when the client accepts it."""
+
+    document: SwaggerDocument = current_app.extensions["swagger_document"]
+    if request.if_none_match.contains_weak(document.etag):
+        response = Response(status=304)
+    elif request.accept_encodings["gzip"] > 0:
+        response = Response(document.gzip_body, mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(document.body, mimetype="application/json")
+    response.headers["ETag"] = quote_etag(document.etag)
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+def init_swagger_cache(app: Flask) -> None:
+    """Render the Swagger document now and serve it instead of flask-restx's view.
+
+    Must run after the API blueprint is registered. Disabled by setting
+    ``SWAGGER_PRERENDER`` to false.
+    """
+
+    if not app.config["SWAGGER_PRERENDER"] or SWAGGER_ENDPOINT not in app.view_functions:
+        return
+    app.extensions["swagger_document"] = render_swagger(app)
+    app.view_functions[SWAGGER_ENDPOINT] = serve_swagger
+
+
+def after_fork(app: Flask) -> None:
+    """Discard pooled connections inherited from the parent process.
+
+    ``close=False`` leaves the sockets to the parent; the child opens its
+    own connections on first use. The worker's readiness pinger starts
+    here, so its first probe does not wait for a request.
+    """
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    monitor = app.extensions.get("readiness")
+    if monitor is not None:
+        monitor.start()
@@ -0,0 +1,6 @@
+"""ASGI entry point for running the application with uvicorn."""
+from __future__ import annotations
+
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,102 @@
+"""Benchmark ``POST /api/v1/clients:import`` throughput and memory as uploads grow.
+
+The upload is generated lazily while the endpoint reads it, so the numbers
+reflect the import alone. The process's peak RSS is printed after each
+upload; it should stay flat as uploads grow. Use a database file, as an
+in-memory SQLite database grows the process with every imported row::
+
+    DATABASE_URL=sqlite:////tmp/import.db \
+        python -m benchmarks.client_import --config development --rows 10000 100000 1000000
+
+Against Postgres, point ``DATABASE_URL`` at it and pass ``--config production``.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import resource
+import time
+from collections.abc import Iterator
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from app import create_app
+from app.extensions import db
+
+CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+class GeneratedUpload(io.RawIOBase):
+    """A read-only stream of ``rows`` client records, produced on demand."""
+
+    def __init__(self, rows: int, upload_format: str, offset: int) -> None:
+        self._lines = self._generate(rows, upload_format, offset)
+        self._buffer = b""
+
+    @staticmethod
+    def _generate(rows: int, upload_format: str, offset: int) -> Iterator[bytes]:
+        if upload_format == "csv":
+            yield b"name,email\n"
+        for index in range(offset, offset + rows):
+            if upload_format == "csv":
+                yield f"Client {index},client{index}@import.example.com\n".encode()
+            else:
+                yield (
+                    f'{{"name": "Client {index}", "email": "client{index}@import.example.com"}}\n'
+                ).encode()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target: bytearray | memoryview) -> int:  # type: ignore[override]
+        while len(self._buffer) < len(target):
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def upload_environ(upload: io.BufferedReader, upload_format: str) -> dict[str, object]:
+    """Build a WSGI environ for a chunked upload of unknown length, as gunicorn passes it."""
+
+    environ = EnvironBuilder(
+        "/api/v1/clients:import", method="POST", content_type=CONTENT_TYPES[upload_format]
+    ).get_environ()
+    environ.pop("CONTENT_LENGTH", None)
+    environ.update({"wsgi.input": upload, "wsgi.input_terminated": True})
+    return environ
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--format", choices=sorted(CONTENT_TYPES), default="csv")
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        db.create_all()
+        print(f"{'rows':>10} {'seconds':>9} {'rows/s':>10} {'peak RSS MiB':>13}")
+        offset = 0
+        for rows in args.rows:
+            upload = io.BufferedReader(GeneratedUpload(rows, args.format, offset))
+            offset += rows
+            started = time.perf_counter()
+            body, status, _ = run_wsgi_app(app, upload_environ(upload, args.format))
+            summary = json.loads(b"".join(body))
+            elapsed = time.perf_counter() - started
+            # ru_maxrss is in KiB on Linux.
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            if not status.startswith("200") or summary["created"] != rows:
+                raise RuntimeError(f"import failed: {status} {summary}")
+            print(f"{rows:>10} {elapsed:>9.2f} {rows / elapsed:>10.0f} {peak:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark ``GET /api/v1/clients`` latency as the clients table grows.
+
+Run against in-memory SQLite::
+
+    python -m benchmarks.client_listing --sizes 10000 100000 1000000
+
+or against Postgres by exporting ``DATABASE_URL`` and passing ``--config production``.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import func, insert, select
+
+from app import create_app
+from app.extensions import db
+from app.models import Client
+
+CHUNK_SIZE = 10_000
+
+
+def seed_clients(target: int, current: int) -> None:
+    """Insert clients until the table holds ``target`` rows."""
+
+    for start in range(current, target, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, target)
+        rows = [
+            {"name": f"Client {i}", "email": f"client{i}@example.com"} for i in range(start, stop)
+        ]
+        db.session.execute(insert(Client), rows)
+        db.session.commit()
+
+
+def measure(call: Callable[[], object], repeat: int) -> dict[str, float]:
+    """Return median and p95 latency of ``call`` in milliseconds."""
+
+    call()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def scenarios(http: FlaskClient, size: int, per_page: int) -> dict[str, Callable[[], object]]:
+    """Build the request shapes to time for a table of ``size`` rows."""
+
+    deep_page = max(size // per_page // 2, 1)
+
+    def deep_cursor() -> object:
+        cursor = ""
+        for _ in range(5):
+            body = http.get("/api/v1/clients", query_string={"cursor": cursor}).get_json()
+            cursor = body["next_cursor"] or ""
+        return body
+
+    return {
+        "first_page": lambda: http.get("/api/v1/clients"),
+        "first_page_no_total": lambda: http.get(
+            "/api/v1/clients", query_string={"include_total": "false"}
+        ),
+        "deep_offset_page": lambda: http.get(
+            "/api/v1/clients", query_string={"page": deep_page, "per_page": per_page}
+        ),
+        "cursor_5_pages": deep_cursor,
+        "name_filter": lambda: http.get("/api/v1/clients", query_string={"name": "Client 42"}),
+        "email_filter": lambda: http.get("/api/v1/clients", query_string={"email": "client4242"}),
+        # Full-text search: a selective prefix, a prefix matching a tenth of the
+        # table, and a word every row contains (the worst case, all rows ranked).
+        "search_prefix": lambda: http.get("/api/v1/clients", query_string={"q": "client4242"}),
+        "search_broad": lambda: http.get("/api/v1/clients", query_string={"q": "client 4"}),
+        "search_all_match": lambda: http.get("/api/v1/clients", query_string={"q": "example"}),
+    }
+
+
+def run(app: Flask, sizes: list[int], per_page: int, repeat: int) -> None:
+    """Grow the table to each size in turn and print the latency of every scenario."""
+
+    http = app.test_client()
+    current = db.session.scalar(select(func.count()).select_from(Client))
+    print(f"{'clients':>10} {'scenario':<22} {'median ms':>10} {'p95 ms':>10}")
+    for size in sorted(sizes):
+        seed_clients(size, current)
+        current = size
+        for name, call in scenarios(http, size, per_page).items():
+            stats = measure(call, repeat)
+            print(f"{size:>10} {name:<22} {stats['median_ms']:>10.2f} {stats['p95_ms']:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        db.create_all()
+        run(app, args.sizes, args.per_page, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure the CPU cost and the bytes saved by compressing transaction responses.
+
+Loads a seeded dataset (see :mod:`benchmarks.datagen`), fetches real
+transaction list pages and an NDJSON export through the test client and,
+for every body, times each coding and level the app can negotiate:
+
+* ``ms``: median time to compress the body once;
+* ``ratio``: encoded size over original size;
+* ``us/KiB saved``: compression time per KiB of egress avoided.
+
+It then times the ``per_page=500`` page end to end with and without
+``Accept-Encoding`` to put the compression cost next to the request cost::
+
+    python -m benchmarks.compression --clients 1000 --transactions 100000
+"""
+from __future__ import annotations
+
+import argparse
+from functools import partial
+
+from flask.testing import FlaskClient
+from sqlalchemy import func, select
+
+from app import create_app
+from app.compression import encoders
+from app.extensions import db
+from app.models import Transaction
+
+from .client_listing import measure
+from .datagen import DatasetSpec, load_dataset
+
+LEVELS = (1, 6, 9)
+ZSTD_LEVELS = (1, 3, 9)
+
+
+def fetch_bodies(http: FlaskClient, per_pages: list[int], client_id: int) -> dict[str, bytes]:
+    """Return the unencoded bodies of the list pages and of the export of ``client_id``."""
+
+    bodies = {
+        f"list per_page={per_page}": http.get(
+            "/api/v1/transactions", query_string={"per_page": per_page}
+        ).data
+        for per_page in per_pages
+    }
+    bodies["export ndjson"] = http.get(
+        "/api/v1/transactions/export", query_string={"client_id": client_id}
+    ).data
+    return bodies
+
+
+def compress_once(coding: str, level: int, body: bytes) -> bytes:
+    encoder = encoders(level, level)[coding]()
+    return encoder.compress(body) + encoder.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--per-page", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        load_dataset(db.session, DatasetSpec(args.clients, args.transactions))
+        busiest_client_id = db.session.scalar(
+            select(Transaction.client_id)
+            .group_by(Transaction.client_id)
+            .order_by(func.count().desc(), Transaction.client_id)
+            .limit(1)
+        )
+        http = app.test_client()
+        bodies = fetch_bodies(http, args.per_page, busiest_client_id)
+
+        codings = list(encoders(6, 3))
+        print(
+            f"{'body':<20} {'bytes':>10} {'coding':<12} {'ms':>8} {'ratio':>7} "
+            f"{'us/KiB saved':>13}"
+        )
+        for name, body in bodies.items():
+            for coding in codings:
+                for level in ZSTD_LEVELS if coding == "zstd" else LEVELS:
+                    encoded = compress_once(coding, level, body)
+                    stats = measure(partial(compress_once, coding, level, body), args.repeat)
+                    saved_kib = max(len(body) - len(encoded), 1) / 1024
+                    print(
+                        f"{name:<20} {len(body):>10} {f'{coding}-{level}':<12} "
+                        f"{stats['median_ms']:>8.3f} {len(encoded) / len(body):>7.3f} "
+                        f"{stats['median_ms'] * 1000 / saved_kib:>13.2f}"
+                    )
+
+        print(f"\n{'request per_page=500':<28} {'median ms':>10} {'p95 ms':>10}")
+        for accept in ("identity", *codings):
+            request = partial(
+                http.get,
+                "/api/v1/transactions",
+                query_string={"per_page": 500},
+                headers={"Accept-Encoding": accept},
+            )
+            stats = measure(request, args.repeat)
+            print(f"{accept:<28} {stats['median_ms']:>10.2f} {stats['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Seeded synthetic data for the benchmarks.
+
+The same ``seed`` always produces the same rows, so runs on different
+machines or commits are comparable. The distributions are meant to look
+like production traffic rather than uniform noise:
+
+* client activity is Zipf-skewed, so a few clients own most transactions;
+* currencies are mostly MXN, then USD, then EUR;
+* amounts are log-normal, mostly small with a long tail;
+* timestamps spread over ``days`` and lean towards recent dates.
+
+Run it on its own to fill a database for manual testing::
+
+    python -m benchmarks.datagen --clients 10000 --transactions 100000
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import random
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import create_app
+from app.extensions import db
+from app.models import Client, Transaction
+from app.models.transaction import SUPPORTED_CURRENCIES
+from app.services import BalanceService, StatsService
+
+CURRENCY_WEIGHTS = {"MXN": 0.7, "USD": 0.2, "EUR": 0.1}
+CREDIT_SHARE = 0.45
+ZIPF_EXPONENT = 1.1
+INSERT_CHUNK_SIZE = 5_000
+# Fixed end of the generated date range, so the same seed yields identical rows.
+REFERENCE_TIME = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSpec:
+    """Size and shape of a generated dataset."""
+
+    clients: int
+    transactions: int
+    seed: int = 42
+    days: int = 365
+
+    @property
+    def label(self) -> str:
+        return f"{self.clients}c-{self.transactions}t"
+
+
+def _client_weights(count: int) -> list[float]:
+    return list(itertools.accumulate(1 / (rank**ZIPF_EXPONENT) for rank in range(1, count + 1)))
+
+
+def _recent_timestamp(rng: random.Random, now: datetime, days: int) -> datetime:
+    # Squaring a uniform sample piles the values up near zero, i.e. near ``now``.
+    age = rng.random() ** 2 * days
+    return now - timedelta(days=age)
+
+
+def client_rows(spec: DatasetSpec, now: datetime) -> list[dict[str, object]]:
+    rng = random.Random(f"{spec.seed}-clients")
+    return [
+        {
+            "name": f"Client {index:07d}",
+            "email": f"client{index}@bench.example.com",
+            "created_at": now - timedelta(days=rng.uniform(0, spec.days)),
+        }
+        for index in range(spec.clients)
+    ]
+
+
+def transaction_rows(
+    spec: DatasetSpec, client_ids: list[int], now: datetime
+) -> list[dict[str, object]]:
+    rng = random.Random(f"{spec.seed}-transactions")
+    # Shuffle the ranks so the busiest clients are not simply the oldest ones.
+    ranked_ids = client_ids[:]
+    rng.shuffle(ranked_ids)
+    weights = _client_weights(len(ranked_ids))
+    owners = rng.choices(ranked_ids, cum_weights=weights, k=spec.transactions)
+    currencies = rng.choices(
+        SUPPORTED_CURRENCIES,
+        weights=[CURRENCY_WEIGHTS[currency] for currency in SUPPORTED_CURRENCIES],
+        k=spec.transactions,
+    )
+    rows = []
+    for client_id, currency in zip(owners, currencies, strict=True):
+        amount = min(math.exp(rng.gauss(4.5, 1.2)), 9_999_999)
+        rows.append(
+            {
+                "client_id": client_id,
+                "amount": Decimal(f"{amount:.2f}") or Decimal("0.01"),
+                "currency": currency,
+                "type": "CREDIT" if rng.random() < CREDIT_SHARE else "DEBIT",
+                "description": f"Synthetic {rng.randrange(10_000):04d}",
+                "created_at": _recent_timestamp(rng, now, spec.days),
+            }
+        )
+    return rows
+
+
+def load_dataset(session: Session, spec: DatasetSpec) -> list[int]:
+    """Insert the dataset described by ``spec`` and return the client ids.
+
+    Balances and daily totals are rebuilt from the inserted transactions
+    afterwards, as the bulk inserts bypass the service layer.
+    """
+
+    now = REFERENCE_TIME
+    client_ids: list[int] = []
+    clients = client_rows(spec, now)
+    for start in range(0, len(clients), INSERT_CHUNK_SIZE):
+        chunk = clients[start : start + INSERT_CHUNK_SIZE]
+        client_ids.extend(
+            session.scalars(
+                insert(Client).returning(Client.id, sort_by_parameter_order=True), chunk
+            )
+        )
+    session.commit()
+
+    transactions = transaction_rows(spec, client_ids, now)
+    for start in range(0, len(transactions), INSERT_CHUNK_SIZE):
+        session.execute(insert(Transaction), transactions[start : start + INSERT_CHUNK_SIZE])
+        session.commit()
+
+    BalanceService(session).rebuild()
+    StatsService(session).rebuild()
+    return client_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="development")
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        db.create_all()
+        spec = DatasetSpec(args.clients, args.transactions, args.seed)
+        load_dataset(db.session, spec)
+        print(f"Loaded {spec.label} with seed {spec.seed}")
+
+
+if __name__ == "__main__":
+    main()
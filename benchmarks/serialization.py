@@ -0,0 +1,83 @@
+"""Benchmark serialization of a 1000-item transaction page.
+
+Compares the previous path (``schema.dump`` followed by the Flask-RESTX
+``marshal`` of the Swagger model, then JSON encoding) with the compiled
+single-pass serializer, for every field and for the ``?fields=`` subset
+mobile clients ask for::
+
+    python -m benchmarks.serialization --items 1000 --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from flask_restx import marshal
+
+from app import create_app
+from app.models import Transaction
+from app.resources.transactions import transaction_list_model
+from app.schemas import TransactionSchema, compiled_serializer
+
+from .client_listing import measure
+
+SPARSE_FIELDS = ("id", "amount", "currency", "created_at")
+
+
+def build_transactions(count: int) -> list[Transaction]:
+    """Build detached transactions that look like a page read from the database."""
+
+    now = datetime.now(UTC)
+    return [
+        Transaction(
+            id=i,
+            client_id=i % 50 + 1,
+            amount=Decimal(i) / 100,
+            currency="MXN",
+            type="CREDIT" if i % 2 else "DEBIT",
+            description=f"Transaction {i}",
+            created_at=now,
+            version=1,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    transactions = build_transactions(args.items)
+    schema = TransactionSchema()
+    serializer = compiled_serializer(TransactionSchema)
+    sparse_serializer = compiled_serializer(TransactionSchema, SPARSE_FIELDS)
+    envelope = {"total": args.items, "page": 1, "pages": 1, "next_cursor": None}
+
+    def before() -> str:
+        body = dict(envelope, items=schema.dump(transactions, many=True))
+        return json.dumps(marshal(body, transaction_list_model))
+
+    def after() -> str:
+        body = dict(envelope, items=serializer.dump_many(transactions))
+        return json.dumps(body, separators=(",", ":"))
+
+    def sparse() -> str:
+        body = dict(envelope, items=sparse_serializer.dump_many(transactions))
+        return json.dumps(body, separators=(",", ":"))
+
+    with create_app("testing").app_context():
+        print(f"{'path':<10} {'median ms':>10} {'p95 ms':>10} {'bytes':>10}")
+        for name, call in {"before": before, "after": after, "sparse": sparse}.items():
+            stats = measure(call, args.repeat)
+            print(
+                f"{name:<10} {stats['median_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+                f"{len(call()):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
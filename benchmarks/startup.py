@@ -0,0 +1,158 @@
+"""Measure cold start: import time, time to first request and memory per worker.
+
+Three measurements, each in fresh processes:
+
+* ``import``: time to import the app package and to run ``create_app`` in a
+  new interpreter, and the latency of the first ``/health`` and
+  ``swagger.json`` requests through the test client;
+* ``server``: time from launching ``gunicorn wsgi:app`` until ``/health``
+  answers, with and without ``preload_app``;
+* the RSS and PSS (RSS with shared pages divided among the processes sharing
+  them) of every worker of that server, read from ``/proc`` (Linux only).
+
+Uses a throwaway SQLite file, so no database server is needed::
+
+    python -m benchmarks.startup --runs 5 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+IMPORT_PROBE = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app("production")
+created = time.perf_counter()
+client = app.test_client()
+client.get("/health")
+first = time.perf_counter()
+client.get("/api/v1/swagger.json")
+swagger = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (first - created) * 1000,
+    "first_swagger_ms": (swagger - first) * 1000,
+}))
+"""
+
+
+def probe_import(env: dict[str, str]) -> dict[str, float]:
+    """Run :data:`IMPORT_PROBE` in a new interpreter and return its timings."""
+
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", IMPORT_PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _proc_kib(pid: int, filename: str, field: str) -> int:
+    for line in Path(f"/proc/{pid}/{filename}").read_text().splitlines():
+        if line.startswith(f"{field}:"):
+            return int(line.split()[1])
+    return 0
+
+
+def worker_memory(master_pid: int) -> list[dict[str, float]]:
+    """Return the RSS and PSS in MiB of every child process of ``master_pid``."""
+
+    children = Path(f"/proc/{master_pid}/task/{master_pid}/children").read_text().split()
+    return [
+        {
+            "rss_mib": _proc_kib(int(pid), "status", "VmRSS") / 1024,
+            "pss_mib": _proc_kib(int(pid), "smaps_rollup", "Pss") / 1024,
+        }
+        for pid in children
+    ]
+
+
+def probe_server(
+    env: dict[str, str], workers: int, port: int, *, preload: bool
+) -> dict[str, float]:
+    """Start gunicorn, time it until ``/health`` answers and measure its workers."""
+
+    command = ["gunicorn", "wsgi:app", "--workers", str(workers), "--bind", f"127.0.0.1:{port}"]
+    env = dict(env, GUNICORN_PRELOAD="true" if preload else "false")
+    started = time.perf_counter()
+    process = subprocess.Popen(  # noqa: S603
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/health", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("gunicorn did not start") from None
+                time.sleep(0.01)
+        ready_ms = (time.perf_counter() - started) * 1000
+        # Let every worker boot and serve once before reading memory.
+        time.sleep(1)
+        for _ in range(workers * 4):
+            httpx.get(f"{base_url}/api/v1/swagger.json").raise_for_status()
+        memory = worker_memory(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+    return {
+        "time_to_first_request_ms": ready_ms,
+        "rss_mib_per_worker": statistics.mean(item["rss_mib"] for item in memory),
+        "pss_mib_per_worker": statistics.mean(item["pss_mib"] for item in memory),
+    }
+
+
+def median_of(samples: list[dict[str, float]]) -> dict[str, float]:
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--skip-server", action="store_true", help="Only measure imports")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            APP_ENV="production",
+            DATABASE_URL=f"sqlite:///{directory}/startup.db",
+            READINESS_PING_INTERVAL="0",
+        )
+        results: dict[str, dict[str, float]] = {}
+        for prerender in (False, True):
+            probe_env = dict(env, SWAGGER_PRERENDER=str(prerender).lower())
+            samples = [probe_import(probe_env) for _ in range(args.runs)]
+            results[f"import (prerendered swagger={prerender})"] = median_of(samples)
+        if not args.skip_server:
+            for preload in (False, True):
+                samples = [
+                    probe_server(env, args.workers, args.port, preload=preload)
+                    for _ in range(args.runs)
+                ]
+                results[f"gunicorn x{args.workers} (preload={preload})"] = median_of(samples)
+
+    for name, metrics in results.items():
+        print(name)
+        for key, value in metrics.items():
+            print(f"  {key:<26} {value:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
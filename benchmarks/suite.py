@@ -0,0 +1,488 @@
+"""Benchmark every service method and endpoint at several data sizes.
+
+``run`` loads a seeded synthetic dataset for each ``CLIENTS:TRANSACTIONS``
+size (see :mod:`benchmarks.datagen`), times each scenario and writes the
+results to a JSON file. ``compare`` checks a run against a baseline and
+exits with status 1 when a scenario got slower than the threshold::
+
+    python -m benchmarks.suite run --sizes 1000:10000 10000:100000 --output baseline.json
+    python -m benchmarks.suite run --sizes 1000:10000 10000:100000 --output current.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.15
+
+Runs against in-memory SQLite by default. For Postgres, export
+``DATABASE_URL`` and pass ``--config production``. Every table in that
+database is dropped and recreated for each size, so point it at a
+dedicated benchmark database.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import func, select
+
+from app import create_app
+from app.extensions import db
+from app.models import Transaction
+from app.schemas import TransactionCreateSchema
+from app.services import BalanceService, ClientService, TransactionService
+
+from .datagen import REFERENCE_TIME, DatasetSpec, load_dataset
+
+BATCH_SIZE = 100
+CASCADE_TRANSACTIONS = 20
+
+transaction_create_schema = TransactionCreateSchema()
+
+
+@dataclass(slots=True)
+class Scenario:
+    """One timed operation. ``setup`` runs untimed before every call."""
+
+    name: str
+    call: Callable[[Any], object]
+    setup: Callable[[], Any] = lambda: None
+
+
+@dataclass(slots=True)
+class Fixture:
+    """Ids and helpers the scenarios draw from for one loaded dataset."""
+
+    client_ids: list[int]
+    transaction_ids: list[int]
+    busiest_client_id: int
+    rng: random.Random
+
+    def client_id(self) -> int:
+        return self.rng.choice(self.client_ids)
+
+    def transaction_id(self) -> int:
+        return self.rng.choice(self.transaction_ids)
+
+    def transaction_payload(self, client_id: int | None = None) -> dict[str, Any]:
+        return {
+            "client_id": client_id or self.client_id(),
+            "amount": f"{self.rng.randint(100, 100_000) / 100:.2f}",
+            "currency": self.rng.choice(["MXN", "USD", "EUR"]),
+            "type": self.rng.choice(["CREDIT", "DEBIT"]),
+            "description": "benchmark",
+        }
+
+    def transaction_data(self, client_id: int | None = None) -> dict[str, Any]:
+        """Return a payload loaded through the schema, as the services receive it."""
+
+        return transaction_create_schema.load(self.transaction_payload(client_id))
+
+    def new_client(self) -> int:
+        suffix = self.rng.getrandbits(64)
+        client = ClientService().create_client(
+            {"name": f"Bench {suffix}", "email": f"bench-{suffix}@example.com"}
+        )
+        return client.id
+
+    def new_client_with_transactions(self) -> int:
+        client_id = self.new_client()
+        TransactionService().create_transactions(
+            [self.transaction_data(client_id) for _ in range(CASCADE_TRANSACTIONS)]
+        )
+        return client_id
+
+    def new_transaction(self) -> int:
+        return TransactionService().create_transaction(self.transaction_data()).id
+
+
+def service_scenarios(fixture: Fixture, pages: int) -> list[Scenario]:
+    clients = ClientService()
+    transactions = TransactionService()
+    balances = BalanceService()
+    recent = {"start_date": REFERENCE_TIME - timedelta(days=30), "end_date": REFERENCE_TIME}
+    deep_page = max(pages // 2, 1)
+    return [
+        Scenario("service.clients.list", lambda _: clients.list_clients()),
+        Scenario(
+            "service.clients.list_no_total", lambda _: clients.list_clients(include_total=False)
+        ),
+        Scenario("service.clients.list_deep_page", lambda _: clients.list_clients(page=deep_page)),
+        Scenario("service.clients.list_cursor", lambda _: clients.list_clients(cursor="")),
+        Scenario("service.clients.list_name_filter", lambda _: clients.list_clients(name="00042")),
+        Scenario("service.clients.search", lambda _: clients.list_clients(q="client42")),
+        Scenario("service.clients.get", lambda cid: clients.get_client(cid), fixture.client_id),
+        Scenario(
+            "service.clients.create",
+            lambda _: clients.create_client(
+                {"name": "Bench", "email": f"new-{fixture.rng.getrandbits(64)}@example.com"}
+            ),
+        ),
+        Scenario(
+            "service.clients.update",
+            lambda cid: clients.update_client(cid, {"name": f"Renamed {cid}"}),
+            fixture.client_id,
+        ),
+        Scenario(
+            "service.clients.delete_cascade",
+            lambda cid: clients.delete_client(cid),
+            fixture.new_client_with_transactions,
+        ),
+        Scenario("service.transactions.list", lambda _: transactions.list_transactions()),
+        Scenario(
+            "service.transactions.list_filtered",
+            lambda _: transactions.list_transactions(
+                client_id=fixture.busiest_client_id, txn_type="CREDIT", **recent
+            ),
+        ),
+        Scenario(
+            "service.transactions.list_deep_page",
+            lambda _: transactions.list_transactions(page=deep_page),
+        ),
+        Scenario(
+            "service.transactions.list_cursor", lambda _: transactions.list_transactions(cursor="")
+        ),
+        Scenario(
+            "service.transactions.list_for_client",
+            lambda _: transactions.list_client_transactions(fixture.busiest_client_id),
+        ),
+        Scenario(
+            "service.transactions.get",
+            lambda tid: transactions.get_transaction(tid),
+            fixture.transaction_id,
+        ),
+        Scenario(
+            "service.transactions.create",
+            lambda _: transactions.create_transaction(fixture.transaction_data()),
+        ),
+        Scenario(
+            "service.transactions.create_batch",
+            lambda items: transactions.create_transactions(items),
+            lambda: [fixture.transaction_data() for _ in range(BATCH_SIZE)],
+        ),
+        Scenario(
+            "service.transactions.update",
+            lambda tid: transactions.update_transaction(tid, {"description": "updated"}),
+            fixture.transaction_id,
+        ),
+        Scenario(
+            "service.transactions.delete",
+            lambda tid: transactions.delete_transaction(tid),
+            fixture.new_transaction,
+        ),
+        Scenario(
+            "service.transactions.export_client",
+            lambda _: sum(
+                1 for _row in transactions.iter_transactions(client_id=fixture.busiest_client_id)
+            ),
+        ),
+        Scenario(
+            "service.balances.get",
+            lambda cid: balances.get_client_balances(cid),
+            fixture.client_id,
+        ),
+    ]
+
+
+def endpoint_scenarios(http: FlaskClient, fixture: Fixture, pages: int) -> list[Scenario]:
+    deep_page = max(pages // 2, 1)
+    since = (REFERENCE_TIME - timedelta(days=30)).isoformat()
+
+    def get(path: str, **params: object) -> Callable[[Any], object]:
+        return lambda _: http.get(path, query_string=params)
+
+    return [
+        Scenario("http.clients.list", get("/api/v1/clients")),
+        Scenario("http.clients.list_deep_page", get("/api/v1/clients", page=deep_page)),
+        Scenario("http.clients.list_cursor", get("/api/v1/clients", cursor="")),
+        Scenario("http.clients.search", get("/api/v1/clients", q="client42")),
+        Scenario(
+            "http.clients.get", lambda cid: http.get(f"/api/v1/clients/{cid}"), fixture.client_id
+        ),
+        Scenario(
+            "http.clients.create",
+            lambda _: http.post(
+                "/api/v1/clients",
+                json={"name": "Bench", "email": f"http-{fixture.rng.getrandbits(64)}@example.com"},
+            ),
+        ),
+        Scenario(
+            "http.clients.update",
+            lambda cid: http.put(f"/api/v1/clients/{cid}", json={"name": f"Renamed {cid}"}),
+            fixture.client_id,
+        ),
+        Scenario(
+            "http.clients.delete_cascade",
+            lambda cid: http.delete(f"/api/v1/clients/{cid}"),
+            fixture.new_client_with_transactions,
+        ),
+        Scenario(
+            "http.clients.balance",
+            lambda cid: http.get(f"/api/v1/clients/{cid}/balance"),
+            fixture.client_id,
+        ),
+        Scenario(
+            "http.clients.transactions",
+            get(f"/api/v1/clients/{fixture.busiest_client_id}/transactions"),
+        ),
+        Scenario("http.transactions.list", get("/api/v1/transactions")),
+        Scenario(
+            "http.transactions.list_filtered",
+            get(
+                "/api/v1/transactions",
+                client_id=fixture.busiest_client_id,
+                type="CREDIT",
+                start_date=since,
+            ),
+        ),
+        Scenario("http.transactions.list_deep_page", get("/api/v1/transactions", page=deep_page)),
+        Scenario(
+            "http.transactions.list_sparse",
+            get("/api/v1/transactions", per_page=500, fields="id,amount,currency,created_at"),
+        ),
+        Scenario("http.transactions.list_full", get("/api/v1/transactions", per_page=500)),
+        Scenario(
+            "http.transactions.get",
+            lambda tid: http.get(f"/api/v1/transactions/{tid}"),
+            fixture.transaction_id,
+        ),
+        Scenario(
+            "http.transactions.create",
+            lambda _: http.post("/api/v1/transactions", json=fixture.transaction_payload()),
+        ),
+        Scenario(
+            "http.transactions.create_batch",
+            lambda items: http.post("/api/v1/transactions:batch", json=items),
+            lambda: [fixture.transaction_payload() for _ in range(BATCH_SIZE)],
+        ),
+        Scenario(
+            "http.transactions.update",
+            lambda tid: http.put(f"/api/v1/transactions/{tid}", json={"description": "updated"}),
+            fixture.transaction_id,
+        ),
+        Scenario(
+            "http.transactions.delete",
+            lambda tid: http.delete(f"/api/v1/transactions/{tid}"),
+            fixture.new_transaction,
+        ),
+    ]
+
+
+def time_scenario(scenario: Scenario, repeat: int) -> dict[str, float]:
+    """Return latency statistics of ``scenario`` in milliseconds.
+
+    The session is removed after every call, as at the end of a request, so
+    no call benefits from objects loaded by the previous one.
+    """
+
+    timings = []
+    for iteration in range(repeat + 1):
+        argument = scenario.setup()
+        db.session.remove()
+        started = time.perf_counter()
+        result = scenario.call(argument)
+        elapsed = (time.perf_counter() - started) * 1000
+        db.session.remove()
+        status = getattr(result, "status_code", 200)
+        if status >= 400:
+            raise RuntimeError(f"{scenario.name} answered HTTP {status}: {result.get_data()!r}")
+        if iteration:  # the first call only warms up
+            timings.append(elapsed)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "min_ms": round(timings[0], 3),
+    }
+
+
+def run_size(app: Flask, spec: DatasetSpec, repeat: int) -> list[dict[str, Any]]:
+    """Load ``spec`` into an empty database and time every scenario against it."""
+
+    db.drop_all()
+    db.create_all()
+    started = time.perf_counter()
+    client_ids = load_dataset(db.session, spec)
+    load_seconds = time.perf_counter() - started
+
+    busiest_client_id = db.session.scalar(
+        select(Transaction.client_id)
+        .group_by(Transaction.client_id)
+        .order_by(func.count().desc(), Transaction.client_id)
+        .limit(1)
+    )
+    fixture = Fixture(
+        client_ids=client_ids,
+        transaction_ids=list(db.session.scalars(select(Transaction.id))),
+        busiest_client_id=busiest_client_id or client_ids[0],
+        rng=random.Random(spec.seed),
+    )
+    pages = max(spec.clients // 20, 1)
+    scenarios = service_scenarios(fixture, pages) + endpoint_scenarios(
+        app.test_client(), fixture, pages
+    )
+
+    results = []
+    for scenario in scenarios:
+        stats = time_scenario(scenario, repeat)
+        results.append({"size": spec.label, "scenario": scenario.name, **stats})
+        print(
+            f"{spec.label:<16} {scenario.name:<42} "
+            f"{stats['median_ms']:>10.2f} {stats['p95_ms']:>10.2f}"
+        )
+    print(f"{spec.label:<16} {'(dataset load, s)':<42} {load_seconds:>10.2f}")
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        output = subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    try:
+        clients, transactions = (int(part) for part in value.split(":"))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected CLIENTS:TRANSACTIONS, got {value!r}") from exc
+    return clients, transactions
+
+
+def run(args: argparse.Namespace) -> int:
+    app = create_app(args.config)
+    with app.app_context():
+        engine = db.engine
+        meta = {
+            "started_at": datetime.now(UTC).isoformat(),
+            "git_revision": git_revision(),
+            "database": engine.dialect.name,
+            "config": args.config,
+            "entity_cache": app.config["ENTITY_CACHE_BACKEND"],
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        }
+        print(f"{'size':<16} {'scenario':<42} {'median ms':>10} {'p95 ms':>10}")
+        results = []
+        for clients, transactions in args.sizes:
+            spec = DatasetSpec(clients, transactions, args.seed)
+            results.extend(run_size(app, spec, args.repeat))
+
+    Path(args.output).write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+    print(f"Results written to {args.output}")
+    return 0
+
+
+def compare_results(
+    baseline: dict[str, Any], current: dict[str, Any], *, threshold: float, min_delta_ms: float
+) -> list[dict[str, Any]]:
+    """Match scenarios of two runs by size and name and classify each change.
+
+    A scenario regresses when its median grows by more than ``threshold``
+    (a fraction) and by more than ``min_delta_ms``; the absolute floor keeps
+    sub-millisecond jitter from failing the comparison.
+    """
+
+    before = {(row["size"], row["scenario"]): row for row in baseline["results"]}
+    rows = []
+    for row in current["results"]:
+        key = (row["size"], row["scenario"])
+        old = before.pop(key, None)
+        entry = {"size": key[0], "scenario": key[1], "current_ms": row["median_ms"]}
+        if old is None:
+            entry.update(baseline_ms=None, change=None, status="new")
+        else:
+            delta = row["median_ms"] - old["median_ms"]
+            change = delta / old["median_ms"] if old["median_ms"] else 0.0
+            if change > threshold and delta > min_delta_ms:
+                status = "regression"
+            elif change < -threshold and -delta > min_delta_ms:
+                status = "improvement"
+            else:
+                status = "ok"
+            entry.update(baseline_ms=old["median_ms"], change=change, status=status)
+        rows.append(entry)
+    for size, scenario in before:
+        rows.append(
+            {
+                "size": size,
+                "scenario": scenario,
+                "baseline_ms": before[size, scenario]["median_ms"],
+                "current_ms": None,
+                "change": None,
+                "status": "missing",
+            }
+        )
+    return rows
+
+
+def compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    for key in ("database", "entity_cache"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(
+                f"warning: runs differ in {key}: "
+                f"{baseline['meta'].get(key)} vs {current['meta'].get(key)}"
+            )
+
+    rows = compare_results(
+        baseline, current, threshold=args.threshold, min_delta_ms=args.min_delta_ms
+    )
+    print(f"{'size':<16} {'scenario':<42} {'base ms':>9} {'now ms':>9} {'change':>8}  status")
+    for row in rows:
+        base = f"{row['baseline_ms']:.2f}" if row["baseline_ms"] is not None else "-"
+        now = f"{row['current_ms']:.2f}" if row["current_ms"] is not None else "-"
+        change = f"{row['change']:+.0%}" if row["change"] is not None else "-"
+        print(
+            f"{row['size']:<16} {row['scenario']:<42} "
+            f"{base:>9} {now:>9} {change:>8}  {row['status']}"
+        )
+    regressions = [row for row in rows if row["status"] == "regression"]
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time every scenario and write JSON results")
+    run_parser.add_argument("--config", default="testing")
+    run_parser.add_argument(
+        "--sizes", type=parse_size, nargs="+", default=[(1_000, 10_000), (10_000, 100_000)]
+    )
+    run_parser.add_argument("--repeat", type=int, default=20)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--output", default="benchmark-results.json")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15)
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare ingest throughput of ``POST /transactions`` and ``POST /transactions:batch``.
+
+    python -m benchmarks.transaction_ingest --rows 20000 --batch-size 2000
+
+Export ``DATABASE_URL`` and pass ``--config production`` to run against Postgres.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from flask.testing import FlaskClient
+
+from app import create_app
+from app.extensions import db
+from app.models import Client
+from app.models.transaction import SUPPORTED_CURRENCIES, TRANSACTION_TYPES
+
+
+def make_payloads(client_ids: list[int], count: int, seed: int) -> list[dict[str, object]]:
+    """Build ``count`` random transaction payloads spread over ``client_ids``."""
+
+    rng = random.Random(seed)
+    return [
+        {
+            "client_id": rng.choice(client_ids),
+            "amount": str(Decimal(rng.randint(100, 1_000_000)) / 100),
+            "currency": rng.choice(SUPPORTED_CURRENCIES),
+            "type": rng.choice(TRANSACTION_TYPES),
+            "description": "benchmark",
+        }
+        for _ in range(count)
+    ]
+
+
+def ingest_single(http: FlaskClient, payloads: list[dict[str, object]]) -> float:
+    """Post every payload on its own and return the elapsed seconds."""
+
+    started = time.perf_counter()
+    for payload in payloads:
+        response = http.post("/api/v1/transactions", json=payload)
+        assert response.status_code == 201, response.get_json()
+    return time.perf_counter() - started
+
+
+def ingest_batch(http: FlaskClient, payloads: list[dict[str, object]], batch_size: int) -> float:
+    """Post the payloads in chunks of ``batch_size`` and return the elapsed seconds."""
+
+    started = time.perf_counter()
+    for start in range(0, len(payloads), batch_size):
+        chunk = payloads[start : start + batch_size]
+        response = http.post("/api/v1/transactions:batch", json=chunk)
+        assert response.get_json()["failed"] == 0, response.get_json()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--single-rows", type=int, default=2_000)
+    parser.add_argument("--batch-size", type=int, default=2_000)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        db.create_all()
+        clients = [
+            Client(name=f"Ingest {i}", email=f"ingest-{args.seed}-{i}@example.com")
+            for i in range(args.clients)
+        ]
+        db.session.add_all(clients)
+        db.session.commit()
+        client_ids = [client.id for client in clients]
+
+        http = app.test_client()
+        single = ingest_single(http, make_payloads(client_ids, args.single_rows, args.seed))
+        batch = ingest_batch(http, make_payloads(client_ids, args.rows, args.seed), args.batch_size)
+
+    print(f"{'mode':<10} {'rows':>8} {'seconds':>9} {'rows/sec':>10}")
+    print(f"{'single':<10} {args.single_rows:>8} {single:>9.2f} {args.single_rows / single:>10.0f}")
+    print(f"{'batch':<10} {args.rows:>8} {batch:>9.2f} {args.rows / batch:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Gunicorn settings picked up automatically from the working directory."""
+from __future__ import annotations
+
+import gc
+import os
+
+# Threaded workers keep heartbeating while a thread streams a long export,
+# so multi-minute NDJSON/CSV downloads are not killed by the worker timeout.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+# Build the app once in the master; workers share its memory copy-on-write.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes", "on")
+
+
+def reset_multiproc_dir() -> None:
+    """Start every run with an empty Prometheus multiprocess directory.
+
+    Runs when gunicorn reads this file, before a preloaded app imports
+    :mod:`app.metrics` and opens its sample files there. The marker keeps a
+    ``HUP`` reload from deleting the files of workers that are still alive.
+    """
+
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not directory or os.environ.get("GUNICORN_MULTIPROC_DIR_READY"):
+        return
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.environ["GUNICORN_MULTIPROC_DIR_READY"] = "1"
+
+
+reset_multiproc_dir()
+
+
+def when_ready(_server: object) -> None:
+    """Move the preloaded objects out of the GC's reach before any worker forks.
+
+    A collection in a worker would otherwise touch, and so copy, every page
+    holding the objects the master created.
+    """
+
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server: object, _worker: object) -> None:
+    """Give each worker its own database connections when the app was preloaded."""
+
+    application = getattr(server.app, "callable", None)  # type: ignore[attr-defined]
+    if application is not None:
+        from app.startup import after_fork
+
+        after_fork(application)
+
+
+def child_exit(_server: object, worker: object) -> None:
+    """Drop the live gauges of a worker that exited."""
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)  # type: ignore[attr-defined]
@@ -0,0 +1,59 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:37:25.356366
+
+The ``clients`` and ``transactions`` tables as ``db.create_all()`` built
+them before migrations existed; mark such databases with
+``flask db stamp 0001`` before upgrading.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+transaction_types = sa.Enum("DEBIT", "CREDIT", name="transaction_types")
+
+
+def upgrade():
+    op.create_table(
+        "clients",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+        sa.UniqueConstraint("email", name="uq_clients_email"),
+    )
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("type", transaction_types, nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.CheckConstraint("amount > 0", name="ck_transactions_amount_positive"),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_transactions_client_id", "transactions", ["client_id"])
+
+
+def downgrade():
+    op.drop_index("ix_transactions_client_id", table_name="transactions")
+    op.drop_table("transactions")
+    op.drop_table("clients")
+    transaction_types.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,65 @@
+"""Query indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:37:44.601115
+
+Composite indexes matching the listing shapes (filter by client, order by
+``created_at DESC, id DESC``; date ranges and keyset cursors) and pg_trgm
+GIN indexes for the client name/email ``ILIKE`` search. On Postgres the
+indexes are built ``CONCURRENTLY`` so large tables stay writable.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+BTREE_INDEXES = (
+    ("ix_transactions_client_id_created_at_id", "transactions", ["client_id", "created_at", "id"]),
+    ("ix_transactions_created_at_id", "transactions", ["created_at", "id"]),
+    ("ix_clients_created_at_id", "clients", ["created_at", "id"]),
+)
+TRIGRAM_INDEXES = (
+    ("ix_clients_name_trgm", "clients", "name"),
+    ("ix_clients_email_trgm", "clients", "email"),
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        for name, table, columns in BTREE_INDEXES:
+            op.create_index(name, table, columns)
+        op.drop_index("ix_transactions_client_id", table_name="transactions")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, columns in BTREE_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+        # The composite index leads with client_id, so the single-column one is redundant.
+        op.drop_index(
+            "ix_transactions_client_id", table_name="transactions", postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    op.create_index("ix_transactions_client_id", "transactions", ["client_id"])
+    if is_postgres:
+        for name, table, _ in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name=table)
+    for name, table, _ in reversed(BTREE_INDEXES):
+        op.drop_index(name, table_name=table)
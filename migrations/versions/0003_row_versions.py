@@ -0,0 +1,32 @@
+"""Row versions
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:05:12.418230
+
+Adds the ``version`` column the ORM bumps on every update. Existing rows
+start at 1; the server default also covers Core bulk inserts.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ("clients", "transactions"):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False)
+            )
+
+
+def downgrade():
+    for table in ("transactions", "clients"):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column("version")
@@ -0,0 +1,137 @@
+"""Partition transactions by month
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:02:18.551904
+
+Opt-in: only runs on Postgres with ``TRANSACTIONS_PARTITIONING=monthly`` in
+the environment, and is a no-op otherwise. ``transactions`` becomes a table
+partitioned by ``RANGE (created_at)`` with one partition per UTC month, from
+the oldest row to ``TRANSACTIONS_PARTITION_MONTHS_AHEAD`` (default 3) months
+ahead. The primary key becomes ``(id, created_at)``, as Postgres requires
+the partition key in it; ids keep coming from the same sequence.
+
+Existing rows are copied with a single ``INSERT ... SELECT`` while the table
+is locked, so on large tables run it in a maintenance window.
+"""
+import os
+from datetime import UTC, date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, client_id, amount, currency, type, description, created_at, version"
+INDEXES = (
+    ("ix_transactions_client_id_created_at_id", "client_id, created_at, id"),
+    ("ix_transactions_created_at_id", "created_at, id"),
+)
+
+
+def _enabled():
+    return (
+        op.get_bind().dialect.name == "postgresql"
+        and os.environ.get("TRANSACTIONS_PARTITIONING", "").lower() == "monthly"
+    )
+
+
+def _is_partitioned():
+    return op.get_bind().scalar(
+        sa.text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass('transactions'))"
+        )
+    )
+
+
+def _add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_table(name, partitioned):
+    primary_key = "id, created_at" if partitioned else "id"
+    suffix = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(
+        f"""
+        CREATE TABLE {name} (
+            id integer NOT NULL DEFAULT nextval('transactions_id_seq'),
+            client_id integer NOT NULL REFERENCES clients (id) ON DELETE CASCADE,
+            amount numeric(12, 2) NOT NULL,
+            currency varchar(3) NOT NULL,
+            type transaction_types NOT NULL,
+            description varchar(255),
+            created_at timestamp with time zone NOT NULL DEFAULT now(),
+            version integer NOT NULL DEFAULT 1,
+            CONSTRAINT ck_transactions_amount_positive CHECK (amount > 0),
+            CONSTRAINT {name}_pkey PRIMARY KEY ({primary_key})
+        ){suffix}
+        """
+    )
+
+
+def _swap_in(old, new):
+    """Move the rows of ``old`` into ``new``, drop ``old`` and give ``new`` its name."""
+
+    op.execute(f"INSERT INTO {new} ({COLUMNS}) SELECT {COLUMNS} FROM {old}")
+    op.execute(f"ALTER SEQUENCE transactions_id_seq OWNED BY {new}.id")
+    op.execute(f"DROP TABLE {old}")
+    op.execute(f"ALTER TABLE {new} RENAME TO transactions")
+    op.execute(f"ALTER INDEX {new}_pkey RENAME TO transactions_pkey")
+    op.execute(
+        f"ALTER TABLE transactions RENAME CONSTRAINT {new}_client_id_fkey "
+        "TO transactions_client_id_fkey"
+    )
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON transactions ({columns})")
+    op.execute("ANALYZE transactions")
+
+
+def upgrade():
+    if not _enabled() or _is_partitioned():
+        return
+
+    op.execute("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE")
+    _create_table("transactions_partitioned", partitioned=True)
+
+    oldest, newest = op.get_bind().execute(
+        sa.text("SELECT min(created_at), max(created_at) FROM transactions")
+    ).one()
+    today = datetime.now(UTC).date()
+    month = (oldest.astimezone(UTC).date() if oldest else today).replace(day=1)
+    months_ahead = int(os.environ.get("TRANSACTIONS_PARTITION_MONTHS_AHEAD", 3))
+    last = _add_months(today.replace(day=1), months_ahead)
+    if newest is not None:
+        last = max(last, newest.astimezone(UTC).date().replace(day=1))
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE transactions_y{month.year:04d}m{month.month:02d} "
+            "PARTITION OF transactions_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{upper.isoformat()} 00:00:00+00')"
+        )
+        month = upper
+
+    # Free the index names for the new table before dropping the old one.
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX {name}")
+    _swap_in("transactions", "transactions_partitioned")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql" or not _is_partitioned():
+        return
+
+    # Rows of partitions already detached by ``flask partitions archive`` are not restored.
+    op.execute("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE")
+    _create_table("transactions_plain", partitioned=False)
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX {name}")
+    _swap_in("transactions", "transactions_plain")
@@ -0,0 +1,41 @@
+"""Client daily totals
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:48:06.270415
+
+Rollup of DEBIT/CREDIT totals per client, UTC day and currency behind
+``GET /api/v1/transactions/stats``. The service layer keeps it current from
+now on; fill it for existing rows with ``flask rollups rebuild``.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "client_daily_totals",
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("credit_total", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("debit_total", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("client_id", "day", "currency"),
+    )
+    op.create_index(
+        "ix_client_daily_totals_day_currency", "client_daily_totals", ["day", "currency"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_client_daily_totals_day_currency", table_name="client_daily_totals")
+    op.drop_table("client_daily_totals")
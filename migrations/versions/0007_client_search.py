@@ -0,0 +1,74 @@
+"""Client full-text search
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 14:21:37.804112
+
+Backs ``GET /api/v1/clients?q=``. On Postgres, adds the generated
+``clients.search_vector`` column and its GIN index; adding a stored
+generated column rewrites the table, so run it in a maintenance window on
+large tables. On SQLite, creates the ``clients_fts`` FTS5 table, its sync
+triggers, and indexes the existing rows.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', name), 'A') || "
+    "setweight(to_tsvector('simple', translate(email, '@.+_-', '     ')), 'B')"
+)
+SQLITE_TRIGGERS = {
+    "clients_fts_insert": (
+        "AFTER INSERT ON clients BEGIN "
+        "INSERT INTO clients_fts (rowid, name, email) VALUES (new.id, new.name, new.email); "
+        "END"
+    ),
+    "clients_fts_delete": (
+        "AFTER DELETE ON clients BEGIN "
+        "INSERT INTO clients_fts (clients_fts, rowid, name, email) "
+        "VALUES ('delete', old.id, old.name, old.email); "
+        "END"
+    ),
+    "clients_fts_update": (
+        "AFTER UPDATE OF name, email ON clients BEGIN "
+        "INSERT INTO clients_fts (clients_fts, rowid, name, email) "
+        "VALUES ('delete', old.id, old.name, old.email); "
+        "INSERT INTO clients_fts (rowid, name, email) VALUES (new.id, new.name, new.email); "
+        "END"
+    ),
+}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE clients ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        )
+        op.execute("CREATE INDEX ix_clients_search_vector ON clients USING gin (search_vector)")
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE clients_fts "
+            "USING fts5(name, email, content='clients', content_rowid='id')"
+        )
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER {name} {body}")
+        op.execute("INSERT INTO clients_fts (clients_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX ix_clients_search_vector")
+        op.execute("ALTER TABLE clients DROP COLUMN search_vector")
+    elif dialect == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER {name}")
+        op.execute("DROP TABLE clients_fts")
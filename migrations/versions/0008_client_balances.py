@@ -0,0 +1,36 @@
+"""Client balances
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:05:12.418390
+
+DEBIT/CREDIT totals per client and currency behind
+``GET /api/v1/clients/<id>/balance``. The service layer keeps it current
+from now on; fill it for existing rows with ``flask balances rebuild``.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "client_balances",
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("credit_total", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("debit_total", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("client_id", "currency"),
+    )
+
+
+def downgrade():
+    op.drop_table("client_balances")
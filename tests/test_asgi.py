@@ -0,0 +1,85 @@
+"""Tests for the ASGI deployment mode."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("aiosqlite")
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from app.asgi import create_asgi_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+@pytest.fixture()
+def asgi_client() -> Generator[TestClient, None, None]:
+    application = create_asgi_app("testing")
+
+    async def create_schema() -> None:
+        async with application.state.engine.begin() as connection:
+            await connection.run_sync(db.metadata.create_all)
+
+    asyncio.run(create_schema())
+    with TestClient(application) as http:
+        yield http
+
+
+def test_asgi_client_and_transaction_flow(asgi_client: TestClient) -> None:
+    response = asgi_client.post(
+        "/api/v1/clients", json={"name": "Ana", "email": "ana@example.com"}
+    )
+    assert response.status_code == 201
+    client_id = response.json()["id"]
+    search = asgi_client.get("/api/v1/clients", params={"q": "an"}).json()
+    assert [item["id"] for item in search["items"]] == [client_id]
+
+    payload = {"client_id": client_id, "amount": "10.50", "currency": "MXN", "type": "CREDIT"}
+    headers = {"Idempotency-Key": "asgi-1"}
+    response = asgi_client.post("/api/v1/transactions", json=payload, headers=headers)
+    assert response.status_code == 201
+    transaction_id = response.json()["id"]
+    replay = asgi_client.post("/api/v1/transactions", json=payload, headers=headers)
+    assert replay.json() == response.json()
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+    response = asgi_client.get(f"/api/v1/transactions/{transaction_id}")
+    assert response.status_code == 200
+    assert response.json()["amount"] == "10.50"
+    assert response.headers["ETag"]
+
+    listing = asgi_client.get(f"/api/v1/clients/{client_id}/transactions").json()
+    assert [item["id"] for item in listing["items"]] == [transaction_id]
+    expanded = asgi_client.get(f"/api/v1/clients/{client_id}?expand=transactions").json()
+    assert [item["id"] for item in expanded["transactions"]] == [transaction_id]
+    expanded = asgi_client.get("/api/v1/transactions?expand=client").json()
+    assert expanded["items"][0]["client"]["id"] == client_id
+    sparse = asgi_client.get("/api/v1/transactions", params={"fields": "id,amount"}).json()
+    assert sparse["items"] == [{"id": transaction_id, "amount": "10.50"}]
+
+    balances = asgi_client.get(f"/api/v1/clients/{client_id}/balance").json()
+    assert balances["balances"][0]["balance"] == "10.50"
+
+    assert asgi_client.delete(f"/api/v1/clients/{client_id}").status_code == 204
+    assert asgi_client.get(f"/api/v1/transactions/{transaction_id}").status_code == 404
+
+
+def test_asgi_reports_errors_like_wsgi(asgi_client: TestClient) -> None:
+    asgi_client.post("/api/v1/clients", json={"name": "Ana", "email": "ana@example.com"})
+
+    duplicate = asgi_client.post(
+        "/api/v1/clients", json={"name": "Otra", "email": "ana@example.com"}
+    )
+    assert duplicate.status_code == 409
+    assert duplicate.json()["field"] == "email"
+
+    invalid = asgi_client.post("/api/v1/clients", json={"name": "", "email": "nope"})
+    assert invalid.status_code == 400
+    assert "errors" in invalid.json()
+
+    missing = asgi_client.get("/api/v1/clients/999")
+    assert missing.status_code == 404
+    assert missing.json()["entity"] == "client"
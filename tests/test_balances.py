@@ -0,0 +1,76 @@
+"""Tests for client balances."""
+from __future__ import annotations
+
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import delete
+
+from app.extensions import db
+from app.models import ClientBalance
+
+
+def create_client(client: FlaskClient, name: str, email: str) -> int:
+    response = client.post("/api/v1/clients", json={"name": name, "email": email})
+    return response.get_json()["id"]
+
+
+def create_transaction(client: FlaskClient, client_id: int, amount: str, currency: str, kind: str):
+    return client.post(
+        "/api/v1/transactions",
+        json={"client_id": client_id, "amount": amount, "currency": currency, "type": kind},
+    ).get_json()
+
+
+def balances_by_currency(client: FlaskClient, client_id: int) -> dict[str, dict]:
+    response = client.get(f"/api/v1/clients/{client_id}/balance")
+    assert response.status_code == 200
+    return {entry["currency"]: entry for entry in response.get_json()["balances"]}
+
+
+def test_balance_follows_create_update_delete(client: FlaskClient) -> None:
+    client_id = create_client(client, "Liam", "liam@example.com")
+    create_transaction(client, client_id, "100.00", "USD", "CREDIT")
+    debit = create_transaction(client, client_id, "30.00", "USD", "DEBIT")
+    create_transaction(client, client_id, "5.00", "EUR", "DEBIT")
+
+    balances = balances_by_currency(client, client_id)
+    assert balances["USD"]["balance"] == "70.00"
+    assert balances["USD"]["transaction_count"] == 2
+    assert balances["EUR"]["balance"] == "-5.00"
+
+    client.put(f"/api/v1/transactions/{debit['id']}", json={"amount": "40.00", "currency": "EUR"})
+    balances = balances_by_currency(client, client_id)
+    assert balances["USD"]["balance"] == "100.00"
+    assert balances["EUR"]["debit_total"] == "45.00"
+
+    client.delete(f"/api/v1/transactions/{debit['id']}")
+    balances = balances_by_currency(client, client_id)
+    assert balances["EUR"]["balance"] == "-5.00"
+    assert balances["EUR"]["transaction_count"] == 1
+
+
+def test_balance_tracks_batch_and_missing_client(client: FlaskClient) -> None:
+    client_id = create_client(client, "Mia", "mia@example.com")
+    client.post(
+        "/api/v1/transactions:batch",
+        json=[
+            {"client_id": client_id, "amount": "10.00", "currency": "MXN", "type": "CREDIT"},
+            {"client_id": client_id, "amount": "15.00", "currency": "MXN", "type": "CREDIT"},
+        ],
+    )
+    assert balances_by_currency(client, client_id)["MXN"]["credit_total"] == "25.00"
+    assert client.get("/api/v1/clients/9999/balance").status_code == 404
+
+
+def test_rebuild_balances_command(app: Flask, client: FlaskClient) -> None:
+    first = create_client(client, "Noah", "noah@example.com")
+    second = create_client(client, "Olga", "olga@example.com")
+    create_transaction(client, first, "12.50", "USD", "CREDIT")
+    create_transaction(client, second, "7.25", "USD", "DEBIT")
+    db.session.execute(delete(ClientBalance))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["balances", "rebuild", "--chunk-size", "1"])
+    assert "2 clients" in result.output
+    assert balances_by_currency(client, first)["USD"]["balance"] == "12.50"
+    assert balances_by_currency(client, second)["USD"]["balance"] == "-7.25"
@@ -0,0 +1,46 @@
+"""Tests for the benchmark data generator and result comparison."""
+from __future__ import annotations
+
+from collections import Counter
+
+from benchmarks.datagen import REFERENCE_TIME, DatasetSpec, transaction_rows
+from benchmarks.suite import compare_results
+
+
+def test_transaction_rows_are_seeded_and_skewed() -> None:
+    spec = DatasetSpec(clients=100, transactions=5_000, seed=7)
+    client_ids = list(range(1, 101))
+
+    rows = transaction_rows(spec, client_ids, REFERENCE_TIME)
+    assert rows == transaction_rows(spec, client_ids, REFERENCE_TIME)
+
+    per_client = Counter(row["client_id"] for row in rows)
+    top_ten = sum(count for _, count in per_client.most_common(10))
+    assert top_ten > len(rows) / 2
+    assert Counter(row["currency"] for row in rows).most_common(1)[0][0] == "MXN"
+    assert all(row["created_at"] <= REFERENCE_TIME for row in rows)
+
+
+def test_compare_results_flags_regressions() -> None:
+    def run(**medians: float) -> dict[str, object]:
+        return {
+            "results": [
+                {"size": "s", "scenario": name, "median_ms": median}
+                for name, median in medians.items()
+            ]
+        }
+
+    rows = compare_results(
+        run(slower=10.0, faster=10.0, jitter=0.2, gone=1.0),
+        run(slower=13.0, faster=5.0, jitter=0.4, added=1.0),
+        threshold=0.15,
+        min_delta_ms=0.5,
+    )
+    status = {row["scenario"]: row["status"] for row in rows}
+    assert status == {
+        "slower": "regression",
+        "faster": "improvement",
+        "jitter": "ok",
+        "added": "new",
+        "gone": "missing",
+    }
@@ -0,0 +1,125 @@
+"""Tests for the entity cache."""
+from __future__ import annotations
+
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app.cache import EntityCache, InMemoryStore, LRUCache, SharedCache
+from app.extensions import db
+from app.models import Client
+from app.services import ClientService, TransactionService
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_expires_and_evicts() -> None:
+    clock = FakeClock()
+    cache = LRUCache(max_size=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_get_client_reads_through_cache(app: Flask, session) -> None:
+    cache = EntityCache(LRUCache(max_size=10, ttl=60))
+    service = ClientService(cache=cache)
+    client = Client(name="Pia", email="pia@example.com")
+    session.add(client)
+    session.commit()
+
+    assert service.get_client(client.id).name == "Pia"
+    session.remove()
+    assert service.get_client(client.id).name == "Pia"
+    assert cache.stats.as_dict()["hits"] == 1
+
+    service.update_client(client.id, {"name": "Pia Updated"})
+    session.remove()
+    assert service.get_client(client.id).name == "Pia Updated"
+    assert cache.stats.misses == 2
+
+
+def test_client_delete_invalidates_cached_transactions(client: FlaskClient) -> None:
+    cache = EntityCache(SharedCache(InMemoryStore(), ttl=60))
+    client_id = client.post(
+        "/api/v1/clients", json={"name": "Quin", "email": "quin@example.com"}
+    ).get_json()["id"]
+    txn_id = client.post(
+        "/api/v1/transactions",
+        json={"client_id": client_id, "amount": "3.00", "currency": "USD", "type": "DEBIT"},
+    ).get_json()["id"]
+
+    transactions = TransactionService(cache=cache)
+    assert transactions.get_transaction(txn_id).amount == 3
+    ClientService(cache=cache).delete_client(client_id)
+    db.session.remove()
+    assert cache.get("transaction", txn_id) is None
+
+
+def test_cache_stats_endpoint(client: FlaskClient) -> None:
+    client_id = client.post(
+        "/api/v1/clients", json={"name": "Rae", "email": "rae@example.com"}
+    ).get_json()["id"]
+    client.get(f"/api/v1/clients/{client_id}")
+    client.get(f"/api/v1/clients/{client_id}")
+
+    stats = client.get("/health/cache").get_json()
+    assert stats["enabled"] is True
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_get_clients_serves_hits_from_cache_and_loads_misses_together(
+    app: Flask, session
+) -> None:
+    cache = EntityCache(LRUCache(max_size=10, ttl=60))
+    service = ClientService(cache=cache)
+    clients = [Client(name=f"Multi {i}", email=f"multi{i}@example.com") for i in range(3)]
+    session.add_all(clients)
+    session.commit()
+    ids = [client.id for client in clients]
+    service.get_client(ids[1])
+    session.remove()
+
+    result = service.get_clients([ids[2], ids[1], 999, ids[0], ids[2]])
+
+    assert [client.name for client in result["items"]] == ["Multi 2", "Multi 1", "Multi 0"]
+    assert result["missing"] == [999]
+    assert cache.stats.hits == 1
+    session.remove()
+    assert service.get_clients(ids)["missing"] == []
+    assert cache.stats.hits == 4
+
+
+def test_generation_is_read_once_per_lookup(app: Flask, session) -> None:
+    class CountingStore(InMemoryStore):
+        reads = 0
+
+        def get(self, key: str) -> bytes | None:
+            self.reads += 1
+            return super().get(key)
+
+    store = CountingStore()
+    service = ClientService(cache=EntityCache(SharedCache(store, ttl=60)))
+    clients = [Client(name=f"Gen {i}", email=f"gen{i}@example.com") for i in range(3)]
+    session.add_all(clients)
+    session.commit()
+    ids = [client.id for client in clients]
+
+    service.get_client(ids[0])
+    assert store.reads == 2
+    store.reads = 0
+    service.get_clients(ids)
+    assert store.reads == 1 + len(ids)
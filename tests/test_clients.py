@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from flask.testing import FlaskClient
+from sqlalchemy import event
 
 from app.extensions import db
 from app.models import Client
@@ -76,3 +77,238 @@ def test_delete_client_cascades_transactions(client: FlaskClient, session) -> No
     assert txn_list.status_code == 200
     assert txn_list.get_json()["total"] == 0
 
+
+def test_list_clients_filter_is_parameterized(client: FlaskClient, session) -> None:
+    session.add_all(
+        [
+            Client(name="100% Real", email="real@example.com"),
+            Client(name="1000 Fake", email="fake@example.com"),
+        ]
+    )
+    db.session.commit()
+    response = client.get("/api/v1/clients", query_string={"name": "0%"})
+    assert response.status_code == 200
+    assert [item["name"] for item in response.get_json()["items"]] == ["100% Real"]
+
+    response = client.get("/api/v1/clients", query_string={"name": "' OR '1'='1"})
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 0
+
+
+def test_list_clients_rejects_out_of_range_pages(client: FlaskClient) -> None:
+    for params in ({"per_page": -1}, {"per_page": 501}, {"page": 0}, {"q": "a", "page": -2}):
+        assert client.get("/api/v1/clients", query_string=params).status_code == 400
+
+
+def test_list_clients_cursor_without_total(client: FlaskClient, session) -> None:
+    session.add_all([Client(name=f"Client {i}", email=f"c{i}@example.com") for i in range(5)])
+    db.session.commit()
+
+    names = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/api/v1/clients", query_string={"cursor": cursor, "per_page": 2})
+        data = response.get_json()
+        assert data["total"] is None
+        names.extend(item["name"] for item in data["items"])
+        cursor = data["next_cursor"]
+
+    assert names == [f"Client {i}" for i in reversed(range(5))]
+
+    response = client.get("/api/v1/clients", query_string={"include_total": "false"})
+    data = response.get_json()
+    assert data["total"] is None
+    assert len(data["items"]) == 5
+
+
+def test_get_client_conditional_request(client: FlaskClient) -> None:
+    client_id = client.post(
+        "/api/v1/clients", json={"name": "Sam", "email": "sam@example.com"}
+    ).get_json()["id"]
+
+    first = client.get(f"/api/v1/clients/{client_id}")
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    cached = client.get(f"/api/v1/clients/{client_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    client.put(f"/api/v1/clients/{client_id}", json={"name": "Samuel"})
+    changed = client.get(f"/api/v1/clients/{client_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_list_clients_weak_etag(client: FlaskClient) -> None:
+    client.post("/api/v1/clients", json={"name": "Tess", "email": "tess@example.com"})
+    etag = client.get("/api/v1/clients").headers["ETag"]
+    assert etag.startswith("W/")
+
+    cached = client.get("/api/v1/clients", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    filtered = client.get("/api/v1/clients?name=Tess", headers={"If-None-Match": etag})
+    assert filtered.status_code == 200
+
+    client.post("/api/v1/clients", json={"name": "Uma", "email": "uma@example.com"})
+    assert client.get("/api/v1/clients", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_search_clients_ranks_prefix_matches(client: FlaskClient, session) -> None:
+    session.add_all(
+        [
+            Client(name="Ana López", email="ana.lopez@example.com"),
+            Client(name="Bruno Díaz", email="bruno@example.com"),
+            Client(name="Mariana Ruiz", email="mruiz@example.com"),
+        ]
+    )
+    db.session.commit()
+
+    response = client.get("/api/v1/clients", query_string={"q": "ana lóp"})
+    assert [item["name"] for item in response.get_json()["items"]] == ["Ana López"]
+
+    bruno = db.session.query(Client).filter_by(email="bruno@example.com").one()
+    client.put(f"/api/v1/clients/{bruno.id}", json={"name": "Bruno Anaya"})
+    data = client.get("/api/v1/clients", query_string={"q": "ana"}).get_json()
+    assert data["total"] == 2
+    assert {item["name"] for item in data["items"]} == {"Ana López", "Bruno Anaya"}
+
+    response = client.get("/api/v1/clients", query_string={"q": "\" OR 1=1 --*"})
+    assert response.get_json()["total"] == 0
+    assert client.get("/api/v1/clients", query_string={"q": "*&!"}).status_code == 400
+    response = client.get("/api/v1/clients", query_string={"q": "ana", "cursor": ""})
+    assert response.get_json()["field"] == "cursor"
+
+
+def test_import_clients_csv_upserts_and_reports_errors(
+    client: FlaskClient, session, app
+) -> None:
+    app.config["CLIENT_IMPORT_CHUNK_SIZE"] = 2
+    session.add(Client(name="Old Name", email="ana@example.com"))
+    db.session.commit()
+    existing = client.get("/api/v1/clients").get_json()["items"][0]
+    body = (
+        "name,email\n"
+        "Ana Nueva,ana@example.com\n"
+        "Bruno,not-an-email\n"
+        "Carla,carla@example.com\n"
+        "Carla Dup,carla@example.com\n"
+        "Dora,dora@example.com,extra\n"
+    )
+
+    response = client.post("/api/v1/clients:import", data=body, content_type="text/csv")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert {key: data[key] for key in ("received", "created", "updated", "skipped", "failed")} == {
+        "received": 5,
+        "created": 1,
+        "updated": 1,
+        "skipped": 1,
+        "failed": 2,
+    }
+    assert [error["line"] for error in data["errors"]] == [3, 6]
+    assert "email" in data["errors"][0]["errors"]
+    renamed = client.get(f"/api/v1/clients/{existing['id']}")
+    assert renamed.get_json()["name"] == "Ana Nueva"
+    assert renamed.headers["ETag"] == f'"client-{existing["id"]}-2"'
+    names = {item["name"] for item in client.get("/api/v1/clients").get_json()["items"]}
+    assert names == {"Ana Nueva", "Carla Dup"}
+
+
+def test_import_clients_ndjson_ignore(client: FlaskClient, session) -> None:
+    session.add(Client(name="Keep", email="keep@example.com"))
+    db.session.commit()
+    body = (
+        '{"name": "Changed", "email": "keep@example.com"}\n'
+        "\n"
+        "{not json\n"
+        '{"name": "Eva", "email": "eva@example.com"}\n'
+    )
+
+    response = client.post(
+        "/api/v1/clients:import?on_conflict=ignore",
+        data=body,
+        content_type="application/x-ndjson",
+    )
+
+    data = response.get_json()
+    assert (data["created"], data["updated"], data["skipped"], data["failed"]) == (1, 0, 1, 1)
+    assert data["errors"] == [{"line": 3, "errors": {"_schema": ["Invalid JSON."]}}]
+    names = {item["name"] for item in client.get("/api/v1/clients").get_json()["items"]}
+    assert names == {"Keep", "Eva"}
+
+    response = client.post("/api/v1/clients:import", data=body, content_type="text/plain")
+    assert response.status_code == 415
+
+
+def test_expand_transactions_embeds_latest_with_constant_queries(
+    client: FlaskClient, app
+) -> None:
+    ids = []
+    for index in range(4):
+        client_id = client.post(
+            "/api/v1/clients", json={"name": f"Exp {index}", "email": f"exp{index}@example.com"}
+        ).get_json()["id"]
+        ids.append(client_id)
+        for amount in range(1, index + 8):
+            client.post(
+                "/api/v1/transactions",
+                json={
+                    "client_id": client_id,
+                    "amount": f"{amount}.00",
+                    "currency": "MXN",
+                    "type": "CREDIT",
+                },
+            )
+    statements: list[str] = []
+
+    def capture(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        page = client.get("/api/v1/clients", query_string={"expand": "transactions"})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 3  # page, count, embedded transactions
+    items = page.get_json()["items"]
+    assert [len(item["transactions"]) for item in items] == [5, 5, 5, 5]
+    newest = items[0]["transactions"]
+    assert [txn["amount"] for txn in newest] == ["10.00", "9.00", "8.00", "7.00", "6.00"]
+
+    single = client.get(f"/api/v1/clients/{ids[0]}", query_string={"expand": "transactions"})
+    assert len(single.get_json()["transactions"]) == 5
+    assert single.headers["ETag"].startswith("W/")
+    client.post(
+        "/api/v1/transactions",
+        json={"client_id": ids[0], "amount": "99.00", "currency": "MXN", "type": "DEBIT"},
+    )
+    refreshed = client.get(
+        f"/api/v1/clients/{ids[0]}",
+        query_string={"expand": "transactions"},
+        headers={"If-None-Match": single.headers["ETag"]},
+    )
+    assert refreshed.status_code == 200
+    assert refreshed.get_json()["transactions"][0]["amount"] == "99.00"
+    assert client.get("/api/v1/clients?expand=balances").status_code == 400
+
+
+def test_sparse_fields_on_client_listing_and_item(client: FlaskClient) -> None:
+    client_id = client.post(
+        "/api/v1/clients", json={"name": "Mona Sparse", "email": "mona@example.com"}
+    ).get_json()["id"]
+
+    listed = client.get("/api/v1/clients", query_string={"fields": "name", "q": "mona"})
+    assert listed.get_json()["items"] == [{"name": "Mona Sparse"}]
+    assert listed.get_json()["total"] == 1
+
+    single = client.get(f"/api/v1/clients/{client_id}", query_string={"fields": "email,id"})
+    assert single.get_json() == {"id": client_id, "email": "mona@example.com"}
+
+    transactions = client.get(
+        f"/api/v1/clients/{client_id}/transactions", query_string={"fields": "nope"}
+    )
+    assert transactions.status_code == 400
@@ -0,0 +1,95 @@
+"""Tests for negotiated response compression."""
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+from collections.abc import Iterator
+
+from flask import Flask, Response
+from flask.testing import FlaskClient
+
+
+def create_transactions(client: FlaskClient, count: int) -> int:
+    response = client.post("/api/v1/clients", json={"name": "Zoe", "email": "zoe@example.com"})
+    client_id = response.get_json()["id"]
+    for index in range(count):
+        client.post(
+            "/api/v1/transactions",
+            json={
+                "client_id": client_id,
+                "amount": f"{index + 1}.00",
+                "currency": "MXN",
+                "type": "CREDIT",
+                "description": f"Payment {index}",
+            },
+        )
+    return client_id
+
+
+def test_large_list_is_compressed_with_the_preferred_coding(client: FlaskClient) -> None:
+    create_transactions(client, 30)
+    plain = client.get("/api/v1/transactions", query_string={"per_page": 50})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["Vary"] == "Accept-Encoding"
+
+    compressed = client.get(
+        "/api/v1/transactions",
+        query_string={"per_page": 50},
+        headers={"Accept-Encoding": "deflate, gzip;q=0.9"},
+    )
+    assert compressed.headers["Content-Encoding"] == "deflate"
+    assert compressed.headers["Vary"] == "Accept-Encoding"
+    assert int(compressed.headers["Content-Length"]) < len(plain.data) / 3
+    assert zlib.decompress(compressed.data) == plain.data
+    assert compressed.headers["ETag"] == plain.headers["ETag"]
+
+    refused = client.get(
+        "/api/v1/transactions",
+        query_string={"per_page": 50},
+        headers={"Accept-Encoding": "identity, gzip;q=0.5"},
+    )
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_small_bodies_and_strong_etags(app: Flask, client: FlaskClient) -> None:
+    create_transactions(client, 1)
+    headers = {"Accept-Encoding": "gzip"}
+    small = client.get("/api/v1/transactions/1", headers=headers)
+    assert "Content-Encoding" not in small.headers
+    assert not small.headers["ETag"].startswith("W/")
+
+    compressor = app.after_request_funcs[None][0]
+    with app.test_request_context(headers=headers):
+        response = Response(json.dumps({"padding": "x" * 4096}), mimetype="application/json")
+        response.set_etag("client-1-1")
+        response = compressor(response)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.get_data())) == {"padding": "x" * 4096}
+    assert response.headers["ETag"] == 'W/"client-1-1"'
+
+
+def test_streamed_export_is_compressed_incrementally(app: Flask, client: FlaskClient) -> None:
+    create_transactions(client, 5)
+    response = client.get("/api/v1/transactions/export", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = gzip.decompress(response.data).decode().splitlines()
+    assert [json.loads(line)["amount"] for line in lines] == [f"{n}.00" for n in range(1, 6)]
+
+    produced = []
+
+    def chunks() -> Iterator[bytes]:
+        for index in range(1000):
+            produced.append(index)
+            yield bytes(range(256)) * 64
+
+    compressor = app.after_request_funcs[None][0]
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        streamed = compressor(Response(chunks(), mimetype="application/x-ndjson"))
+    body = iter(streamed.response)
+    next(body)
+    assert len(produced) < 1000
+    rest = b"".join(body)
+    assert len(produced) == 1000
+    assert rest
@@ -0,0 +1,81 @@
+"""Tests for Idempotency-Key handling on transaction creation."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import func, select, update
+
+from app.extensions import db
+from app.models import IdempotencyKey, Transaction
+from app.models.base import utcnow
+
+
+def create_client(client: FlaskClient, name: str, email: str) -> int:
+    response = client.post("/api/v1/clients", json={"name": name, "email": email})
+    return response.get_json()["id"]
+
+
+def post_transaction(client: FlaskClient, payload: dict, key: str):
+    return client.post("/api/v1/transactions", json=payload, headers={"Idempotency-Key": key})
+
+
+def transaction_count() -> int:
+    return db.session.scalar(select(func.count()).select_from(Transaction))
+
+
+def test_replay_returns_original_response_without_creating_again(client: FlaskClient) -> None:
+    client_id = create_client(client, "Quinn", "quinn@example.com")
+    payload = {"client_id": client_id, "amount": "12.50", "currency": "MXN", "type": "CREDIT"}
+
+    first = post_transaction(client, payload, "order-1")
+    second = post_transaction(client, payload, "order-1")
+
+    assert first.status_code == second.status_code == 201
+    assert second.get_json() == first.get_json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert transaction_count() == 1
+    balance = client.get(f"/api/v1/clients/{client_id}/balance").get_json()["balances"][0]
+    assert balance["transaction_count"] == 1
+
+    reused = post_transaction(client, {**payload, "amount": "99.00"}, "order-1")
+    assert reused.status_code == 422
+    assert reused.get_json()["field"] == "Idempotency-Key"
+
+
+def test_failed_create_does_not_consume_the_key(client: FlaskClient) -> None:
+    payload = {"client_id": 9999, "amount": "5.00", "currency": "USD", "type": "DEBIT"}
+
+    response = post_transaction(client, payload, "retry-me")
+    assert response.status_code == 400
+    assert response.get_json()["field"] == "client_id"
+    assert db.session.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
+
+    client_id = create_client(client, "Rosa", "rosa@example.com")
+    response = post_transaction(client, {**payload, "client_id": client_id}, "retry-me")
+    assert response.status_code == 201
+
+
+def test_expired_keys_are_reused_and_purged(app: Flask, client: FlaskClient) -> None:
+    client_id = create_client(client, "Sam", "sam@example.com")
+    payload = {"client_id": client_id, "amount": "1.00", "currency": "EUR", "type": "DEBIT"}
+    assert post_transaction(client, payload, "old").status_code == 201
+    db.session.execute(
+        update(IdempotencyKey).values(expires_at=utcnow() - timedelta(seconds=1))
+    )
+    db.session.commit()
+
+    again = post_transaction(client, payload, "old")
+    assert again.status_code == 201
+    assert "Idempotent-Replayed" not in again.headers
+    assert transaction_count() == 2
+
+    db.session.execute(
+        update(IdempotencyKey).values(expires_at=utcnow() - timedelta(seconds=1))
+    )
+    db.session.commit()
+    result = app.test_cli_runner().invoke(args=["idempotency", "purge"])
+    assert "Removed 1 expired idempotency keys." in result.output
+    assert db.session.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
@@ -0,0 +1,71 @@
+"""Tests for the request instrumentation."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Generator
+
+import pytest
+from flask import Flask
+from sqlalchemy import select
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.instrumentation import statement_fingerprint
+from app.models import Client, Transaction
+
+
+@pytest.fixture()
+def instrumented_app(monkeypatch: pytest.MonkeyPatch) -> Generator[Flask, None, None]:
+    monkeypatch.setattr(TestingConfig, "REQUEST_INSTRUMENTATION", True)
+    monkeypatch.setattr(TestingConfig, "N_PLUS_ONE_THRESHOLD", 3)
+    application = create_app("testing")
+
+    @application.get("/clients-with-transactions")
+    def clients_with_transactions() -> dict[str, int]:
+        clients = db.session.scalars(select(Client)).all()
+        return {str(client.id): len(client.transactions) for client in clients}
+
+    with application.app_context():
+        db.create_all()
+        for index in range(4):
+            client = Client(name=f"Client {index}", email=f"client{index}@example.com")
+            client.transactions.append(
+                Transaction(amount=1, currency="MXN", type="CREDIT", description=None)
+            )
+            db.session.add(client)
+        db.session.commit()
+        db.session.remove()
+        yield application
+        db.session.remove()
+        db.drop_all()
+
+
+def test_server_timing_header(instrumented_app: Flask, caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.INFO, logger="app.instrumentation"):
+        response = instrumented_app.test_client().get("/api/v1/clients")
+
+    timing = response.headers["Server-Timing"]
+    assert 'sql;dur=' in timing
+    assert '"2 queries"' in timing
+    assert '"4 rows"' in timing
+    assert "serialize;dur=" in timing
+    assert any('"event": "request_metrics"' in record.message for record in caplog.records)
+
+
+def test_repeated_lazy_loads_are_reported(
+    instrumented_app: Flask, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.WARNING, logger="app.instrumentation"):
+        instrumented_app.test_client().get("/clients-with-transactions")
+
+    warnings = [record.getMessage() for record in caplog.records]
+    assert len(warnings) == 1
+    assert "ran 4 times" in warnings[0]
+    assert "FROM transactions" in warnings[0]
+
+
+def test_statement_fingerprint_ignores_values() -> None:
+    assert statement_fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3)") == statement_fingerprint(
+        "SELECT *\n FROM t WHERE id IN (?, ?)"
+    )
@@ -0,0 +1,67 @@
+"""Tests for the Prometheus metrics endpoint."""
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+
+def sample(body: str, name: str, labels: str = "") -> float:
+    match = re.search(rf"^{re.escape(name + labels)} (\S+)$", body, re.MULTILINE)
+    assert match is not None, f"{name}{labels} not exported"
+    return float(match.group(1))
+
+
+def test_metrics_endpoint_exports_request_metrics(client: FlaskClient) -> None:
+    before = client.get("/metrics").get_data(as_text=True)
+    route = '{method="GET",route="/api/v1/clients/<int:client_id>",status="404"}'
+    missing_before = sample(before, "http_requests_total", route) if route in before else 0.0
+
+    client.get("/api/v1/clients/999")
+    client.post("/api/v1/clients", json={"name": "Mia", "email": "mia@example.com"})
+    client.get("/api/v1/clients")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert sample(body, "http_requests_total", route) == missing_before + 1
+    assert "http_request_duration_seconds_bucket" in body
+    assert sample(body, "orm_rows_loaded_per_request_count") >= 3
+    assert "entity_cache_misses_total" in body
+
+
+def test_unhandled_errors_are_counted_as_500(app: Flask, client: FlaskClient) -> None:
+    def fail() -> str:
+        raise RuntimeError("boom")
+
+    app.add_url_rule("/boom", "boom", fail)
+    with pytest.raises(RuntimeError):
+        client.get("/boom")
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert sample(body, "http_requests_total", '{method="GET",route="/boom",status="500"}') >= 1
+
+
+def test_preloaded_app_imports_with_a_fresh_multiprocess_dir(tmp_path: Path) -> None:
+    directory = tmp_path / "prometheus"
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(directory)}
+    env.pop("GUNICORN_MULTIPROC_DIR_READY", None)
+    load_config = "import runpy; runpy.run_path('gunicorn.conf.py')"
+
+    def run(script: str) -> None:
+        root = Path(__file__).resolve().parent.parent
+        subprocess.run([sys.executable, "-c", script], cwd=root, env=env, check=True)
+
+    # What gunicorn does with preload_app: read its config file, then import the app.
+    run(f"{load_config}; import wsgi")
+    assert any(directory.iterdir())
+
+    run(load_config)
+    assert not any(directory.iterdir())
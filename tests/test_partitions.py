@@ -0,0 +1,101 @@
+"""Tests for the monthly partitioning of transactions.
+
+The Postgres test converts a scratch database with the migrations; set
+``POSTGRES_TEST_URL`` to run it.
+"""
+from __future__ import annotations
+
+import os
+from collections.abc import Generator
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import select, text
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, init_migrate
+from app.models import Transaction
+from app.services import PartitionService, TransactionService, ValidationError
+from app.services.partition_service import add_months, partition_ddl, partition_month
+
+POSTGRES_URL = os.environ.get("POSTGRES_TEST_URL")
+
+
+def test_month_helpers() -> None:
+    assert add_months(date(2025, 11, 20), 2) == date(2026, 1, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert partition_month("transactions_y2025m07") == date(2025, 7, 1)
+    assert partition_month("transactions_default") is None
+    assert partition_ddl(date(2025, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS transactions_y2025m12 PARTITION OF transactions "
+        "FOR VALUES FROM ('2025-12-01T00:00:00+00:00') TO ('2026-01-01T00:00:00+00:00')"
+    )
+
+
+def test_sqlite_is_never_partitioned(app: Flask) -> None:
+    service = PartitionService()
+    assert not service.is_partitioned()
+    with pytest.raises(ValidationError):
+        service.ensure_partitions()
+
+
+@pytest.fixture()
+def partitioned_app(monkeypatch: pytest.MonkeyPatch) -> Generator[Flask, None, None]:
+    monkeypatch.setenv("TRANSACTIONS_PARTITIONING", "monthly")
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", POSTGRES_URL)
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_ENGINE_OPTIONS", {})
+    application = create_app("testing")
+    init_migrate(application)
+    with application.app_context():
+        db.drop_all()
+        db.session.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        db.session.execute(text("DROP TYPE IF EXISTS transaction_types"))
+        db.session.commit()
+        upgrade()
+        yield application
+        db.session.remove()
+        downgrade(revision="base")
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="POSTGRES_TEST_URL is not set")
+def test_date_filters_prune_partitions(partitioned_app: Flask) -> None:
+    service = PartitionService()
+    assert service.is_partitioned()
+    created = service.ensure_partitions(since=date(2024, 1, 1), today=date(2024, 6, 15))
+    assert "transactions_y2024m03" in created
+
+    db.session.execute(text("INSERT INTO clients (name, email) VALUES ('P', 'p@example.com')"))
+    db.session.commit()
+    client_id = db.session.scalar(text("SELECT id FROM clients"))
+    for month in range(1, 7):
+        TransactionService().create_transaction(
+            {
+                "client_id": client_id,
+                "amount": Decimal("10.00"),
+                "currency": "USD",
+                "type": "CREDIT",
+                "created_at": datetime(2024, month, 10, tzinfo=UTC),
+            }
+        )
+
+    stmt = select(Transaction.id).where(
+        Transaction.created_at >= datetime(2024, 3, 1, tzinfo=UTC),
+        Transaction.created_at <= datetime(2024, 3, 31, tzinfo=UTC),
+    )
+    compiled = stmt.compile(db.engine)
+    plan = "\n".join(
+        db.session.connection()
+        .exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+        .scalars()
+    )
+    assert "transactions_y2024m03" in plan
+    assert "transactions_y2024m02" not in plan
+    assert "transactions_y2024m04" not in plan
+
+    archived = service.archive_partitions(before=date(2024, 3, 1), drop=True)
+    assert archived == ["transactions_y2024m01", "transactions_y2024m02"]
+    assert TransactionService().list_transactions()["total"] == 4
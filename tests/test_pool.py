@@ -0,0 +1,92 @@
+"""Tests for connection pool configuration and statistics."""
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import create_engine, exc, text
+
+from app.config import engine_options
+from app.pool import TimedQueuePool, pool_stats
+
+
+def test_engine_options_parse_environment() -> None:
+    options = engine_options(
+        "postgresql+psycopg://db/app",
+        {"DB_POOL_SIZE": "8", "DB_MAX_OVERFLOW": "2", "DB_PREPARE_THRESHOLD": "off"},
+    )
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == 8
+    assert options["max_overflow"] == 2
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"prepare_threshold": None}
+
+    assert "pool_size" not in engine_options("sqlite:///app.db", {})
+    assert engine_options("sqlite://", {"SQLALCHEMY_ENGINE_OPTIONS": '{"echo": true}'})["echo"]
+
+
+@pytest.mark.parametrize(
+    "environ",
+    [
+        {"DB_POOL_SIZE": "many"},
+        {"DB_POOL_SIZE": "0"},
+        {"DB_POOL_SIZE": "off"},
+        {"DB_MAX_OVERFLOW": "none"},
+        {"DB_POOL_TIMEOUT": "off"},
+        {"DB_POOL_RECYCLE": "off"},
+        {"SQLALCHEMY_ENGINE_OPTIONS": "[]"},
+    ],
+)
+def test_engine_options_reject_invalid_values(environ: dict[str, str]) -> None:
+    with pytest.raises(ValueError):
+        engine_options("postgresql+psycopg://db/app", environ)
+
+
+def test_pool_stats_track_checkouts(tmp_path: Path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool, pool_size=2
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 1
+        assert stats["overflow"] == 0
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["wait"]["count"] == 1
+    assert stats["wait"]["buckets"]["+Inf"] == 1
+    engine.dispose()
+
+
+def test_pool_wait_excludes_connection_setup(tmp_path: Path) -> None:
+    def slow_connect() -> sqlite3.Connection:
+        time.sleep(0.05)
+        return sqlite3.connect(tmp_path / "slow.db", check_same_thread=False)
+
+    engine = create_engine(
+        "sqlite://",
+        creator=slow_connect,
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    wait = pool_stats(engine)["wait"]
+    assert wait["count"] == 1
+    assert wait["buckets"]["5"] == 1
+    assert wait["timeouts"] == 1
+    engine.dispose()
+
+
+def test_pool_health_endpoint(client: FlaskClient) -> None:
+    response = client.get("/health/pool")
+    assert response.status_code == 200
+    assert "pid" in response.get_json()
@@ -0,0 +1,53 @@
+"""Tests for the readiness probe."""
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app.readiness import PingResult
+from app.startup import after_fork
+
+
+def test_first_probe_pings_before_answering(app: Flask, client: FlaskClient) -> None:
+    assert app.extensions["readiness"].last_ping is None
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["status"] == "ready"
+    assert payload["database"]["ok"] is True
+    assert payload["in_flight"] == 1
+
+
+def test_after_fork_starts_the_pinger(app: Flask) -> None:
+    monitor = app.extensions["readiness"]
+    monitor.interval = 3600
+    after_fork(app)
+    assert monitor._thread is not None and monitor._thread.is_alive()
+    deadline = time.monotonic() + 5
+    while monitor.last_ping is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert monitor.last_ping is not None and monitor.last_ping.ok
+
+
+def test_not_ready_on_slow_or_failed_ping(app: Flask, client: FlaskClient) -> None:
+    monitor = app.extensions["readiness"]
+    monitor.last_ping = PingResult(ok=True, latency_ms=10_000, checked_at=time.time())
+    payload = client.get("/health/ready").get_json()
+    assert payload["reasons"] == ["database ping is slow"]
+
+    with patch("app.readiness.db.engine.connect", side_effect=OSError("down")):
+        assert not monitor.ping().ok
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.get_json()["reasons"] == ["database ping failed"]
+
+
+def test_probe_does_not_query_the_database(app: Flask, client: FlaskClient) -> None:
+    app.extensions["readiness"].ping()
+    with patch("app.readiness.db.engine.connect") as connect:
+        assert client.get("/health/ready").status_code == 200
+    connect.assert_not_called()
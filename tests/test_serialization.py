@@ -0,0 +1,35 @@
+"""Tests for the compiled serializers."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from flask import Flask
+
+from app.models import Client, Transaction
+from app.schemas import ClientSchema, TransactionSchema, compiled_serializer
+
+
+def test_compiled_serializer_matches_schema_dump(app: Flask, session) -> None:
+    client = Client(name="Eva", email="eva@example.com")
+    session.add(client)
+    session.flush()
+    transaction = Transaction(
+        client_id=client.id, amount=Decimal("12.5"), currency="MXN", type="CREDIT"
+    )
+    session.add(transaction)
+    session.commit()
+
+    assert compiled_serializer(ClientSchema).dump(client) == ClientSchema().dump(client)
+    assert compiled_serializer(TransactionSchema).dump(transaction) == TransactionSchema().dump(
+        transaction
+    )
+
+
+def test_compiled_serializer_restricts_fields(app: Flask, session) -> None:
+    client = Client(name="Leo", email="leo@example.com")
+    session.add(client)
+    session.commit()
+
+    serializer = compiled_serializer(ClientSchema, ("id", "name"))
+    assert serializer.fields == ("id", "name")
+    assert serializer.dump(client) == {"id": client.id, "name": "Leo"}
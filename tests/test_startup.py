@@ -0,0 +1,35 @@
+"""Tests for the startup path: pre-rendered Swagger and fork handling."""
+from __future__ import annotations
+
+import gzip
+import json
+
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app.extensions import api, db
+from app.startup import after_fork
+
+
+def test_swagger_document_is_prerendered_and_compressed(client: FlaskClient) -> None:
+    plain = client.get("/api/v1/swagger.json")
+    assert plain.status_code == 200
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_json() == json.loads(json.dumps(api.__schema__))
+    assert "/transactions" in plain.get_json()["paths"]
+
+    compressed = client.get("/api/v1/swagger.json", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(compressed.data) == plain.data
+
+    cached = client.get("/api/v1/swagger.json", headers={"If-None-Match": plain.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_after_fork_drops_inherited_connections(app: Flask) -> None:
+    with db.engine.connect():
+        pass
+    pool = db.engine.pool
+    after_fork(app)
+    assert db.engine.pool is not pool
@@ -0,0 +1,102 @@
+"""Tests for the transaction volume rollups."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from flask.testing import FlaskClient
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import ClientDailyTotal
+from app.models.base import utcnow
+from app.services import StatsService
+
+
+def seed(client: FlaskClient) -> int:
+    client_id = client.post(
+        "/api/v1/clients", json={"name": "Sol", "email": "sol@example.com"}
+    ).get_json()["id"]
+    for amount, currency, kind in (
+        ("10.00", "MXN", "CREDIT"),
+        ("2.50", "MXN", "DEBIT"),
+        ("7.00", "USD", "CREDIT"),
+    ):
+        client.post(
+            "/api/v1/transactions",
+            json={"client_id": client_id, "amount": amount, "currency": currency, "type": kind},
+        )
+    return client_id
+
+
+def daily_totals() -> list[tuple]:
+    rows = db.session.scalars(select(ClientDailyTotal).order_by(ClientDailyTotal.currency))
+    return [
+        (
+            row.client_id,
+            row.day,
+            row.currency,
+            row.credit_total,
+            row.debit_total,
+            row.transaction_count,
+        )
+        for row in rows
+    ]
+
+
+def test_rollup_and_fallback_agree(client: FlaskClient) -> None:
+    client_id = seed(client)
+    midnight = datetime.combine(utcnow().date(), time.min)
+    query = {"client_id": client_id, "group_by": "day"}
+
+    rollup = client.get(
+        "/api/v1/transactions/stats",
+        query_string={
+            **query,
+            "start_date": midnight.isoformat(),
+            "end_date": (midnight + timedelta(days=1)).isoformat(),
+        },
+    ).get_json()
+    fallback = client.get(
+        "/api/v1/transactions/stats",
+        query_string={
+            **query,
+            "start_date": (midnight - timedelta(hours=1)).isoformat(),
+            "end_date": (midnight + timedelta(hours=25)).isoformat(),
+        },
+    ).get_json()
+
+    assert rollup["source"] == "rollup"
+    assert fallback["source"] == "transactions"
+    assert rollup["items"] == fallback["items"]
+    mxn = rollup["items"][0]
+    assert mxn["currency"] == "MXN"
+    assert Decimal(mxn["net"]) == Decimal("7.50")
+    assert mxn["transaction_count"] == 2
+
+
+def test_month_grouping_and_validation(client: FlaskClient) -> None:
+    seed(client)
+
+    response = client.get("/api/v1/transactions/stats", query_string={"group_by": "month"})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [item["period"] for item in body["items"]] == [
+        utcnow().date().replace(day=1).isoformat()
+    ] * 2
+
+    assert client.get("/api/v1/transactions/stats?group_by=week").status_code == 400
+
+
+def test_rebuild_matches_incremental_updates(client: FlaskClient) -> None:
+    client_id = seed(client)
+    transaction_id = client.get(
+        "/api/v1/transactions", query_string={"client_id": client_id}
+    ).get_json()["items"][0]["id"]
+    client.delete(f"/api/v1/transactions/{transaction_id}")
+    incremental = daily_totals()
+
+    StatsService().rebuild(chunk_size=1)
+
+    assert daily_totals() == incremental
+    assert sum(row[-1] for row in incremental) == 2
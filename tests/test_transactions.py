@@ -1,7 +1,17 @@
 """Tests for transaction endpoints."""
 from __future__ import annotations
 
+import csv
+import io
+import json
+
+import pytest
 from flask.testing import FlaskClient
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.services import TransactionService
 
 
 def create_client(client: FlaskClient, name: str, email: str) -> int:
@@ -41,6 +51,17 @@ def test_create_transaction_missing_client(client: FlaskClient) -> None:
     assert data["field"] == "client_id"
 
 
+def test_create_transaction_only_reports_foreign_key_errors_as_missing_client(
+    client: FlaskClient,
+) -> None:
+    client_id = create_client(client, "Owen", "owen@example.com")
+    # Bypasses the schema, so only the CHECK constraint rejects the amount.
+    with pytest.raises(IntegrityError):
+        TransactionService().create_transaction(
+            {"client_id": client_id, "amount": -5, "currency": "USD", "type": "DEBIT"}
+        )
+
+
 def test_update_transaction(client: FlaskClient) -> None:
     client_id = create_client(client, "Eve", "eve@example.com")
     create_resp = client.post(
@@ -86,3 +107,263 @@ def test_list_transactions_filters(client: FlaskClient) -> None:
     assert data["total"] == 1
     assert data["items"][0]["type"] == "DEBIT"
 
+
+def test_list_transactions_page_mode(client: FlaskClient) -> None:
+    client_id = create_client(client, "Gina", "gina@example.com")
+    for amount in ("1.00", "2.00", "3.00"):
+        client.post(
+            "/api/v1/transactions",
+            json={"client_id": client_id, "amount": amount, "currency": "USD", "type": "CREDIT"},
+        )
+
+    response = client.get("/api/v1/transactions", query_string={"page": 2, "per_page": 2})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["total"] == 3
+    assert data["pages"] == 2
+    assert [item["amount"] for item in data["items"]] == ["1.00"]
+
+
+def test_list_client_transactions_cursor_mode(client: FlaskClient) -> None:
+    client_id = create_client(client, "Hank", "hank@example.com")
+    for amount in ("1.00", "2.00", "3.00", "4.00", "5.00"):
+        client.post(
+            "/api/v1/transactions",
+            json={"client_id": client_id, "amount": amount, "currency": "USD", "type": "DEBIT"},
+        )
+
+    amounts = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            f"/api/v1/clients/{client_id}/transactions",
+            query_string={"cursor": cursor, "per_page": 2},
+        )
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["total"] is None
+        amounts.extend(item["amount"] for item in data["items"])
+        cursor = data["next_cursor"]
+
+    assert amounts == ["5.00", "4.00", "3.00", "2.00", "1.00"]
+
+
+def test_list_transactions_rejects_out_of_range_pages(client: FlaskClient) -> None:
+    for params in ({"per_page": -1}, {"per_page": 0}, {"per_page": 501}, {"page": 0}):
+        assert client.get("/api/v1/transactions", query_string=params).status_code == 400
+    response = client.get("/api/v1/transactions", query_string={"cursor": "", "per_page": -1})
+    assert response.status_code == 400
+
+
+def test_list_transactions_invalid_cursor(client: FlaskClient) -> None:
+    response = client.get("/api/v1/transactions", query_string={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.get_json()["field"] == "cursor"
+
+
+def test_export_transactions_ndjson_and_csv(client: FlaskClient) -> None:
+    client_id = create_client(client, "Iris", "iris@example.com")
+    other_id = create_client(client, "Jack", "jack@example.com")
+    for owner, amount in [(client_id, "1.50"), (other_id, "9.00"), (client_id, "2.50")]:
+        client.post(
+            "/api/v1/transactions",
+            json={"client_id": owner, "amount": amount, "currency": "EUR", "type": "CREDIT"},
+        )
+
+    response = client.get("/api/v1/transactions/export", query_string={"client_id": client_id})
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["amount"] for line in lines] == ["1.50", "2.50"]
+
+    response = client.get(
+        "/api/v1/transactions/export", query_string={"format": "csv", "client_id": client_id}
+    )
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["amount"] for row in rows] == ["1.50", "2.50"]
+    assert rows[0]["currency"] == "EUR"
+
+
+def test_export_transactions_rejects_unknown_format(client: FlaskClient) -> None:
+    response = client.get("/api/v1/transactions/export", query_string={"format": "xml"})
+    assert response.status_code == 400
+
+
+def test_batch_create_transactions_reports_each_item(client: FlaskClient) -> None:
+    client_id = create_client(client, "Kara", "kara@example.com")
+    response = client.post(
+        "/api/v1/transactions:batch",
+        json=[
+            {"client_id": client_id, "amount": "10.00", "currency": "USD", "type": "DEBIT"},
+            {"client_id": client_id, "amount": "-1.00", "currency": "USD", "type": "DEBIT"},
+            {"client_id": 9999, "amount": "5.00", "currency": "USD", "type": "CREDIT"},
+            {"client_id": client_id, "amount": "20.00", "currency": "MXN", "type": "CREDIT"},
+        ],
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    statuses = [result["status"] for result in data["results"]]
+    assert statuses == [201, 400, 400, 201]
+    assert "amount" in data["results"][1]["errors"]
+    assert "client_id" in data["results"][2]["errors"]
+
+    txn_id = data["results"][3]["id"]
+    fetched = client.get(f"/api/v1/transactions/{txn_id}").get_json()
+    assert fetched["amount"] == "20.00"
+
+
+def test_batch_create_transactions_reports_clients_deleted_mid_batch(
+    client: FlaskClient,
+) -> None:
+    kept_id = create_client(client, "Lars", "lars@example.com")
+    deleted_id = create_client(client, "Mona", "mona@example.com")
+    deleted = []
+
+    def delete_client(_conn, cursor, statement, *_args) -> None:
+        # Another request deletes a client after the existence check has run.
+        if statement.startswith("INSERT INTO transactions") and not deleted:
+            cursor.execute("DELETE FROM clients WHERE id = ?", (deleted_id,))
+            cursor.connection.commit()
+            deleted.append(deleted_id)
+
+    event.listen(db.engine, "before_cursor_execute", delete_client)
+    try:
+        response = client.post(
+            "/api/v1/transactions:batch",
+            json=[
+                {"client_id": kept_id, "amount": "1.00", "currency": "USD", "type": "DEBIT"},
+                {"client_id": deleted_id, "amount": "2.00", "currency": "USD", "type": "DEBIT"},
+            ],
+        )
+    finally:
+        event.remove(db.engine, "before_cursor_execute", delete_client)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert deleted == [deleted_id]
+    assert [result["status"] for result in data["results"]] == [201, 400]
+    assert data["results"][1]["errors"] == {"client_id": ["Client does not exist."]}
+
+
+def test_batch_create_transactions_rejects_non_array(client: FlaskClient) -> None:
+    response = client.post("/api/v1/transactions:batch", json={"client_id": 1})
+    assert response.status_code == 400
+
+
+def test_get_transaction_conditional_request(client: FlaskClient) -> None:
+    client_id = create_client(client, "Vera", "vera@example.com")
+    txn_id = client.post(
+        "/api/v1/transactions",
+        json={"client_id": client_id, "amount": "4.00", "currency": "USD", "type": "DEBIT"},
+    ).get_json()["id"]
+
+    etag = client.get(f"/api/v1/transactions/{txn_id}").headers["ETag"]
+    cached = client.get(f"/api/v1/transactions/{txn_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    client.put(f"/api/v1/transactions/{txn_id}", json={"amount": "5.00"})
+    changed = client.get(f"/api/v1/transactions/{txn_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.get_json()["amount"] == "5.00"
+
+
+def test_multi_get_transactions_by_ids(client: FlaskClient) -> None:
+    client_id = create_client(client, "Ivo", "ivo@example.com")
+    ids = [
+        client.post(
+            "/api/v1/transactions",
+            json={"client_id": client_id, "amount": amount, "currency": "USD", "type": "CREDIT"},
+        ).get_json()["id"]
+        for amount in ("1.00", "2.00", "3.00")
+    ]
+
+    response = client.get("/api/v1/transactions", query_string={"ids": f"{ids[2]},4242,{ids[0]}"})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [item["id"] for item in data["items"]] == [ids[2], ids[0]]
+    assert data["missing"] == [4242]
+    cached = client.get(
+        "/api/v1/transactions",
+        query_string={"ids": f"{ids[2]},4242,{ids[0]}"},
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+    assert client.get("/api/v1/transactions?ids=1,x").status_code == 400
+    assert client.get("/api/v1/transactions?ids=" + ",".join(["1"] * 1001)).status_code == 400
+
+
+def test_expand_client_embeds_owner(client: FlaskClient) -> None:
+    client_id = create_client(client, "Lia", "lia@example.com")
+    transaction_id = client.post(
+        "/api/v1/transactions",
+        json={"client_id": client_id, "amount": "4.00", "currency": "EUR", "type": "DEBIT"},
+    ).get_json()["id"]
+
+    page = client.get("/api/v1/transactions", query_string={"expand": "client"}).get_json()
+    assert page["items"][0]["client"]["email"] == "lia@example.com"
+    item = client.get(f"/api/v1/transactions/{transaction_id}?expand=client").get_json()
+    assert item["client"] == {**item["client"], "id": client_id, "name": "Lia"}
+    multi = client.get(f"/api/v1/transactions?ids={transaction_id}&expand=client").get_json()
+    assert multi["items"][0]["client"]["id"] == client_id
+
+
+def test_sparse_fields_narrow_payload_and_select(client: FlaskClient) -> None:
+    client_id = create_client(client, "Lena", "lena@example.com")
+    for amount in ("1.00", "2.00", "3.00"):
+        client.post(
+            "/api/v1/transactions",
+            json={
+                "client_id": client_id,
+                "amount": amount,
+                "currency": "MXN",
+                "type": "CREDIT",
+                "description": "x" * 200,
+            },
+        )
+    statements: list[str] = []
+
+    def capture(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        page = client.get(
+            "/api/v1/transactions",
+            query_string={"fields": "created_at,amount,id,currency", "cursor": "", "per_page": 2},
+        )
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    assert page.status_code == 200
+    items = page.get_json()["items"]
+    assert [list(item) for item in items] == [["id", "amount", "currency", "created_at"]] * 2
+    assert [item["amount"] for item in items] == ["3.00", "2.00"]
+    assert len(statements) == 1
+    assert "description" not in statements[0] and "client_id" not in statements[0]
+
+    cursor = page.get_json()["next_cursor"]
+    rest = client.get(
+        "/api/v1/transactions", query_string={"fields": "amount", "cursor": cursor}
+    ).get_json()
+    assert rest["items"] == [{"amount": "1.00"}]
+
+    expanded = client.get(
+        "/api/v1/transactions", query_string={"fields": "id", "expand": "client"}
+    ).get_json()
+    assert expanded["items"][0]["client"]["email"] == "lena@example.com"
+    assert list(expanded["items"][0]) == ["id", "client"]
+
+    single = client.get(f"/api/v1/transactions/{items[0]['id']}", query_string={"fields": "type"})
+    assert single.get_json() == {"type": "CREDIT"}
+
+    export = client.get(
+        "/api/v1/transactions/export", query_string={"format": "csv", "fields": "id,amount"}
+    )
+    assert export.get_data(as_text=True).splitlines()[0] == "id,amount"
+
+    assert client.get("/api/v1/transactions?fields=amount,balance").status_code == 400
+    assert client.get("/api/v1/transactions?fields=").status_code == 400